@@ -0,0 +1,69 @@
+"""
+Concurrent-call throughput of the async Binance tools against a local mock server.
+
+Each mock response is delayed to simulate network latency, so the synchronous tool is
+bound by N * latency while the async tool overlaps the requests on one event loop.
+
+    python benchmarks/bench_async_tools.py --calls 200 --latency 0.05
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('BINANCE_API_KEY', 'bench')
+os.environ.setdefault('BINANCE_API_SECRET', 'bench')
+
+import binance_tools  # noqa: E402
+from http_client import async_http  # noqa: E402
+
+
+def start_mock_server(port, latency):
+    async def ticker(request):
+        await asyncio.sleep(latency)
+        return web.json_response({'symbol': request.query.get('symbol'), 'price': '65000.00'})
+
+    app = web.Application()
+    app.router.add_get('/api/v3/ticker/price', ticker)
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(app)
+    loop.run_until_complete(runner.setup())
+    loop.run_until_complete(web.TCPSite(runner, '127.0.0.1', port).start())
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+
+
+async def run_async(calls):
+    await asyncio.gather(*(binance_tools.aget_binance_ticker.ainvoke({'symbol': 'BTCUSDT'}) for _ in range(calls)))
+    await async_http.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--calls', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--port', type=int, default=18765)
+    args = parser.parse_args()
+
+    start_mock_server(args.port, args.latency)
+    binance_tools.binance_api.base_url = f'http://127.0.0.1:{args.port}'
+
+    start = time.perf_counter()
+    for _ in range(args.calls):
+        binance_tools.get_binance_ticker.invoke({'symbol': 'BTCUSDT'})
+    sync_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    asyncio.run(run_async(args.calls))
+    async_elapsed = time.perf_counter() - start
+
+    print(f"sync : {args.calls} calls in {sync_elapsed:.2f}s ({args.calls / sync_elapsed:.1f} calls/s)")
+    print(f"async: {args.calls} calls in {async_elapsed:.2f}s ({args.calls / async_elapsed:.1f} calls/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Fair value gap detection and mitigation on a long synthetic minute series.
+
+Runs `identify_fair_value_gap` on `--candles` candles and compares it with the previous
+per-gap mask search (`low[i + 2:] <= top[i]` for every gap), which is quadratic: that
+baseline runs on `--baseline` candles, is checked for identical output and its time is
+extrapolated quadratically.
+
+    python benchmarks/bench_fvg.py --candles 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crypto_analysis.market_structure import identify_fair_value_gap  # noqa: E402
+
+
+def make_candles(count, seed=5):
+    rng = np.random.default_rng(seed)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.001, count)))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    wick = close * rng.exponential(0.0005, (2, count))
+    return pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) + wick[0],
+        'low': np.minimum(open_, close) - wick[1],
+        'close': close,
+    })
+
+
+def baseline_mitigation(ohlc, fvg, top, bottom):
+    mitigated_index = np.zeros(len(ohlc), dtype=np.int32)
+    for i in np.where(~np.isnan(fvg))[0]:
+        if fvg[i] == 1:
+            mask = ohlc["low"][i + 2:] <= top[i]
+        else:
+            mask = ohlc["high"][i + 2:] >= bottom[i]
+        if np.any(mask):
+            mitigated_index[i] = np.argmax(mask) + i + 2
+    return np.where(np.isnan(fvg), np.nan, mitigated_index)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--candles', type=int, default=1000000)
+    parser.add_argument('--baseline', type=int, default=20000)
+    args = parser.parse_args()
+
+    sample = make_candles(args.baseline)
+    result = identify_fair_value_gap(sample)
+    start = time.perf_counter()
+    expected = baseline_mitigation(sample, result['FVG'].to_numpy(), result['Top'].to_numpy(), result['Bottom'].to_numpy())
+    baseline = time.perf_counter() - start
+    assert np.array_equal(expected, result['MitigatedIndex'].to_numpy(), equal_nan=True), "mitigation differs from the baseline"
+    projected = baseline * (args.candles / args.baseline) ** 2
+    print(f"per-gap mask search: {baseline:8.2f}s for {args.baseline:,} candles (~{projected / 3600:.1f}h projected for {args.candles:,})")
+
+    candles = make_candles(args.candles)
+    for join in (False, True):
+        start = time.perf_counter()
+        result = identify_fair_value_gap(candles, join_consecutive=join)
+        elapsed = time.perf_counter() - start
+        gaps = int(result['FVG'].notna().sum())
+        open_gaps = int((result['MitigatedIndex'] == 0).sum())
+        print(f"identify_fair_value_gap(join_consecutive={join}): {elapsed:6.2f}s for {args.candles:,} candles "
+              f"({gaps:,} gaps, {open_gaps:,} unmitigated)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Throughput of the vectorised indicators against the previous implementations.
+
+Times the per-element RSI loop that `coingecko_tools.calculate_rsi` used, and the pandas
+`ewm` MACD, against `crypto_analysis.indicators` on one long series and on a
+(coins, time) matrix computed in a single call.
+
+    python benchmarks/bench_indicators.py --length 100000 --coins 500
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crypto_analysis import indicators  # noqa: E402
+
+
+def make_prices(coins, length, seed=3):
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0, 0.01, size=(coins, length))
+    return 100 * np.exp(np.cumsum(returns, axis=-1))
+
+
+def loop_rsi(prices, period=14):
+    """Wilder RSI with one Python iteration per price, as in the former coingecko tool."""
+    deltas = np.diff(prices)
+    up = deltas[:period].clip(0).mean()
+    down = (-deltas[:period]).clip(0).mean()
+    rsi = np.full(len(prices), np.nan)
+    rsi[period] = 100. - 100. / (1. + up / down)
+    for i in range(period + 1, len(prices)):
+        delta = deltas[i - 1]
+        upval = delta if delta > 0 else 0.
+        downval = -delta if delta < 0 else 0.
+        up = (up * (period - 1) + upval) / period
+        down = (down * (period - 1) + downval) / period
+        rsi[i] = 100. - 100. / (1. + up / down)
+    return rsi
+
+
+def pandas_macd(prices, fast=12, slow=26, signal=9):
+    series = pd.Series(prices)
+    macd = series.ewm(span=fast, adjust=False).mean() - series.ewm(span=slow, adjust=False).mean()
+    return macd, macd.ewm(span=signal, adjust=False).mean()
+
+
+def timed(func, *args, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--length', type=int, default=100000)
+    parser.add_argument('--coins', type=int, default=500)
+    parser.add_argument('--coin-length', type=int, default=1000)
+    args = parser.parse_args()
+
+    series = make_prices(1, args.length)[0]
+    expected, loop_time = timed(loop_rsi, series, repeat=1)
+    result, vector_time = timed(indicators.rsi, series)
+    assert np.allclose(result, expected, equal_nan=True), "vectorised RSI differs from the loop"
+    print(f"RSI loop:          {loop_time * 1e3:9.2f} ms  ({args.length:,} prices)")
+    print(f"indicators.rsi:    {vector_time * 1e3:9.2f} ms  ({loop_time / vector_time:.0f}x)")
+
+    (expected_macd, expected_signal), pandas_time = timed(pandas_macd, series)
+    (line, signal_line, _), vector_time = timed(indicators.macd, series)
+    assert np.allclose(line, expected_macd) and np.allclose(signal_line, expected_signal)
+    print(f"MACD pandas ewm:   {pandas_time * 1e3:9.2f} ms")
+    print(f"indicators.macd:   {vector_time * 1e3:9.2f} ms  ({pandas_time / vector_time:.1f}x)")
+
+    matrix = make_prices(args.coins, args.coin_length)
+    _, loop_time = timed(lambda: [loop_rsi(row) for row in matrix], repeat=1)
+    _, vector_time = timed(indicators.rsi, matrix)
+    print(f"RSI loop per coin: {loop_time * 1e3:9.2f} ms  ({args.coins} coins x {args.coin_length} prices)")
+    print(f"indicators.rsi 2D: {vector_time * 1e3:9.2f} ms  ({loop_time / vector_time:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Market structure on a long synthetic minute series, in one shot and incrementally.
+
+Runs `analyze_market_structure` on `--candles` candles, then feeds the same candles to a
+`MarketStructureEngine` and times appending the last `--live` candles one at a time with a
+`results(start=-500)` chart refresh after each, the way a live chart uses it. The engine's
+final tables are checked against the one-shot analysis.
+
+    python benchmarks/bench_market_structure.py --candles 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_fvg import make_candles  # noqa: E402
+from crypto_analysis.market_structure import MarketStructureEngine, analyze_market_structure  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--candles', type=int, default=1000000)
+    parser.add_argument('--live', type=int, default=200)
+    args = parser.parse_args()
+
+    candles = make_candles(args.candles)
+    candles['volume'] = np.random.default_rng(6).exponential(10, len(candles))
+    candles.index = pd.date_range('2020-01-01', periods=len(candles), freq='min')
+
+    start = time.perf_counter()
+    expected = analyze_market_structure(candles, time_frame='1h')
+    elapsed = time.perf_counter() - start
+    counts = ', '.join(f"{name} {int(table.iloc[:, 0].notna().sum()):,}" for name, table in expected.items())
+    print(f"analyze_market_structure: {elapsed:6.2f}s for {args.candles:,} candles ({counts})")
+
+    engine = MarketStructureEngine(time_frame='1h')
+    engine.append(candles.iloc[:-args.live])
+    engine.results()
+    appends, refreshes = [], []
+    for i in range(len(candles) - args.live, len(candles)):
+        start = time.perf_counter()
+        engine.append(candles.iloc[i:i + 1])
+        appended = time.perf_counter()
+        engine.results(start=-500)
+        refreshes.append(time.perf_counter() - appended)
+        appends.append(appended - start)
+    print(f"live candle: append {1000 * np.median(appends):.2f}ms, 500-candle refresh {1000 * np.median(refreshes):.1f}ms "
+          f"(median of {args.live})")
+
+    for name, table in engine.results().items():
+        assert table.equals(expected[name]), f"incremental {name} differs from the one-shot analysis"
+
+
+if __name__ == '__main__':
+    main()
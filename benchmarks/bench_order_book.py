@@ -0,0 +1,80 @@
+"""
+Update and query throughput of the local L2 order book.
+
+Builds a book from a synthetic snapshot, then applies random depth diffs in the
+Binance `depthUpdate` shape and times best bid/ask and top-N depth reads.
+
+    python benchmarks/bench_order_book.py --levels 5000 --updates 200000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from binance_order_book import LocalOrderBook  # noqa: E402
+
+
+def make_diffs(count, mid, tick, spread_levels, per_event=5, seed=7):
+    rng = random.Random(seed)
+    diffs = []
+    update_id = 1001
+    for _ in range(count // per_event):
+        bids, asks = [], []
+        for _ in range(per_event):
+            level = rng.randint(1, spread_levels)
+            qty = 0.0 if rng.random() < 0.3 else round(rng.uniform(0.001, 5), 3)
+            if rng.random() < 0.5:
+                bids.append([f"{mid - level * tick:.2f}", f"{qty}"])
+            else:
+                asks.append([f"{mid + level * tick:.2f}", f"{qty}"])
+        diffs.append({'e': 'depthUpdate', 's': 'BTCUSDT', 'U': update_id, 'u': update_id, 'b': bids, 'a': asks})
+        update_id += 1
+    return diffs
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--levels', type=int, default=5000)
+    parser.add_argument('--updates', type=int, default=200000)
+    args = parser.parse_args()
+
+    mid, tick = 65000.0, 0.01
+    snapshot = {
+        'lastUpdateId': 1000,
+        'bids': [[f"{mid - i * tick:.2f}", "1.0"] for i in range(1, args.levels + 1)],
+        'asks': [[f"{mid + i * tick:.2f}", "1.0"] for i in range(1, args.levels + 1)],
+    }
+    diffs = make_diffs(args.updates, mid, tick, args.levels * 2)
+
+    book = LocalOrderBook('BTCUSDT')
+    start = time.perf_counter()
+    book.apply_snapshot(snapshot)
+    print(f"snapshot: {2 * args.levels} levels in {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+    start = time.perf_counter()
+    for diff in diffs:
+        book.apply_diff(diff)
+    elapsed = time.perf_counter() - start
+    level_updates = sum(len(d['b']) + len(d['a']) for d in diffs)
+    print(f"diffs: {len(diffs)} events / {level_updates} level updates in {elapsed:.2f}s "
+          f"({level_updates / elapsed:,.0f} level updates/s)")
+
+    reads = 100000
+    start = time.perf_counter()
+    for _ in range(reads):
+        book.best_bid()
+        book.best_ask()
+    print(f"best bid/ask: {(time.perf_counter() - start) / reads * 1e6:.2f} us/read")
+
+    for limit in (10, 100, 1000):
+        start = time.perf_counter()
+        for _ in range(1000):
+            book.depth(limit)
+        print(f"depth({limit}): {(time.perf_counter() - start) / 1000 * 1e6:.1f} us/read")
+
+
+if __name__ == '__main__':
+    main()
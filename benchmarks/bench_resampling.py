@@ -0,0 +1,64 @@
+"""
+OHLCV resampling of a long synthetic tick series, in one shot and as a live chart refresh.
+
+Resamples `--ticks` ticks into 1m/1h/1w bars with `resample_ohlcv` and with pandas'
+`resample().ohlc()`, checking both give the same bars. Then feeds the series to an
+`OHLCVResampler` and times appending `--live` ticks one at a time with a 200-bar
+`frame()` after each, against re-resampling every tick on each refresh.
+
+    python benchmarks/bench_resampling.py --ticks 10000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crypto_analysis.resampling import OHLCVResampler, resample_ohlcv  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--ticks', type=int, default=10000000)
+    parser.add_argument('--live', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(5)
+    timestamps = 1577836800000 + np.cumsum(rng.integers(0, 200, args.ticks))
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 1e-4, args.ticks)))
+    volumes = rng.exponential(1, args.ticks)
+
+    series = pd.DataFrame({'price': prices, 'volume': volumes}, index=pd.to_datetime(timestamps, unit='ms'))
+    for interval, rule in (('1m', 'min'), ('1h', 'h'), ('1w', 'W-MON')):
+        start = time.perf_counter()
+        bars = resample_ohlcv(timestamps, prices, volumes, interval)
+        elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        grouped = series.resample(rule, label='left', closed='left')
+        expected = pd.concat((grouped['price'].ohlc(), grouped['volume'].sum()), axis=1).dropna()
+        pandas_elapsed = time.perf_counter() - start
+        assert np.allclose(bars[:, 1:6], expected.to_numpy()), f"{interval} bars differ from pandas"
+        print(f"{interval}: resample_ohlcv {elapsed:6.2f}s, pandas resample {pandas_elapsed:6.2f}s "
+              f"({len(bars):,} bars from {args.ticks:,} ticks)")
+
+    resampler = OHLCVResampler('1m').append(timestamps[:-args.live], prices[:-args.live], volumes[:-args.live])
+    refreshes = []
+    for i in range(args.ticks - args.live, args.ticks):
+        start = time.perf_counter()
+        resampler.append(timestamps[i:i + 1], prices[i:i + 1], volumes[i:i + 1])
+        resampler.frame(limit=200)
+        refreshes.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    expected = resample_ohlcv(timestamps, prices, volumes, '1m')
+    full = time.perf_counter() - start
+    assert np.allclose(resampler.bars(), expected), "incremental bars differ from the one-shot resample"
+    print(f"live tick + 200-bar frame: {1000 * np.median(refreshes):.2f}ms (median of {args.live}), "
+          f"full re-resample {1000 * full:.0f}ms")
+
+
+if __name__ == '__main__':
+    main()
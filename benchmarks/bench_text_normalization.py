@@ -0,0 +1,113 @@
+"""
+Throughput of social-text normalisation and sentiment scoring on synthetic posts.
+
+Compares the previous per-call implementations (stopword set and lemmatizer rebuilt per
+call, every token lemmatised, row-wise `DataFrame.apply` with TextBlob) with
+`TextNormalizer` and the chunked `analyze_social_sentiment`, both over all `--posts`
+posts. The baselines run on a sample and are extrapolated to the full post count.
+
+Posts are all distinct unless `--unique-posts` is given; `analyze_social_sentiment` scores
+each distinct text once, so repeats make it look faster than the row-wise baseline.
+
+    python benchmarks/bench_text_normalization.py --posts 1000000 --processes 4
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crypto_analysis.text_normalization import TextNormalizer, english_stopwords  # noqa: E402
+from crypto_analysis.sentiment_analysis import analyze_social_sentiment  # noqa: E402
+
+VOCABULARY = (
+    "bitcoin btc eth ethereum solana moon pump dump bullish bearish hodl wallets exchanges miners "
+    "halving etf approval rally crash whales buying selling prices charts candles support resistance "
+    "great terrible love hate scam gains losses fees staking yields tokens coins altcoins memes"
+).split()
+FILLER = "the a is are was to of and in on for it this that be with not i you we they".split()
+
+
+def make_posts(count, unique=None, seed=11):
+    """`count` posts; with `unique`, only that many are generated and repeated (reposts, bots)."""
+    rng = random.Random(seed)
+    words = VOCABULARY * 3 + FILLER + [w.capitalize() for w in VOCABULARY[:10]] + ["lol!!", "$BTC", "100x", "https://t.co/x"]
+    posts = [' '.join(rng.choices(words, k=rng.randint(8, 40))) for _ in range(min(count, unique or count))]
+    return [posts[i % len(posts)] for i in range(count)]
+
+
+def baseline_clean(docs, lemmatize):
+    stop_words = set(english_stopwords())
+    translator = str.maketrans('', '', string.punctuation)
+    clean_docs = []
+    for doc in docs:
+        tokens = doc.split()
+        clean_tokens = [lemmatize(token) for token in tokens if token not in stop_words and token.isalpha()]
+        clean_docs.append(' '.join(clean_tokens).translate(translator))
+    return clean_docs
+
+
+def baseline_sentiment(posts_df):
+    from textblob import TextBlob
+
+    def get_sentiment(text):
+        blob = TextBlob(text)
+        return blob.sentiment.polarity, blob.sentiment.subjectivity
+    posts_df['Polarity'], posts_df['Subjectivity'] = zip(*posts_df['text'].apply(get_sentiment))
+    posts_df['Sentiment'] = posts_df['Polarity'].apply(lambda x: 'Positive' if x > 0 else ('Negative' if x < 0 else 'Neutral'))
+    return posts_df
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--posts', type=int, default=1000000)
+    parser.add_argument('--unique-posts', type=int, default=None,
+                        help='distinct posts, repeated to reach --posts (default: all distinct)')
+    parser.add_argument('--baseline-sample', type=int, default=50000)
+    parser.add_argument('--sentiment-posts', type=int, default=None, help='posts to score (default: --posts)')
+    parser.add_argument('--processes', type=int, default=1)
+    parser.add_argument('--no-lemmatize', action='store_true', help='skip WordNet (e.g. corpus not downloaded)')
+    args = parser.parse_args()
+
+    posts = make_posts(args.posts, args.unique_posts)
+    print(f"{len(posts):,} posts, {len(set(posts)):,} distinct ({1 - len(set(posts)) / len(posts):.0%} duplicates)")
+    if args.no_lemmatize:
+        def lemmatize(token):
+            return token
+    else:
+        from nltk.stem import WordNetLemmatizer
+        lemmatize = WordNetLemmatizer().lemmatize
+
+    sample = posts[:args.baseline_sample]
+    start = time.perf_counter()
+    expected = baseline_clean(sample, lemmatize)
+    baseline = (time.perf_counter() - start) / len(sample)
+    print(f"baseline clean_reddit_text: {1 / baseline:12,.0f} posts/s  (~{baseline * len(posts):.1f}s for {len(posts):,})")
+
+    normalizer = TextNormalizer(lemmatize=not args.no_lemmatize)
+    start = time.perf_counter()
+    cleaned = normalizer.normalize_many(posts, processes=args.processes)
+    elapsed = time.perf_counter() - start
+    print(f"TextNormalizer:             {len(posts) / elapsed:12,.0f} posts/s  ({elapsed:.1f}s for {len(posts):,}, "
+          f"{args.processes} process(es), {baseline * len(posts) / elapsed:.1f}x)")
+    assert cleaned[:len(sample)] == expected, "normalised output differs from the baseline"
+
+    frame = pd.DataFrame({'text': posts[:args.sentiment_posts or len(posts)]})
+    start = time.perf_counter()
+    baseline_sentiment(frame.iloc[:args.baseline_sample].copy())
+    baseline = (time.perf_counter() - start) / min(args.baseline_sample, len(frame))
+    print(f"sentiment apply:            {1 / baseline:12,.0f} posts/s  (~{baseline * len(frame):.1f}s for {len(frame):,})")
+    start = time.perf_counter()
+    analyze_social_sentiment(frame, processes=args.processes)
+    elapsed = time.perf_counter() - start
+    print(f"analyze_social_sentiment:   {len(frame) / elapsed:12,.0f} posts/s  ({elapsed:.1f}s for {len(frame):,}, "
+          f"{baseline * len(frame) / elapsed:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,231 @@
+import asyncio
+import logging
+import threading
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Callable, Dict, List, Optional, Tuple
+
+from binance_stream import BinanceStream, BINANCE_STREAM_URL
+
+
+class OrderBookGapError(Exception):
+    """Raised when a depth diff does not follow the last applied update id."""
+    def __init__(self, symbol, expected, first_update_id):
+        self.symbol = symbol
+        self.expected = expected
+        self.first_update_id = first_update_id
+        super().__init__(f"Order book gap for {symbol}: expected update {expected}, got {first_update_id}")
+
+
+class BookSide:
+    """
+    One side of an L2 book: a sorted key array plus a price -> quantity map.
+
+    Keys are kept ascending with the best level first (bids are stored negated), so the
+    best price is O(1), level updates are an O(log n) search plus a memmove, and the top N
+    levels are a slice.
+    """
+    def __init__(self, descending: bool = False):
+        self.descending = descending
+        self._keys: List[float] = []
+        self._levels: Dict[float, float] = {}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _key(self, price: float) -> float:
+        return -price if self.descending else price
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._levels.clear()
+
+    def update(self, price: float, qty: float) -> None:
+        """Set the quantity at `price`; a zero quantity removes the level."""
+        key = self._key(price)
+        if qty == 0:
+            if self._levels.pop(price, None) is not None:
+                del self._keys[bisect_left(self._keys, key)]
+        else:
+            if price not in self._levels:
+                self._keys.insert(bisect_left(self._keys, key), key)
+            self._levels[price] = qty
+
+    def best(self) -> Optional[Tuple[float, float]]:
+        if not self._keys:
+            return None
+        price = self._key(self._keys[0])
+        return price, self._levels[price]
+
+    def top(self, levels: int) -> List[Tuple[float, float]]:
+        prices = [self._key(k) for k in self._keys[:levels]]
+        return [(price, self._levels[price]) for price in prices]
+
+    def cumulative(self, levels: int) -> List[Tuple[float, float]]:
+        """Top `levels` prices with the running total quantity up to each level."""
+        top = self.top(levels)
+        return list(zip((p for p, _ in top), accumulate(q for _, q in top)))
+
+
+class LocalOrderBook:
+    """
+    L2 order book synchronised from a REST snapshot plus the Binance diff-depth stream.
+
+    Follows Binance's procedure: diffs with `u <= lastUpdateId` are dropped, the first applied
+    diff must straddle `lastUpdateId + 1`, and every later diff must start at the previous
+    `u + 1`. Anything else raises `OrderBookGapError` so the owner can resynchronise.
+    """
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.bids = BookSide(descending=True)
+        self.asks = BookSide()
+        self.last_update_id: Optional[int] = None
+        self.synced = False
+        self._first_diff = True
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.bids.clear()
+            self.asks.clear()
+            self.last_update_id = None
+            self.synced = False
+            self._first_diff = True
+
+    def apply_snapshot(self, snapshot: dict) -> None:
+        with self._lock:
+            self.bids.clear()
+            self.asks.clear()
+            for price, qty in snapshot['bids']:
+                self.bids.update(float(price), float(qty))
+            for price, qty in snapshot['asks']:
+                self.asks.update(float(price), float(qty))
+            self.last_update_id = snapshot['lastUpdateId']
+            self._first_diff = True
+            self.synced = True
+
+    def apply_diff(self, event: dict) -> bool:
+        """
+        Apply one `depthUpdate` event. Returns False if the event predates the book.
+        """
+        first_id, final_id = event['U'], event['u']
+        with self._lock:
+            if self.last_update_id is None:
+                raise OrderBookGapError(self.symbol, None, first_id)
+            if final_id <= self.last_update_id:
+                return False
+            expected = self.last_update_id + 1
+            if self._first_diff:
+                if first_id > expected:
+                    self.synced = False
+                    raise OrderBookGapError(self.symbol, expected, first_id)
+            elif first_id != expected:
+                self.synced = False
+                raise OrderBookGapError(self.symbol, expected, first_id)
+            for price, qty in event['b']:
+                self.bids.update(float(price), float(qty))
+            for price, qty in event['a']:
+                self.asks.update(float(price), float(qty))
+            self.last_update_id = final_id
+            self._first_diff = False
+            return True
+
+    def best_bid(self) -> Optional[Tuple[float, float]]:
+        return self.bids.best()
+
+    def best_ask(self) -> Optional[Tuple[float, float]]:
+        return self.asks.best()
+
+    def depth(self, limit: int = 100) -> dict:
+        """Top `limit` levels per side in the shape of the REST `api/v3/depth` response."""
+        with self._lock:
+            return {
+                'lastUpdateId': self.last_update_id,
+                'bids': [[price, qty] for price, qty in self.bids.top(limit)],
+                'asks': [[price, qty] for price, qty in self.asks.top(limit)],
+            }
+
+    def cumulative_depth(self, levels: int = 20) -> dict:
+        with self._lock:
+            return {
+                'bids': self.bids.cumulative(levels),
+                'asks': self.asks.cumulative(levels),
+            }
+
+
+class BinanceDepthStream(BinanceStream):
+    """
+    Maintains a `LocalOrderBook` per symbol from the `<symbol>@depth@100ms` streams.
+
+    Diffs are buffered while a snapshot is fetched (via `snapshot_fetcher(symbol, limit)`,
+    run off the event loop), then replayed. A sequence gap or reconnect triggers a resync.
+    """
+    def __init__(self, symbols: List[str], snapshot_fetcher: Callable[[str, int], Optional[dict]],
+                 url: str = BINANCE_STREAM_URL, snapshot_limit: int = 5000, **kwargs):
+        super().__init__(url=url, **kwargs)
+        self.symbols = [s.upper() for s in symbols]
+        self.snapshot_fetcher = snapshot_fetcher
+        self.snapshot_limit = snapshot_limit
+        self.books: Dict[str, LocalOrderBook] = {symbol: LocalOrderBook(symbol) for symbol in self.symbols}
+        self._buffers: Dict[str, Optional[list]] = {symbol: None for symbol in self.symbols}
+
+    def stream_names(self) -> List[str]:
+        return [f"{symbol.lower()}@depth@100ms" for symbol in self.symbols]
+
+    def get_book(self, symbol: str) -> Optional[LocalOrderBook]:
+        """Return the book for `symbol` if it is currently synchronised."""
+        book = self.books.get(symbol.upper())
+        if book is None or not book.synced or not self.connected.is_set():
+            return None
+        return book
+
+    def on_connect(self) -> None:
+        for symbol in self.symbols:
+            self._schedule_resync(symbol)
+
+    def on_message(self, stream: str, data: dict) -> None:
+        symbol = data.get('s')
+        if symbol not in self.books:
+            return
+        buffer = self._buffers[symbol]
+        if buffer is not None:
+            buffer.append(data)
+            return
+        try:
+            self.books[symbol].apply_diff(data)
+        except OrderBookGapError as e:
+            logging.warning(f"{e}; resynchronising")
+            self._schedule_resync(symbol)
+            self._buffers[symbol].append(data)
+
+    def _schedule_resync(self, symbol: str) -> None:
+        if self._buffers[symbol] is not None:
+            return  # a resync is already in flight
+        self.books[symbol].reset()
+        self._buffers[symbol] = []
+        asyncio.get_running_loop().create_task(self._resync(symbol))
+
+    async def _resync(self, symbol: str) -> None:
+        loop = asyncio.get_running_loop()
+        book = self.books[symbol]
+        snapshot = None
+        delay = self.reconnect_delay
+        while snapshot is None and not self._stopping.is_set():
+            try:
+                snapshot = await loop.run_in_executor(None, self.snapshot_fetcher, symbol, self.snapshot_limit)
+            except Exception as e:
+                logging.warning(f"Failed to fetch {symbol} depth snapshot: {e}")
+            if snapshot is None:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+        if snapshot is None:
+            return
+        book.apply_snapshot(snapshot)
+        buffered, self._buffers[symbol] = self._buffers[symbol], None
+        for event in buffered:
+            try:
+                book.apply_diff(event)
+            except OrderBookGapError as e:
+                logging.warning(f"{e}; snapshot too old, resynchronising")
+                self._schedule_resync(symbol)
+                return
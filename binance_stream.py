@@ -0,0 +1,189 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import websockets
+
+BINANCE_STREAM_URL = 'wss://stream.binance.com:9443/stream'
+
+
+class BinanceStream:
+    """
+    Background consumer of a Binance combined stream.
+
+    The websocket runs on a private asyncio loop in a daemon thread and reconnects with
+    exponential backoff. Subclasses declare their stream names via `stream_names()` and
+    handle payloads in `on_message(stream, data)`.
+    """
+    def __init__(self, url: str = BINANCE_STREAM_URL, reconnect_delay: float = 1, max_reconnect_delay: float = 60):
+        self.url = url
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.connected = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+        self._loop = None
+        self._task = None
+
+    def stream_names(self) -> List[str]:
+        raise NotImplementedError
+
+    def on_message(self, stream: str, data: dict) -> None:
+        raise NotImplementedError
+
+    def on_connect(self) -> None:
+        """Called on the stream thread after every (re)connect."""
+
+    @property
+    def stream_url(self) -> str:
+        return f"{self.url}?streams={'/'.join(self.stream_names())}"
+
+    def start(self) -> bool:
+        """Start the ingestor thread. Returns False if there is nothing to subscribe to."""
+        if not self.stream_names():
+            return False
+        if self._thread is not None and self._thread.is_alive():
+            return True
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._thread_main, name=type(self).__name__, daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self, timeout: float = 5) -> None:
+        self._stopping.set()
+        loop, task = self._loop, self._task
+        if loop is not None and task is not None:
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                pass  # loop already closed
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _thread_main(self):
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._task = self._loop.create_task(self._run())
+            self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._loop.close()
+            self._loop = None
+            self._task = None
+
+    async def _run(self):
+        delay = self.reconnect_delay
+        while not self._stopping.is_set():
+            try:
+                async with websockets.connect(self.stream_url, ping_interval=20, max_size=None) as ws:
+                    self.connected.set()
+                    delay = self.reconnect_delay
+                    self.on_connect()
+                    async for message in ws:
+                        payload = json.loads(message)
+                        if 'stream' in payload:
+                            self.on_message(payload['stream'], payload['data'])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.warning(f"{type(self).__name__} disconnected: {e}")
+            finally:
+                self.connected.clear()
+            if self._stopping.is_set():
+                break
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+
+class TickerSnapshot(NamedTuple):
+    symbol: str
+    price: Optional[float] = None
+    open: Optional[float] = None
+    high: Optional[float] = None
+    low: Optional[float] = None
+    volume: Optional[float] = None
+    quote_volume: Optional[float] = None
+    bid: Optional[float] = None
+    bid_qty: Optional[float] = None
+    ask: Optional[float] = None
+    ask_qty: Optional[float] = None
+    event_time: Optional[int] = None
+    updated_at: float = 0.0  # last update of any field
+    price_updated_at: float = 0.0  # last mini-ticker (price) update
+
+
+class BinanceTickerStream(BinanceStream):
+    """
+    Keeps the latest mini-ticker and best bid/ask for a fixed symbol set in memory.
+
+    Entries are immutable `TickerSnapshot` tuples that the stream thread swaps in with a single
+    dict assignment, so readers never take a lock and always see a consistent row. Listeners
+    registered with `add_listener` receive each new snapshot after a price (mini-ticker) update.
+    """
+    def __init__(self, symbols: List[str], url: str = BINANCE_STREAM_URL, max_age: float = 10, **kwargs):
+        super().__init__(url=url, **kwargs)
+        self.symbols = [s.upper() for s in symbols]
+        self.max_age = max_age
+        self._table: Dict[str, TickerSnapshot] = {}
+        self._listeners = []
+
+    def add_listener(self, callback: Callable[[TickerSnapshot], None]) -> None:
+        """Register `callback(snapshot)`, called on the stream thread after every price update."""
+        self._listeners.append(callback)
+
+    def stream_names(self) -> List[str]:
+        names = []
+        for symbol in self.symbols:
+            names.append(f"{symbol.lower()}@miniTicker")
+            names.append(f"{symbol.lower()}@bookTicker")
+        return names
+
+    def on_message(self, stream: str, data: dict) -> None:
+        symbol = data.get('s')
+        if not symbol:
+            return
+        current = self._table.get(symbol) or TickerSnapshot(symbol=symbol)
+        now = time.monotonic()
+        if stream.endswith('@miniTicker'):
+            self._table[symbol] = current._replace(
+                price=float(data['c']),
+                open=float(data['o']),
+                high=float(data['h']),
+                low=float(data['l']),
+                volume=float(data['v']),
+                quote_volume=float(data['q']),
+                event_time=data.get('E'),
+                updated_at=now,
+                price_updated_at=now,
+            )
+            for callback in self._listeners:
+                try:
+                    callback(self._table[symbol])
+                except Exception as e:
+                    logging.error(f"Ticker listener failed: {e}")
+        elif stream.endswith('@bookTicker'):
+            self._table[symbol] = current._replace(
+                bid=float(data['b']),
+                bid_qty=float(data['B']),
+                ask=float(data['a']),
+                ask_qty=float(data['A']),
+                updated_at=now,
+            )
+
+    def get(self, symbol: str, max_age: Optional[float] = None) -> Optional[TickerSnapshot]:
+        """
+        Return the cached snapshot for `symbol`, or None if it is unknown or its price is stale.
+        Book-ticker quotes do not refresh the price's age.
+        """
+        snapshot = self._table.get(symbol.upper())
+        if snapshot is None or snapshot.price is None:
+            return None
+        max_age = self.max_age if max_age is None else max_age
+        if max_age and time.monotonic() - snapshot.price_updated_at > max_age:
+            return None
+        return snapshot
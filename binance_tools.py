@@ -1,6 +1,18 @@
 import os
+import math
+import asyncio
+import aiohttp
+import numpy as np
+from typing import List
 from requests import Session, ConnectionError, Timeout, TooManyRedirects
 from langchain.tools import tool
+from http_client import async_http
+from price_store import price_store
+from binance_stream import BinanceTickerStream, BINANCE_STREAM_URL
+from binance_order_book import BinanceDepthStream
+from crypto_analysis.liquidity_analysis import analyze_liquidity
+from crypto_analysis.streaming_indicators import LiveIndicators
+from trade_aggregator import TradeAggregator, BinanceTradeStream, poll_trades
 
 # Load API key from environment variable
 API_KEY = os.getenv('BINANCE_API_KEY')
@@ -8,6 +20,18 @@ API_SECRET = os.getenv('BINANCE_API_SECRET')
 if not API_KEY or not API_SECRET:
     raise ValueError("Please set the 'BINANCE_API_KEY' and 'BINANCE_API_SECRET' environment variables.")
 
+# Comma-separated symbols (e.g. 'BTCUSDT,ETHUSDT') served from the websocket ticker cache
+STREAM_SYMBOLS = [s.strip().upper() for s in os.getenv('BINANCE_STREAM_SYMBOLS', '').split(',') if s.strip()]
+STREAM_URL = os.getenv('BINANCE_STREAM_URL', BINANCE_STREAM_URL)
+# Comma-separated symbols whose full L2 book is maintained locally from depth diffs
+DEPTH_SYMBOLS = [s.strip().upper() for s in os.getenv('BINANCE_DEPTH_SYMBOLS', '').split(',') if s.strip()]
+# Comma-separated symbols aggregated from the aggTrade stream into bars and rolling stats
+TRADE_SYMBOLS = [s.strip().upper() for s in os.getenv('BINANCE_TRADE_SYMBOLS', '').split(',') if s.strip()]
+BAR_INTERVALS = (60, 300, 3600)
+# Bar length (seconds) for the live indicators fed from the ticker stream, and where their state is kept
+INDICATOR_INTERVAL = int(os.getenv('BINANCE_INDICATOR_INTERVAL', '60'))
+INDICATOR_STATE = os.getenv('BINANCE_INDICATOR_STATE', os.path.join('data', 'binance_indicators.json'))
+
 class BinanceAPI:
     def __init__(self):
         self.api_key = str(API_KEY)  # Ensure the API key is a string
@@ -29,7 +53,85 @@ class BinanceAPI:
             print(f"Error fetching data from Binance: {e}")
             return None
 
+    async def amake_request(self, endpoint, parameters=None):
+        try:
+            url = f"{self.base_url}/{endpoint}"
+            return await async_http.get_json(url, params=parameters, headers=dict(self.session.headers))
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            print(f"Error fetching data from Binance: {e}")
+            return None
+
 binance_api = BinanceAPI()
+ticker_stream = BinanceTickerStream(STREAM_SYMBOLS, url=STREAM_URL)
+live_indicators = LiveIndicators(interval=INDICATOR_INTERVAL, state_path=INDICATOR_STATE)
+
+def _update_live_indicators(snapshot):
+    timestamp = snapshot.event_time / 1000 if snapshot.event_time else None
+    live_indicators.update(snapshot.symbol, snapshot.price, timestamp)
+
+ticker_stream.add_listener(_update_live_indicators)
+
+def fetch_depth_snapshot(symbol, limit=5000):
+    """Fetch a REST depth snapshot used to (re)synchronise a local order book."""
+    return binance_api.make_request('api/v3/depth', {'symbol': symbol.upper(), 'limit': limit})
+
+depth_stream = BinanceDepthStream(DEPTH_SYMBOLS, snapshot_fetcher=fetch_depth_snapshot, url=STREAM_URL)
+
+def fetch_recent_trades(symbol, limit=1000):
+    """Fetch raw REST trades used to feed a polled trade aggregator."""
+    return binance_api.make_request('api/v3/trades', {'symbol': symbol.upper(), 'limit': limit})
+
+trade_aggregators = {symbol: TradeAggregator(symbol, time_intervals=BAR_INTERVALS) for symbol in TRADE_SYMBOLS}
+trade_stream = BinanceTradeStream(trade_aggregators, url=STREAM_URL)
+
+def _record_trade(symbol, trade):
+    price_store.add(symbol, trade['T'], float(trade['p']), float(trade['q']))
+
+def _record_ticker_price(snapshot):
+    # Symbols with an aggTrade stream are recorded trade by trade, with volume, instead
+    if snapshot.symbol not in trade_aggregators and snapshot.event_time:
+        price_store.add(snapshot.symbol, snapshot.event_time, snapshot.price)
+
+trade_stream.add_listener(_record_trade)
+ticker_stream.add_listener(_record_ticker_price)
+_polled_aggregators = {}
+
+def get_trade_aggregator(symbol):
+    """
+    Return the aggregator for `symbol`: the stream-fed one if subscribed, otherwise one
+    that is topped up from REST on every call.
+    """
+    symbol = symbol.upper()
+    if symbol in trade_aggregators and trade_stream.connected.is_set():
+        return trade_aggregators[symbol]
+    aggregator = _polled_aggregators.get(symbol)
+    if aggregator is None:
+        aggregator = _polled_aggregators[symbol] = TradeAggregator(symbol, time_intervals=BAR_INTERVALS)
+    poll_trades(aggregator, fetch_recent_trades)
+    return aggregator
+
+def _streamed_order_book(symbol, limit):
+    """Depth from the locally synchronised book, or None when the symbol is not streamed."""
+    book = depth_stream.get_book(symbol)
+    return None if book is None else book.depth(int(limit))
+
+def _depth_request(symbol, limit):
+    return 'api/v3/depth', {'symbol': symbol, 'limit': limit}
+
+def _order_book(symbol, limit):
+    book = _streamed_order_book(symbol, limit)
+    return book if book is not None else binance_api.make_request(*_depth_request(symbol, limit))
+
+async def _aorder_book(symbol, limit):
+    book = _streamed_order_book(symbol, limit)
+    return book if book is not None else await binance_api.amake_request(*_depth_request(symbol, limit))
+
+def _cached_ticker(symbol):
+    """The streamed price in the shape of Binance's ticker/price response, or None if not streamed or stale."""
+    snapshot = ticker_stream.get(symbol)
+    if snapshot is None:
+        return None
+    return {'symbol': snapshot.symbol, 'price': f"{snapshot.price:.8f}"}
 
 @tool
 def get_binance_ticker(symbol='BTCUSDT'):
@@ -38,6 +140,9 @@ def get_binance_ticker(symbol='BTCUSDT'):
     Args:
     - symbol (str): The trading pair symbol (e.g., 'BTCUSDT').
     """
+    cached = _cached_ticker(symbol)
+    if cached is not None:
+        return cached
     endpoint = 'api/v3/ticker/price'
     parameters = {'symbol': symbol}
     return binance_api.make_request(endpoint, parameters)
@@ -50,9 +155,7 @@ def get_binance_order_book(symbol='BTCUSDT', limit=10):
     - symbol (str): The trading pair symbol (e.g., 'BTCUSDT').
     - limit (int): Limit the number of returned results.
     """
-    endpoint = 'api/v3/depth'
-    parameters = {'symbol': symbol, 'limit': limit}
-    return binance_api.make_request(endpoint, parameters)
+    return _order_book(symbol, limit)
 
 @tool
 def get_binance_recent_trades(symbol='BTCUSDT', limit=10):
@@ -65,3 +168,120 @@ def get_binance_recent_trades(symbol='BTCUSDT', limit=10):
     endpoint = 'api/v3/trades'
     parameters = {'symbol': symbol, 'limit': limit}
     return binance_api.make_request(endpoint, parameters)
+
+@tool
+def get_binance_trade_stats(symbol='BTCUSDT', interval=60, bars=5):
+    """
+    Get rolling trade statistics (VWAP, buy/sell volume ratio, trade rate) and the latest
+    OHLCV bars for a symbol, aggregated from its recent trades.
+    Args:
+    - symbol (str): The trading pair symbol (e.g., 'BTCUSDT').
+    - interval (int): Bar length in seconds (60, 300 or 3600).
+    - bars (int): Number of most recent bars to include.
+    """
+    interval = int(interval)
+    if interval not in BAR_INTERVALS:
+        return f"Unsupported interval {interval}. Supported intervals: {', '.join(map(str, BAR_INTERVALS))}."
+    aggregator = get_trade_aggregator(symbol)
+    stats = aggregator.snapshot()
+    if not stats['trades']:
+        return f"No trades available for {symbol}."
+    frame = aggregator.to_frame(f"time_{interval}").tail(int(bars))
+    ratio = stats['buy_sell_ratio']
+    rate = stats['trades_per_second']
+    lines = [
+        f"{aggregator.symbol} over the last {stats['trades']} trades: VWAP {stats['vwap']:.6g}, "
+        f"last {stats['last_price']:.6g}, volume {stats['volume']:.6g} "
+        f"(buy/sell ratio {'n/a' if ratio is None else f'{ratio:.2f}'}), "
+        f"{'n/a' if rate is None else f'{rate:.2f}'} trades/s",
+        f"{interval}s bars (time, open, high, low, close, volume):",
+    ]
+    for row in frame.itertuples(index=False):
+        lines.append(f"{row.Date:%Y-%m-%d %H:%M:%S} {row.Open:.6g} {row.High:.6g} {row.Low:.6g} {row.Close:.6g} {row.Volume:.6g}")
+    return "\n".join(lines)
+
+@tool
+def get_binance_live_indicators(symbol='BTCUSDT'):
+    """
+    Get RSI, MACD, EMAs, SMAs and rolling volatility for a symbol, maintained incrementally
+    from the live ticker stream (only for symbols in BINANCE_STREAM_SYMBOLS).
+    Args:
+    - symbol (str): The trading pair symbol (e.g., 'BTCUSDT').
+    """
+    symbol = symbol.upper()
+    if symbol not in ticker_stream.symbols:
+        return f"{symbol} is not streamed. Streamed symbols: {', '.join(ticker_stream.symbols) or 'none'}."
+    values = live_indicators.get(symbol)
+    if values is None:
+        return f"No completed {INDICATOR_INTERVAL}s bars for {symbol} yet."
+    price = values.pop('price', values['last'])
+    samples = values.pop('samples')
+    readings = ', '.join(f"{name} {value:.6g}" for name, value in values.items() if not math.isnan(value))
+    pending = [name for name, value in values.items() if math.isnan(value)]
+    note = f" (warming up: {', '.join(pending)})" if pending else ""
+    return f"{symbol} price {price:.6g}; over {samples} {INDICATOR_INTERVAL}s bars: {readings}{note}"
+
+@tool
+def get_binance_liquidity(symbols: List[str], notional: float = 100000, levels: int = 100) -> str:
+    """
+    Summarise order-book liquidity for one or more symbols instead of returning raw bids/asks.
+    Reports mid, spread, top-10 level imbalance and the VWAP fill price and slippage of a
+    market buy/sell of the given notional.
+    Args:
+    - symbols (List[str]): Trading pair symbols (e.g., ['BTCUSDT', 'ETHUSDT']).
+    - notional (float): Order size in quote currency used for the fill estimate.
+    - levels (int): Number of book levels per side to consider.
+    """
+    symbols = [s.upper() for s in symbols]
+    books = [_order_book(symbol, levels) for symbol in symbols]
+    metrics = analyze_liquidity(books, notional=notional, levels=levels)
+    lines = []
+    for i, symbol in enumerate(symbols):
+        if np.isnan(metrics['mid'][i]):
+            lines.append(f"{symbol}: no order book data")
+            continue
+        lines.append(
+            f"{symbol}: mid {metrics['mid'][i]:.6g}, spread {metrics['spread_bps'][i]:.2f} bps, "
+            f"imbalance {metrics['imbalance'][i]:+.2f}, "
+            f"buy {notional:,.0f} @ {metrics['buy_vwap'][i]:.6g} ({metrics['buy_slippage_bps'][i]:.2f} bps, "
+            f"{metrics['buy_fill_ratio'][i]:.0%} filled), "
+            f"sell @ {metrics['sell_vwap'][i]:.6g} ({metrics['sell_slippage_bps'][i]:.2f} bps, "
+            f"{metrics['sell_fill_ratio'][i]:.0%} filled)"
+        )
+    return "\n".join(lines)
+
+@tool
+async def aget_binance_ticker(symbol='BTCUSDT'):
+    """
+    Get the current ticker price for a specific symbol (async).
+    Args:
+    - symbol (str): The trading pair symbol (e.g., 'BTCUSDT').
+    """
+    cached = _cached_ticker(symbol)
+    if cached is not None:
+        return cached
+    endpoint = 'api/v3/ticker/price'
+    parameters = {'symbol': symbol}
+    return await binance_api.amake_request(endpoint, parameters)
+
+@tool
+async def aget_binance_order_book(symbol='BTCUSDT', limit=10):
+    """
+    Get the order book for a specific symbol (async).
+    Args:
+    - symbol (str): The trading pair symbol (e.g., 'BTCUSDT').
+    - limit (int): Limit the number of returned results.
+    """
+    return await _aorder_book(symbol, limit)
+
+@tool
+async def aget_binance_recent_trades(symbol='BTCUSDT', limit=10):
+    """
+    Get the recent trades for a specific symbol (async).
+    Args:
+    - symbol (str): The trading pair symbol (e.g., 'BTCUSDT').
+    - limit (int): Limit the number of returned results.
+    """
+    endpoint = 'api/v3/trades'
+    parameters = {'symbol': symbol, 'limit': limit}
+    return await binance_api.amake_request(endpoint, parameters)
@@ -1,16 +1,18 @@
 import logging
-import pandas as pd
 from pycoingecko import CoinGeckoAPI
 from typing import List
-import numpy as np
 from functools import lru_cache
 from langchain.agents import tool
+from http_client import async_http
+from crypto_analysis import indicators
+from crypto_analysis.resampling import resample_ohlcv
 
 # Setup basic logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 # Initialize CoinGecko API client
 cg = CoinGeckoAPI()
+COINGECKO_API_URL = 'https://api.coingecko.com/api/v3'
 
 @tool
 def get_market_data(coin_ids: List[str], vs_currency: str = 'usd') -> str:
@@ -37,12 +39,26 @@ def get_historical_market_data(coin_id: str, vs_currency: str = 'usd', days: int
         logging.error(f"Exception occurred while fetching historical market data: {str(e)}")
         return "Failed to fetch historical market data."
 
+def _resampled_ohlc(chart: dict, interval: str) -> list:
+    """[time, open, high, low, close] rows like CoinGecko's OHLC endpoint, resampled from market chart prices."""
+    prices = chart.get('prices') or []
+    if not prices:
+        return []
+    timestamps, values = zip(*prices)
+    bars = resample_ohlcv(timestamps, values, interval=interval)
+    return [[int(bar[0]), *bar[1:5].tolist()] for bar in bars]
+
 @tool
-def get_ohlc(coin_id: str, vs_currency: str = 'usd', days: int = 1) -> str:
+def get_ohlc(coin_id: str, vs_currency: str = 'usd', days: int = 1, interval: str = None) -> str:
     """
     Fetches OHLC (Open, High, Low, Close) data for a specified cryptocurrency for the last number of days.
+    CoinGecko picks the candle size from `days`; pass `interval` (e.g. '15m', '1h', '4h', '1d', '1w')
+    to get candles of that size, built from the price series instead.
     """
     try:
+        if interval:
+            chart = cg.get_coin_market_chart_by_id(id=coin_id, vs_currency=vs_currency, days=days)
+            return str(_resampled_ohlc(chart, interval))
         data = cg.get_coin_ohlc_by_id(id=coin_id, vs_currency=vs_currency, days=days)
         return str(data)
     except Exception as e:
@@ -68,13 +84,9 @@ def calculate_macd(prices: List[float], slow: int = 26, fast: int = 12, signal:
     Calculates the Moving Average Convergence Divergence (MACD) for a series of prices.
     """
     try:
-        prices_series = pd.Series(prices)
-        ema_fast = prices_series.ewm(span=fast, adjust=False).mean()
-        ema_slow = prices_series.ewm(span=slow, adjust=False).mean()
-        macd = ema_fast - ema_slow
-        signal_line = macd.ewm(span=signal, adjust=False).mean()
-        macd_value = macd.iloc[-1]
-        signal_line_value = signal_line.iloc[-1]
+        macd, signal_line, _ = indicators.macd(prices, fast=fast, slow=slow, signal=signal)
+        macd_value = macd[-1]
+        signal_line_value = signal_line[-1]
         trend = "bullish" if macd_value > signal_line_value else "bearish"
         return (
             f"The Moving Average Convergence Divergence (MACD) is {macd_value:.2f}, "
@@ -110,27 +122,82 @@ def calculate_rsi(prices: List[float], period: int = 14) -> str:
     Calculates the Relative Strength Index (RSI) for a given series of prices.
     """
     try:
-        prices_array = np.array(prices)
-        deltas = np.diff(prices_array)
-        seed = deltas[:period+1]
-        up = seed[seed >= 0].sum()/period
-        down = -seed[seed < 0].sum()/period
-        rs = up/down
-        rsi = np.zeros_like(prices_array)
-        rsi[:period] = 100. - 100./(1.+rs)
+        if len(prices) <= period:
+            return f"At least {period + 1} prices are needed to calculate a {period}-period RSI."
+        rsi = indicators.rsi(prices, period)
+        return f"RSI: {rsi[-1]:.2f}"
+    except Exception as e:
+        logging.error(f"Exception occurred while calculating RSI: {str(e)}")
+        return "Failed to calculate RSI."
+
+@tool
+async def aget_market_data(coin_ids: List[str], vs_currency: str = 'usd') -> str:
+    """
+    Fetches and returns current market data for specified cryptocurrencies (async).
+    """
+    try:
+        data = await async_http.get_json(f"{COINGECKO_API_URL}/simple/price",
+                                         params={'ids': ','.join(coin_ids), 'vs_currencies': vs_currency})
+        return str(data)
+    except Exception as e:
+        logging.error(f"Exception occurred while fetching market data: {str(e)}")
+        return "Failed to fetch market data."
 
-        for i in range(period, len(prices_array)):
-            delta = deltas[i-1]
-            upval = delta if delta > 0 else 0.
-            downval = -delta if delta < 0 else 0.
+@tool
+async def aget_historical_market_data(coin_id: str, vs_currency: str = 'usd', days: int = 90) -> str:
+    """
+    Fetches historical market data for a specified cryptocurrency over a number of days (async).
+    """
+    try:
+        data = await async_http.get_json(f"{COINGECKO_API_URL}/coins/{coin_id}/market_chart",
+                                         params={'vs_currency': vs_currency, 'days': days})
+        return str(data)
+    except Exception as e:
+        logging.error(f"Exception occurred while fetching historical market data: {str(e)}")
+        return "Failed to fetch historical market data."
 
-            up = (up*(period-1) + upval)/period
-            down = (down*(period-1) + downval)/period
+@tool
+async def aget_ohlc(coin_id: str, vs_currency: str = 'usd', days: int = 1, interval: str = None) -> str:
+    """
+    Fetches OHLC (Open, High, Low, Close) data for a specified cryptocurrency for the last number of days (async).
+    Pass `interval` (e.g. '15m', '1h', '4h', '1d', '1w') to get candles of that size, built from the price series.
+    """
+    try:
+        if interval:
+            chart = await async_http.get_json(f"{COINGECKO_API_URL}/coins/{coin_id}/market_chart",
+                                              params={'vs_currency': vs_currency, 'days': days})
+            return str(_resampled_ohlc(chart, interval))
+        data = await async_http.get_json(f"{COINGECKO_API_URL}/coins/{coin_id}/ohlc",
+                                         params={'vs_currency': vs_currency, 'days': days})
+        return str(data)
+    except Exception as e:
+        logging.error(f"Exception occurred while fetching OHLC data: {str(e)}")
+        return "Failed to fetch OHLC data."
 
-            rs = up/down
-            rsi[i] = 100. - 100./(1.+rs)
+@tool
+async def aget_trending_cryptos() -> str:
+    """
+    Retrieves the list of trending cryptocurrencies on CoinGecko (async).
+    """
+    try:
+        data = await async_http.get_json(f"{COINGECKO_API_URL}/search/trending")
+        trending_names = [item['item']['name'] for item in data['coins']]
+        return ', '.join(trending_names)
+    except Exception as e:
+        logging.error(f"Exception occurred while fetching trending cryptocurrencies: {str(e)}")
+        return "Failed to fetch trending cryptocurrencies."
 
-        return f"RSI: {rsi[-1]:.2f}"
+@tool
+async def aget_exchange_rates(coin_id: str = 'bitcoin') -> str:
+    """
+    Retrieves exchange rates for a given coin (default is Bitcoin) to all other currencies (async).
+    """
+    try:
+        data = await async_http.get_json(f"{COINGECKO_API_URL}/exchange_rates")
+        rates = data['rates']
+        base_rate = rates[coin_id]['value']
+        exchange_rates = {cur: rate['value'] / base_rate for cur, rate in rates.items()}
+        return str(exchange_rates)
     except Exception as e:
-        logging.error(f"Exception occurred while calculating RSI: {str(e)}")
-        return "Failed to calculate RSI."
+        logging.error(f"Exception occurred while fetching exchange rates: {str(e)}")
+        return "Failed to fetch exchange rates."
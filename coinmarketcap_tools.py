@@ -1,6 +1,9 @@
 import os
+import asyncio
+import aiohttp
 from requests import Session, ConnectionError, Timeout, TooManyRedirects
 from langchain.tools import tool
+from http_client import async_http
 
 # Load API key from environment variable
 API_KEY = os.getenv('CMC_PRO_API_KEY')
@@ -28,6 +31,14 @@ class CoinMarketCapAPI:
             print(f"Error fetching data from CoinMarketCap: {e}")
             return None
 
+    async def amake_request(self, endpoint, parameters):
+        try:
+            url = f"{self.base_url}/{endpoint}"
+            return await async_http.get_json(url, params=parameters, headers=self.headers, raise_for_status=False)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            print(f"Error fetching data from CoinMarketCap: {e}")
+            return None
+
 cmc_api = CoinMarketCapAPI()
 
 @tool
@@ -69,3 +80,43 @@ def get_global_metrics(convert='USD'):
     endpoint = 'global-metrics/quotes/latest'
     parameters = {'convert': convert}
     return cmc_api.make_request(endpoint, parameters)
+
+
+@tool
+async def aget_latest_listings(start=1, limit=10, convert='USD'):
+    """
+    Get the latest cryptocurrency listings (async).
+    Args:
+    - start (int): Starting point of the listings.
+    - limit (int): Number of listings to retrieve.
+    - convert (str): The fiat or cryptocurrency to convert the listings to.
+    """
+    endpoint = 'cryptocurrency/listings/latest'
+    parameters = {
+        'start': start,
+        'limit': limit,
+        'convert': convert
+    }
+    return await cmc_api.amake_request(endpoint, parameters)
+
+@tool
+async def aget_crypto_metadata(crypto_id):
+    """
+    Get metadata for a specific cryptocurrency (async).
+    Args:
+    - crypto_id (int): The CoinMarketCap ID of the cryptocurrency.
+    """
+    endpoint = 'cryptocurrency/info'
+    parameters = {'id': crypto_id}
+    return await cmc_api.amake_request(endpoint, parameters)
+
+@tool
+async def aget_global_metrics(convert='USD'):
+    """
+    Get the latest global cryptocurrency market metrics (async).
+    Args:
+    - convert (str): The fiat or cryptocurrency to convert the metrics to.
+    """
+    endpoint = 'global-metrics/quotes/latest'
+    parameters = {'convert': convert}
+    return await cmc_api.amake_request(endpoint, parameters)
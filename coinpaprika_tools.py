@@ -1,6 +1,11 @@
+import asyncio
+import functools
+import aiohttp
 import requests
 from cachetools import TTLCache, cached
+from cachetools.keys import hashkey
 from langchain.agents import tool  # Use the @tool decorator
+from http_client import async_http
 
 # Define a robust cache to manage API rate limits
 cache = TTLCache(maxsize=100, ttl=600)
@@ -27,6 +32,78 @@ def safe_request(url, params=None):
     except requests.RequestException as e:
         raise APIError(500, f"An error occurred while handling your request: {str(e)}")
 
+async def asafe_request(url, params=None):
+    """Async counterpart of `safe_request` running on the shared aiohttp client."""
+    headers = {"User-Agent": "coinpaprika/python"}
+    try:
+        return await async_http.get_json(url, params=params, headers=headers)
+    except aiohttp.ClientResponseError as e:
+        if e.status == 404:
+            raise APIError(404, "The requested resource was not found.")
+        raise APIError(e.status, str(e))
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        raise APIError(500, f"An error occurred while handling your request: {str(e)}")
+
+def acached(cache):
+    """Cache coroutine results in `cache`, keyed by function name and arguments."""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = hashkey(func.__name__, *args, **kwargs)
+            try:
+                return cache[key]
+            except KeyError:
+                pass
+            result = await func(*args, **kwargs)
+            cache[key] = result
+            return result
+        return wrapper
+    return decorator
+
+def _format_coin_details(coin_id, data):
+    details = {
+        "Name": data["name"],
+        "Symbol": data["symbol"],
+        "Type": data["type"],
+        "Active": str(data["is_active"]),
+        "Rank": data["rank"],
+        "Description": data["description"]
+    }
+    detail_str = "\n".join([f"{k}: {v}" for k, v in details.items()])
+    detail_link = f"https://coinpaprika.com/coin/{coin_id}"
+    return f"Coin Details:\n{detail_str}\nMore details: {detail_link}"
+
+def _format_coin_tags(data):
+    tags = "\n".join([f"{tag['name']}: {tag['description']}" for tag in data])
+    tags_link = "https://coinpaprika.com/tags/"
+    return f"Available Tags:\n{tags}\nExplore more tags: {tags_link}"
+
+def _format_market_overview(data):
+    market_overview = {
+        "Total Market Cap (USD)": data["market_cap_usd"],
+        "24h Volume (USD)": data["volume_24h_usd"],
+        "Bitcoin Dominance (%)": data["bitcoin_dominance_percentage"],
+        "Number of Cryptocurrencies": data["cryptocurrencies_number"],
+        "Market Cap ATH": data["market_cap_ath_value"],
+        "Volume 24h ATH": data["volume_24h_ath_value"],
+    }
+    overview_str = "\n".join([f"{k}: {v}" for k, v in market_overview.items()])
+    overview_link = "https://coinpaprika.com/"
+    return f"Market Overview:\n{overview_str}\nCheck the full market overview: {overview_link}"
+
+def _format_ticker_info(coin_id, data):
+    ticker_info = {
+        "Name": data["name"],
+        "Symbol": data["symbol"],
+        "Price (USD)": data.get("quotes", {}).get("USD", {}).get("price"),
+        "24h Volume (USD)": data.get("quotes", {}).get("USD", {}).get("volume_24h"),
+        "Market Cap (USD)": data.get("quotes", {}).get("USD", {}).get("market_cap"),
+        "Percent Change 24h": data.get("quotes", {}).get("USD", {}).get("percent_change_24h"),
+    }
+    ticker_str = "\n".join([f"{k}: {v}" for k, v in ticker_info.items()])
+    ticker_link = f"https://coinpaprika.com/coin/{coin_id}/"
+    return f"Ticker Information:\n{ticker_str}\nView on CoinPaprika: {ticker_link}"
+
 @tool
 @cached(cache)
 def get_coin_details(coin_id: str) -> str:
@@ -34,17 +111,7 @@ def get_coin_details(coin_id: str) -> str:
     api_url = f"https://api.coinpaprika.com/v1/coins/{coin_id}"
     try:
         data = safe_request(api_url)
-        details = {
-            "Name": data["name"],
-            "Symbol": data["symbol"],
-            "Type": data["type"],
-            "Active": str(data["is_active"]),
-            "Rank": data["rank"],
-            "Description": data["description"]
-        }
-        detail_str = "\n".join([f"{k}: {v}" for k, v in details.items()])
-        detail_link = f"https://coinpaprika.com/coin/{coin_id}"
-        return f"Coin Details:\n{detail_str}\nMore details: {detail_link}"
+        return _format_coin_details(coin_id, data)
     except APIError as e:
         return f"Error fetching coin details: {e}"
 
@@ -55,9 +122,7 @@ def get_coin_tags():
     api_url = "https://api.coinpaprika.com/v1/tags"
     try:
         data = safe_request(api_url)
-        tags = "\n".join([f"{tag['name']}: {tag['description']}" for tag in data])
-        tags_link = "https://coinpaprika.com/tags/"
-        return f"Available Tags:\n{tags}\nExplore more tags: {tags_link}"
+        return _format_coin_tags(data)
     except APIError as e:
         return f"Error fetching tags: {e}"
     
@@ -68,17 +133,7 @@ def get_market_overview():
     api_url = "https://api.coinpaprika.com/v1/global"
     try:
         data = safe_request(api_url)
-        market_overview = {
-            "Total Market Cap (USD)": data["market_cap_usd"],
-            "24h Volume (USD)": data["volume_24h_usd"],
-            "Bitcoin Dominance (%)": data["bitcoin_dominance_percentage"],
-            "Number of Cryptocurrencies": data["cryptocurrencies_number"],
-            "Market Cap ATH": data["market_cap_ath_value"],
-            "Volume 24h ATH": data["volume_24h_ath_value"],
-        }
-        overview_str = "\n".join([f"{k}: {v}" for k, v in market_overview.items()])
-        overview_link = "https://coinpaprika.com/"
-        return f"Market Overview:\n{overview_str}\nCheck the full market overview: {overview_link}"
+        return _format_market_overview(data)
     except APIError as e:
         return f"Error fetching market overview: {e}"
 
@@ -89,16 +144,50 @@ def get_ticker_info(coin_id: str):
     api_url = f"https://api.coinpaprika.com/v1/tickers/{coin_id}"
     try:
         data = safe_request(api_url)
-        ticker_info = {
-            "Name": data["name"],
-            "Symbol": data["symbol"],
-            "Price (USD)": data.get("quotes", {}).get("USD", {}).get("price"),
-            "24h Volume (USD)": data.get("quotes", {}).get("USD", {}).get("volume_24h"),
-            "Market Cap (USD)": data.get("quotes", {}).get("USD", {}).get("market_cap"),
-            "Percent Change 24h": data.get("quotes", {}).get("USD", {}).get("percent_change_24h"),
-        }
-        ticker_str = "\n".join([f"{k}: {v}" for k, v in ticker_info.items()])
-        ticker_link = f"https://coinpaprika.com/coin/{coin_id}/"
-        return f"Ticker Information:\n{ticker_str}\nView on CoinPaprika: {ticker_link}"
+        return _format_ticker_info(coin_id, data)
+    except APIError as e:
+        return f"Error fetching ticker info: {e}"
+
+@tool
+@acached(cache)
+async def aget_coin_details(coin_id: str) -> str:
+    """Fetches and returns details for a specified coin (async)."""
+    api_url = f"https://api.coinpaprika.com/v1/coins/{coin_id}"
+    try:
+        data = await asafe_request(api_url)
+        return _format_coin_details(coin_id, data)
+    except APIError as e:
+        return f"Error fetching coin details: {e}"
+
+@tool
+@acached(cache)
+async def aget_coin_tags():
+    """Fetches and returns a list of all cryptocurrency tags with their description (async)."""
+    api_url = "https://api.coinpaprika.com/v1/tags"
+    try:
+        data = await asafe_request(api_url)
+        return _format_coin_tags(data)
+    except APIError as e:
+        return f"Error fetching tags: {e}"
+
+@tool
+@acached(cache)
+async def aget_market_overview():
+    """Fetches and returns the global cryptocurrency market overview (async)."""
+    api_url = "https://api.coinpaprika.com/v1/global"
+    try:
+        data = await asafe_request(api_url)
+        return _format_market_overview(data)
+    except APIError as e:
+        return f"Error fetching market overview: {e}"
+
+@tool
+@acached(cache)
+async def aget_ticker_info(coin_id: str):
+    """Fetches and returns ticker information for a specific coin (async)."""
+    api_url = f"https://api.coinpaprika.com/v1/tickers/{coin_id}"
+    try:
+        data = await asafe_request(api_url)
+        return _format_ticker_info(coin_id, data)
     except APIError as e:
         return f"Error fetching ticker info: {e}"
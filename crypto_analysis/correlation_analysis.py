@@ -1,11 +1,234 @@
+"""
+Asset correlation: a headless rolling-window engine, plus a heatmap helper for notebooks.
+
+`RollingCorrelation` keeps the window's return sums as (assets, assets) matrices, so adding
+a bar and dropping the oldest one are a few rank-one updates, O(assets^2), instead of a
+full `DataFrame.corr()`. Each pair uses the bars where both assets have a return, like
+pandas' pairwise-complete `corr()`. Matplotlib is only imported by
+`calculate_and_plot_correlations`, never by the engine.
+"""
+from typing import Any, Dict, Mapping, Sequence, Union
+
+import numpy as np
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
+
+SHRINKAGE_METHODS = ('ledoit_wolf',)
 
 def calculate_and_plot_correlations(prices_df: pd.DataFrame, title: str = 'Asset Correlation Matrix') -> pd.DataFrame:
+    """Price correlation heatmap for interactive use; blocks until the window is closed."""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     correlation_matrix = prices_df.corr()
     plt.figure(figsize=(10, 8))
     sns.heatmap(correlation_matrix, annot=True, fmt=".2f", cmap='coolwarm', square=True)
     plt.title(title)
     plt.show()
     return correlation_matrix
+
+def correlation_matrix(prices_df: pd.DataFrame, window: int = None, log_returns: bool = True,
+                       shrinkage: Union[float, str] = 0.0) -> pd.DataFrame:
+    """Return correlation of the price columns over the last `window` bars (all by default)."""
+    engine = RollingCorrelation(prices_df.columns, window=window or max(len(prices_df) - 1, 1),
+                                log_returns=log_returns, shrinkage=shrinkage)
+    engine.extend(prices_df)
+    return engine.frame()
+
+
+class RollingCorrelation:
+    """
+    Rolling-window return correlation and covariance for a fixed list of assets.
+
+    Feed one price per asset per bar with `update()` (a mapping or a sequence aligned with
+    `assets`; missing or NaN prices are fine) or many bars at once with `extend()`. Returns
+    are log (`log_returns`) or simple returns against each asset's last seen price.
+
+    `shrinkage` pulls off-diagonal correlations (and covariances) towards zero: a fixed
+    intensity in [0, 1], or 'ledoit_wolf' for the Ledoit-Wolf intensity estimated from the
+    standardised returns in the window. Pairs with fewer than `min_periods` shared returns
+    are NaN.
+
+    The sums are rank-one updated as bars enter and leave, and recomputed exactly from the
+    window once per lap so rounding errors cannot build up.
+    """
+    def __init__(self, assets: Sequence[str], window: int = 30, log_returns: bool = True,
+                 shrinkage: Union[float, str] = 0.0, min_periods: int = 3):
+        if isinstance(shrinkage, str):
+            if shrinkage not in SHRINKAGE_METHODS:
+                raise ValueError(f"Unsupported shrinkage '{shrinkage}'. Use a float in [0, 1] or one of: "
+                                 f"{', '.join(SHRINKAGE_METHODS)}.")
+        elif not 0.0 <= shrinkage <= 1.0:
+            raise ValueError("Shrinkage intensity must be between 0 and 1.")
+        self.assets = list(assets)
+        self.window = window
+        self.log_returns = log_returns
+        self.shrinkage = shrinkage
+        self.min_periods = min_periods
+        self._positions = {asset: i for i, asset in enumerate(self.assets)}
+        size = len(self.assets)
+        self._last = np.full(size, np.nan)
+        self._returns = np.zeros((window, size))  # ring buffer; missing returns are stored as 0
+        self._valid = np.zeros((window, size), dtype=bool)
+        self._next = 0
+        self.count = 0
+        # [i, j] entries cover the bars where both i and j have a return. Shared bar counts and
+        # sums of asset i's returns and squared returns are stacked so one product updates all three
+        self._stacked = np.zeros((3 * size, size))
+        self._pairs, self._sum, self._sum_sq = self._stacked[:size], self._stacked[size:2 * size], self._stacked[2 * size:]
+        self._cross = np.zeros((size, size))  # sum of products
+
+    def __len__(self):
+        return min(self.count, self.window)
+
+    def _prices(self, prices: Union[Mapping[str, float], Sequence[float], np.ndarray]) -> np.ndarray:
+        if isinstance(prices, Mapping):
+            vector = np.full(len(self.assets), np.nan)
+            for asset, price in prices.items():
+                position = self._positions.get(asset)
+                if position is not None and price is not None:
+                    vector[position] = price
+            return vector
+        vector = np.asarray(prices, dtype=np.float64)
+        if vector.shape != (len(self.assets),):
+            raise ValueError(f"Expected {len(self.assets)} prices, got shape {vector.shape}.")
+        return vector
+
+    def _bar_returns(self, previous: np.ndarray, prices: np.ndarray):
+        """Returns of `prices` over `previous` (same shape) and where both were valid."""
+        valid = (prices > 0) & (previous > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = np.log(prices / previous) if self.log_returns else prices / previous - 1.0
+        return np.where(valid, returns, 0.0), valid
+
+    def update(self, prices: Union[Mapping[str, float], Sequence[float], np.ndarray]) -> None:
+        """Add one bar of prices."""
+        prices = self._prices(prices)
+        returns, valid = self._bar_returns(self._last, prices)
+        self._last = np.where(prices > 0, prices, self._last)
+        # Bars before the first return only seed the last prices
+        if self.count or valid.any():
+            self._add(returns, valid)
+
+    def extend(self, prices: Union[pd.DataFrame, np.ndarray]) -> None:
+        """Add many bars at once: a (bars, assets) array or a DataFrame with the asset columns."""
+        if isinstance(prices, pd.DataFrame):
+            prices = prices.reindex(columns=self.assets).to_numpy(dtype=np.float64)
+        prices = np.asarray(prices, dtype=np.float64)
+        if not len(prices):
+            return
+        # Last seen price before each bar, carrying prices forward over gaps
+        seen = np.vstack((self._last, np.where(prices > 0, prices, np.nan)))
+        carried = pd.DataFrame(seen).ffill().to_numpy()
+        returns, valid = self._bar_returns(carried[:-1], prices)
+        self._last = carried[-1]
+        if not self.count:
+            # Bars before the first return only seed the last prices
+            started = valid.any(axis=1)
+            if not started.any():
+                return
+            returns, valid = returns[started.argmax():], valid[started.argmax():]
+        if len(returns) < self.window:
+            for row, row_valid in zip(returns, valid):
+                self._add(row, row_valid)
+            return
+        self._returns[:], self._valid[:] = returns[-self.window:], valid[-self.window:]
+        self._next = 0
+        self.count += len(returns)
+        self._refresh()
+
+    def _add(self, returns: np.ndarray, valid: np.ndarray) -> None:
+        slot = self._next
+        if self.count >= self.window:
+            # Add the new bar and drop the one it replaces in a single rank-two update
+            self._accumulate(np.stack((returns, self._returns[slot])), np.stack((valid, self._valid[slot])),
+                             np.array([[1.0], [-1.0]]))
+        else:
+            self._accumulate(returns[None], valid[None], np.ones((1, 1)))
+        self._returns[slot], self._valid[slot] = returns, valid
+        self._next = (slot + 1) % self.window
+        self.count += 1
+        if self._next == 0:
+            self._refresh()
+
+    def _accumulate(self, returns: np.ndarray, valid: np.ndarray, signs: np.ndarray) -> None:
+        """Add `signs`-weighted bars (rows of returns/valid) to the sums."""
+        present = valid.astype(np.float64)
+        signed = returns * signs
+        self._stacked += np.hstack((present * signs, signed, signed * returns)).T @ present
+        self._cross += signed.T @ returns
+
+    def _refresh(self) -> None:
+        """Recompute the sums exactly from the returns in the window."""
+        rows = len(self)
+        returns, present = self._returns[:rows], self._valid[:rows].astype(np.float64)
+        self._stacked[:] = np.hstack((present, returns, returns * returns)).T @ present
+        self._cross[:] = returns.T @ returns
+
+    def _moments(self):
+        """Pairwise covariance and the two assets' variances over each pair's shared bars."""
+        pairs = np.where(self._pairs >= max(self.min_periods, 2), self._pairs, np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            covariance = (self._cross - self._sum * self._sum.T / pairs) / (pairs - 1)
+            variance = np.maximum((self._sum_sq - self._sum * self._sum / pairs) / (pairs - 1), 0.0)
+        return covariance, variance, variance.T
+
+    def shrinkage_intensity(self) -> float:
+        if not isinstance(self.shrinkage, str):
+            return float(self.shrinkage)
+        return self._ledoit_wolf()
+
+    def _ledoit_wolf(self) -> float:
+        """Ledoit-Wolf intensity for shrinking the window's standardised returns towards the identity."""
+        rows = len(self)
+        if rows < 2:
+            return 0.0
+        returns, valid = self._returns[:rows], self._valid[:rows]
+        counts = valid.sum(axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = returns.sum(axis=0) / counts
+            std = np.sqrt((np.where(valid, returns - mean, 0.0) ** 2).sum(axis=0) / counts)
+            standardised = np.where(valid & (std > 0), (returns - mean) / std, 0.0)
+        size = standardised.shape[1]
+        sample = standardised.T @ standardised / rows
+        target = np.trace(sample) / size
+        distance = ((sample - target * np.eye(size)) ** 2).sum() / size
+        if distance <= 0:
+            return 0.0
+        spread = ((standardised ** 2).sum(axis=1) ** 2).sum() / rows - (sample ** 2).sum()
+        return float(np.clip(spread / (rows * size) / distance, 0.0, 1.0))
+
+    def _shrunk(self, matrix: np.ndarray) -> np.ndarray:
+        intensity = self.shrinkage_intensity()
+        if intensity:
+            diagonal = np.diag(matrix).copy()
+            matrix = matrix * (1.0 - intensity)
+            np.fill_diagonal(matrix, diagonal)
+        return matrix
+
+    def covariance(self) -> np.ndarray:
+        """(assets, assets) covariance of returns over the window; NaN for pairs short of data."""
+        covariance, _, _ = self._moments()
+        return self._shrunk(covariance)
+
+    def correlation(self) -> np.ndarray:
+        """(assets, assets) correlation of returns over the window; NaN for pairs short of data."""
+        covariance, left, right = self._moments()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            correlation = np.clip(covariance / np.sqrt(left * right), -1.0, 1.0)
+        np.fill_diagonal(correlation, np.where(np.diag(left) > 0, 1.0, np.nan))
+        return self._shrunk(correlation)
+
+    def frame(self, matrix: str = 'correlation') -> pd.DataFrame:
+        """The correlation (or 'covariance') matrix labelled with the assets."""
+        values = self.covariance() if matrix == 'covariance' else self.correlation()
+        return pd.DataFrame(values, index=self.assets, columns=self.assets)
+
+    def matrices(self) -> Dict[str, Any]:
+        """Everything a renderer needs, as plain arrays: assets, correlation, covariance, shared bars."""
+        return {
+            'assets': list(self.assets),
+            'correlation': self.correlation(),
+            'covariance': self.covariance(),
+            'observations': self._pairs.round().astype(np.int64),
+            'shrinkage': self.shrinkage_intensity(),
+        }
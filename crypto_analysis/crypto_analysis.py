@@ -1,6 +1,7 @@
 from .market_structure import analyze_market_structure
-from .sentiment_analysis import analyze_social_sentiment
-from .correlation_analysis import calculate_and_plot_correlations
+from .sentiment_analysis import analyze_social_sentiment, analyze_social_sentiment_chunks
+from .correlation_analysis import calculate_and_plot_correlations, correlation_matrix
+from .liquidity_analysis import analyze_liquidity
 
 class CryptoAnalysis:
     def __init__(self):
@@ -13,5 +14,13 @@ class CryptoAnalysis:
     def sentiment(self, social_data):
         return analyze_social_sentiment(social_data)
 
-    def correlation(self, prices_df):
-        return calculate_and_plot_correlations(prices_df)
+    def sentiment_chunks(self, source, output=None, **kwargs):
+        return analyze_social_sentiment_chunks(source, output=output, **kwargs)
+
+    def correlation(self, prices_df, plot=False, **kwargs):
+        if plot:
+            return calculate_and_plot_correlations(prices_df)
+        return correlation_matrix(prices_df, **kwargs)
+
+    def liquidity(self, books, notional=100000, levels=100):
+        return analyze_liquidity(books, notional=notional, levels=levels)
@@ -0,0 +1,138 @@
+"""
+Vectorised technical indicators.
+
+Every function takes 1-D price arrays or 2-D (series, time) arrays, e.g. one row per
+coin, and computes along the last axis. Outputs have the input's shape, with NaN where
+the indicator is not defined yet (the warm-up period). Moving averages use cumulative sums
+or sliding windows. Exponential and Wilder smoothing run as first-order recursive filters
+(`scipy.signal.lfilter`), so no Python loop touches individual samples. Because the filters
+are recursive, a NaN inside the input propagates to every later value, so drop gaps first.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
+
+
+def _as_array(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def _recursive_mean(values: np.ndarray, alpha: float, initial: np.ndarray) -> np.ndarray:
+    """y[t] = alpha * x[t] + (1 - alpha) * y[t-1] along the last axis, with y[-1] = `initial`."""
+    zi = ((1 - alpha) * initial)[..., np.newaxis]
+    smoothed, _ = lfilter([alpha], [1, alpha - 1], values, axis=-1, zi=zi)
+    return smoothed
+
+
+def _wilder(values: np.ndarray, period: int) -> np.ndarray:
+    """Wilder smoothing: seeded with the mean of the first `period` values, then alpha = 1/period."""
+    out = np.full(values.shape, np.nan)
+    if values.shape[-1] < period:
+        return out
+    seed = values[..., :period].mean(axis=-1)
+    out[..., period - 1] = seed
+    out[..., period:] = _recursive_mean(values[..., period:], 1.0 / period, seed)
+    return out
+
+
+def sma(values, window: int) -> np.ndarray:
+    """Simple moving average over `window` samples."""
+    x = _as_array(values)
+    out = np.full(x.shape, np.nan)
+    if x.shape[-1] < window:
+        return out
+    cumsum = np.cumsum(x, axis=-1)
+    out[..., window - 1] = cumsum[..., window - 1]
+    out[..., window:] = cumsum[..., window:] - cumsum[..., :-window]
+    return out / window
+
+
+def ema(values, span: Optional[int] = None, alpha: Optional[float] = None) -> np.ndarray:
+    """
+    Exponential moving average seeded with the first value, matching pandas
+    `ewm(span=..., adjust=False).mean()`. Give either `span` (alpha = 2 / (span + 1)) or `alpha`.
+    """
+    if alpha is None:
+        if span is None:
+            raise ValueError("Either span or alpha must be given.")
+        alpha = 2.0 / (span + 1)
+    x = _as_array(values)
+    if x.shape[-1] == 0:
+        return x.copy()
+    return _recursive_mean(x, alpha, x[..., 0])
+
+
+def rsi(prices, period: int = 14) -> np.ndarray:
+    """
+    Wilder's Relative Strength Index. The first value is at index `period` (after `period`
+    price changes); a window with no movement at all reads 50.
+    """
+    x = _as_array(prices)
+    out = np.full(x.shape, np.nan)
+    deltas = np.diff(x, axis=-1)
+    avg_gain = _wilder(np.clip(deltas, 0, None), period)
+    avg_loss = _wilder(np.clip(-deltas, 0, None), period)
+    total = avg_gain + avg_loss
+    with np.errstate(invalid='ignore', divide='ignore'):
+        out[..., 1:] = np.where(total > 0, 100.0 * avg_gain / total, np.where(np.isnan(total), np.nan, 50.0))
+    return out
+
+
+def macd(prices, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """MACD line (fast EMA - slow EMA), its signal EMA and the histogram between them."""
+    x = _as_array(prices)
+    line = ema(x, span=fast) - ema(x, span=slow)
+    signal_line = ema(line, span=signal)
+    return line, signal_line, line - signal_line
+
+
+def bollinger_bands(prices, window: int = 20, num_std: float = 2.0,
+                    ddof: int = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Middle (SMA), upper and lower Bollinger bands, `num_std` rolling standard deviations apart."""
+    x = _as_array(prices)
+    middle = sma(x, window)
+    std = np.full(x.shape, np.nan)
+    if x.shape[-1] >= window:
+        std[..., window - 1:] = sliding_window_view(x, window, axis=-1).std(axis=-1, ddof=ddof)
+    return middle, middle + num_std * std, middle - num_std * std
+
+
+def true_range(high, low, close) -> np.ndarray:
+    """Per-bar true range; the first bar, having no previous close, uses high - low."""
+    high, low, close = _as_array(high), _as_array(low), _as_array(close)
+    out = high - low
+    previous = close[..., :-1]
+    out[..., 1:] = np.maximum(out[..., 1:], np.maximum(np.abs(high[..., 1:] - previous),
+                                                       np.abs(low[..., 1:] - previous)))
+    return out
+
+
+def atr(high, low, close, period: int = 14) -> np.ndarray:
+    """Average True Range with Wilder smoothing; the first value is at index `period - 1`."""
+    return _wilder(true_range(high, low, close), period)
+
+
+def stochastic(high, low, close, k_period: int = 14, d_period: int = 3) -> Tuple[np.ndarray, np.ndarray]:
+    """Stochastic oscillator: %K over `k_period` bars and %D, its `d_period` SMA."""
+    high, low, close = _as_array(high), _as_array(low), _as_array(close)
+    k = np.full(close.shape, np.nan)
+    if close.shape[-1] >= k_period:
+        highest = sliding_window_view(high, k_period, axis=-1).max(axis=-1)
+        lowest = sliding_window_view(low, k_period, axis=-1).min(axis=-1)
+        span = highest - lowest
+        with np.errstate(invalid='ignore', divide='ignore'):
+            k[..., k_period - 1:] = np.where(span > 0, 100.0 * (close[..., k_period - 1:] - lowest) / span, 50.0)
+    d = np.full(close.shape, np.nan)
+    if close.shape[-1] >= k_period:
+        d[..., k_period - 1:] = sma(k[..., k_period - 1:], d_period)
+    return k, d
+
+
+def obv(close, volume) -> np.ndarray:
+    """On-Balance Volume, starting from 0 at the first bar."""
+    close, volume = _as_array(close), _as_array(volume)
+    direction = np.zeros(close.shape)
+    direction[..., 1:] = np.sign(np.diff(close, axis=-1))
+    return np.cumsum(direction * volume, axis=-1)
@@ -0,0 +1,86 @@
+import numpy as np
+from typing import Dict, List, Tuple
+
+def book_arrays(books: List[dict], levels: int = 100) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Pack depth responses ({'bids': [[price, qty], ...], 'asks': [...]}) into padded
+    (n_books, levels) arrays. Missing levels have NaN prices and zero quantity.
+    """
+    n = len(books)
+    bid_px = np.full((n, levels), np.nan)
+    bid_qty = np.zeros((n, levels))
+    ask_px = np.full((n, levels), np.nan)
+    ask_qty = np.zeros((n, levels))
+    for i, book in enumerate(books):
+        for side, px, qty in (('bids', bid_px, bid_qty), ('asks', ask_px, ask_qty)):
+            rows = (book or {}).get(side) or []
+            if not rows:
+                continue
+            arr = np.asarray(rows[:levels], dtype=float)
+            px[i, :len(arr)] = arr[:, 0]
+            qty[i, :len(arr)] = arr[:, 1]
+    return bid_px, bid_qty, ask_px, ask_qty
+
+def cumulative_depth(px: np.ndarray, qty: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Cumulative base quantity and quote notional walking away from the touch."""
+    notional = np.nan_to_num(px) * qty
+    return np.cumsum(qty, axis=-1), np.cumsum(notional, axis=-1)
+
+def vwap_fill(px: np.ndarray, qty: np.ndarray, notional: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Average fill price for a market order of `notional` quote currency walking the book.
+
+    Returns (vwap, filled_notional) per book; vwap is NaN where the side is empty and is
+    computed over the available depth when the book is too thin to fill completely.
+    """
+    level_notional = np.nan_to_num(px) * qty
+    cum_notional = np.cumsum(level_notional, axis=-1)
+    consumed = np.clip(notional - (cum_notional - level_notional), 0, level_notional)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        base = np.where(consumed > 0, consumed / np.where(np.isnan(px), 1, px), 0).sum(axis=-1)
+        filled = consumed.sum(axis=-1)
+        vwap = np.where(base > 0, filled / base, np.nan)
+    return vwap, filled
+
+def liquidity_metrics(bid_px: np.ndarray, bid_qty: np.ndarray, ask_px: np.ndarray, ask_qty: np.ndarray,
+                      notional: float = 100000, imbalance_levels: int = 10) -> Dict[str, np.ndarray]:
+    """
+    Spread, mid, top-of-book imbalance and market-order impact for every book at once.
+
+    Slippage is quoted in basis points against the mid price, so it includes half the spread.
+    Imbalance is (bid qty - ask qty) / (bid qty + ask qty) over the first `imbalance_levels`.
+    """
+    best_bid = bid_px[:, 0]
+    best_ask = ask_px[:, 0]
+    mid = (best_bid + best_ask) / 2
+    spread = best_ask - best_bid
+
+    bid_top = bid_qty[:, :imbalance_levels].sum(axis=1)
+    ask_top = ask_qty[:, :imbalance_levels].sum(axis=1)
+    _, bid_cum_notional = cumulative_depth(bid_px, bid_qty)
+    _, ask_cum_notional = cumulative_depth(ask_px, ask_qty)
+
+    buy_vwap, buy_filled = vwap_fill(ask_px, ask_qty, notional)
+    sell_vwap, sell_filled = vwap_fill(bid_px, bid_qty, notional)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return {
+            'best_bid': best_bid,
+            'best_ask': best_ask,
+            'mid': mid,
+            'spread': spread,
+            'spread_bps': spread / mid * 1e4,
+            'imbalance': (bid_top - ask_top) / (bid_top + ask_top),
+            'bid_depth_notional': bid_cum_notional[:, -1],
+            'ask_depth_notional': ask_cum_notional[:, -1],
+            'buy_vwap': buy_vwap,
+            'buy_slippage_bps': (buy_vwap / mid - 1) * 1e4,
+            'buy_fill_ratio': buy_filled / notional,
+            'sell_vwap': sell_vwap,
+            'sell_slippage_bps': (1 - sell_vwap / mid) * 1e4,
+            'sell_fill_ratio': sell_filled / notional,
+        }
+
+def analyze_liquidity(books: List[dict], notional: float = 100000, levels: int = 100) -> Dict[str, np.ndarray]:
+    """Liquidity metrics for a list of depth responses (one row per book)."""
+    return liquidity_metrics(*book_arrays(books, levels), notional=notional)
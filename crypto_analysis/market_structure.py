@@ -1,43 +1,119 @@
+"""
+Market structure from OHLC candles: fair value gaps, swing highs/lows, break of structure
+(BOS) / change of character (CHoCH), order blocks, liquidity pools and previous-period
+high/low levels.
+
+`analyze_market_structure` computes everything for a DataFrame in one call.
+`MarketStructureEngine` does the same work incrementally: `append()` new candles and call
+`results()` again, and only the bars that could have changed are examined. Every table is
+positional (row i describes candle i; NaN where a candle carries no signal) and indices
+into the candles are positions, with 0 meaning "not yet".
+"""
+from typing import Dict, Optional, Tuple
+
 import pandas as pd
 import numpy as np
+from scipy.ndimage import maximum_filter1d, minimum_filter1d
+
+OHLC_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+PREVIOUS_COLUMNS = ('PreviousHigh', 'PreviousLow', 'BrokenHigh', 'BrokenLow')
+# Candles per block in `first_reach`
+_BLOCK = 32
+
+def analyze_market_structure(ohlc: pd.DataFrame, join_consecutive: bool = False, swing_length: int = 50,
+                             close_break: bool = True, liquidity_tolerance: float = 0.002,
+                             time_frame: Optional[str] = '1D') -> dict:
+    """
+    Comprehensive market structure analysis. Returns positional DataFrames under
+    "FVG", "SwingHighsLows", "BOS_CHOCH", "OrderBlocks", "Liquidity" and, when `ohlc` has a
+    DatetimeIndex and `time_frame` is set, "PreviousHighLow". See `MarketStructureEngine`.
+    """
+    engine = MarketStructureEngine(swing_length=swing_length, close_break=close_break,
+                                   join_consecutive=join_consecutive, liquidity_tolerance=liquidity_tolerance,
+                                   time_frame=time_frame)
+    return engine.append(ohlc).results()
+
+def first_reach(values: np.ndarray, starts: np.ndarray, levels: np.ndarray, side: str = 'below') -> np.ndarray:
+    """
+    For each query q, the first index j >= starts[q] with values[j] <= levels[q] (side='below')
+    or values[j] >= levels[q] (side='above'); -1 where the level is never reached.
+
+    Values are cut into blocks of `_BLOCK` whose minima (maxima) get a sparse table. Each
+    query checks the rest of its own block, binary-lifts over the table to the first later
+    block that reaches its level, and scans that block: O(n log n / _BLOCK + queries *
+    (_BLOCK + log n)), all vectorised. Only values from the earliest start onwards are
+    examined, so queries near the end only cost the bars after them.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    starts = np.asarray(starts, dtype=np.int64)
+    levels = np.asarray(levels, dtype=np.float64)
+    if side not in ('below', 'above'):
+        raise ValueError(f"Unsupported side '{side}'. Supported sides: below, above.")
+    result = np.full(len(starts), -1, dtype=np.int64)
+    # Queries starting past the end can never be reached
+    live = np.flatnonzero(starts < len(values))
+    if not len(live):
+        return result
+    lowest = max(int(starts[live].min()), 0)
+    # 'above' is 'below' on negated values; a NaN candle never reaches a level
+    keys = values[lowest:] if side == 'below' else -values[lowest:]
+    targets = levels[live] if side == 'below' else -levels[live]
+    begin = np.maximum(starts[live], 0) - lowest
+    count = -(-len(keys) // _BLOCK)
+    blocks = np.full(count * _BLOCK, np.inf)
+    blocks[:len(keys)] = np.where(np.isnan(keys), np.inf, keys)
+    blocks = blocks.reshape(count, _BLOCK)
+    offsets = np.arange(_BLOCK)
 
-def analyze_market_structure(ohlc: pd.DataFrame, join_consecutive: bool = False) -> dict:
-    """Comprehensive market structure analysis with fair value gaps."""
-    fvg_result = identify_fair_value_gap(ohlc, join_consecutive)
-    return {
-        "FVG": fvg_result
-    }
+    block = begin // _BLOCK
+    reached = (blocks[block] <= targets[:, None]) & (offsets >= (begin % _BLOCK)[:, None])
+    own = reached.any(axis=1)
+    answer = np.where(own, block * _BLOCK + reached.argmax(axis=1), -1)
+
+    rest = np.flatnonzero(~own)
+    if len(rest):
+        # table[k][i] is the minimum of blocks i .. i + 2**k - 1
+        table = [blocks.min(axis=1)]
+        while 2 ** len(table) <= count:
+            span = 2 ** (len(table) - 1)
+            table.append(np.minimum(table[-1][:-span], table[-1][span:]))
+        current, target = block[rest] + 1, targets[rest]
+        for k in range(len(table) - 1, -1, -1):
+            minima = table[k]
+            inside = current < len(minima)
+            skip = inside & (minima[np.minimum(current, len(minima) - 1)] > target)
+            current = np.where(skip, current + 2 ** k, current)
+        found = current < count
+        rest, current = rest[found], current[found]
+        hits = blocks[current] <= targets[rest][:, None]
+        answer[rest] = current * _BLOCK + hits.argmax(axis=1)
+
+    result[live] = np.where(answer >= 0, answer + lowest, -1)
+    return result
 
 def identify_fair_value_gap(ohlc: pd.DataFrame, join_consecutive: bool = False) -> pd.DataFrame:
-    """Identify Fair Value Gaps (FVG) in the given OHLC data."""
-    fvg = np.where(
-        (ohlc["high"].shift(1) < ohlc["low"].shift(-1)) | (ohlc["low"].shift(1) > ohlc["high"].shift(-1)),
-        np.where(ohlc["close"] > ohlc["open"], 1, -1),
-        np.nan
-    )
-
-    top = np.where(
-        ~np.isnan(fvg),
-        np.where(ohlc["close"] > ohlc["open"], ohlc["low"].shift(-1), ohlc["low"].shift(1)),
-        np.nan
-    )
-
-    bottom = np.where(
-        ~np.isnan(fvg),
-        np.where(ohlc["close"] > ohlc["open"], ohlc["high"].shift(1), ohlc["high"].shift(-1)),
-        np.nan
-    )
-
-    mitigated_index = np.zeros(len(ohlc), dtype=np.int32)
-    for i in np.where(~np.isnan(fvg))[0]:
-        mask = np.zeros(len(ohlc), dtype=np.bool_)
-        if fvg[i] == 1:
-            mask = ohlc["low"][i + 2:] <= top[i]
-        elif fvg[i] == -1:
-            mask = ohlc["high"][i + 2:] >= bottom[i]
-        if np.any(mask):
-            j = np.argmax(mask) + i + 2
-            mitigated_index[i] = j
+    """
+    Identify Fair Value Gaps (FVG) in the given OHLC data.
+
+    With `join_consecutive`, a run of same-direction gaps on consecutive candles is merged
+    into one gap on the run's last candle spanning the run's highest top and lowest bottom.
+    MitigatedIndex is the first candle at least two bars after the gap to trade back into it
+    (0 if none yet), found with `first_reach` in O(n log n).
+    """
+    n = len(ohlc)
+    open_, high, low, close = (ohlc[column].to_numpy(dtype=np.float64) for column in OHLC_COLUMNS[:4])
+    fvg, top, bottom = np.full((3, n), np.nan)
+    if n > 2:
+        fvg[1:-1], top[1:-1], bottom[1:-1] = _gap_rows(open_, high, low, close, 1, n - 1)
+
+    if join_consecutive:
+        fvg, top, bottom = _join_consecutive_gaps(fvg, top, bottom)
+
+    mitigated_index = np.zeros(n, dtype=np.int64)
+    for direction, values, levels, side in ((1, low, top, 'below'), (-1, high, bottom, 'above')):
+        gaps = np.flatnonzero(fvg == direction)
+        touched = first_reach(values, gaps + 2, levels[gaps], side)
+        mitigated_index[gaps] = np.maximum(touched, 0)
 
     mitigated_index = np.where(np.isnan(fvg), np.nan, mitigated_index)
 
@@ -47,3 +123,433 @@ def identify_fair_value_gap(ohlc: pd.DataFrame, join_consecutive: bool = False)
         "Bottom": bottom,
         "MitigatedIndex": mitigated_index
     })
+
+def previous_high_low(ohlc: pd.DataFrame, time_frame: str = '1D') -> pd.DataFrame:
+    """
+    High and low of the previous `time_frame` period ('1h', '4h', '1D', '1W', '1M' for a
+    month, ...) for every candle of a DatetimeIndex-ed frame, and whether the current period
+    has traded above (BrokenHigh) or below (BrokenLow) them so far.
+    """
+    periods = _period_starts(ohlc.index, time_frame)
+    levels = _previous_levels(ohlc['high'].to_numpy(dtype=np.float64), ohlc['low'].to_numpy(dtype=np.float64), periods)
+    return pd.DataFrame(dict(zip(PREVIOUS_COLUMNS, levels)))
+
+def _gap_rows(open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray, first: int, last: int):
+    """Gap direction, top and bottom of candles first..last-1; each needs both neighbours."""
+    prev_high, prev_low = high[first - 1:last - 1], low[first - 1:last - 1]
+    next_high, next_low = high[first + 1:last + 1], low[first + 1:last + 1]
+    gap = (prev_high < next_low) | (prev_low > next_high)
+    rising = close[first:last] > open_[first:last]
+    fvg = np.where(gap, np.where(rising, 1.0, -1.0), np.nan)
+    top = np.where(gap, np.where(rising, next_low, prev_low), np.nan)
+    bottom = np.where(gap, np.where(rising, prev_high, next_high), np.nan)
+    return fvg, top, bottom
+
+def _join_consecutive_gaps(fvg: np.ndarray, top: np.ndarray, bottom: np.ndarray):
+    """Merge runs of same-direction gaps on adjacent candles into the run's last candle."""
+    fvg, top, bottom = fvg.copy(), top.copy(), bottom.copy()
+    gaps = np.flatnonzero(~np.isnan(fvg))
+    if len(gaps) < 2:
+        return fvg, top, bottom
+    # A run continues while the next gap is on the next candle with the same direction
+    continues = (np.diff(gaps) == 1) & (fvg[gaps[1:]] == fvg[gaps[:-1]])
+    run_starts = np.flatnonzero(np.concatenate(([True], ~continues)))
+    run_ends = np.concatenate((run_starts[1:], [len(gaps)])) - 1
+    merged = run_ends > run_starts
+    if not merged.any():
+        return fvg, top, bottom
+    run_top = np.maximum.reduceat(top[gaps], run_starts)
+    run_bottom = np.minimum.reduceat(bottom[gaps], run_starts)
+    last = gaps[run_ends]
+    top[last] = run_top
+    bottom[last] = run_bottom
+    absorbed = np.setdiff1d(gaps, last)
+    fvg[absorbed] = top[absorbed] = bottom[absorbed] = np.nan
+    return fvg, top, bottom
+
+def _raw_swings(high: np.ndarray, low: np.ndarray, half: int, first: int, last: int) -> np.ndarray:
+    """
+    Swing type of candles first..last-1: 1 where the high is the highest of the `half`
+    candles either side, -1 where the low is the lowest (a high wins if both), else 0.
+    """
+    if last <= first:
+        return np.zeros(0, dtype=np.int8)
+    window = 2 * half + 1
+    span = slice(first - half, last + half)
+    peak = maximum_filter1d(high[span], window)[half:half + last - first]
+    trough = minimum_filter1d(low[span], window)[half:half + last - first]
+    return np.where(high[first:last] == peak, 1, np.where(low[first:last] == trough, -1, 0)).astype(np.int8)
+
+def _alternate_swings(positions: np.ndarray, types: np.ndarray, levels: np.ndarray):
+    """Keep only the highest high (lowest low) of each run of same-type swings, so highs and lows alternate."""
+    if len(positions) < 2:
+        return positions, types, levels
+    run = np.concatenate(([0], np.cumsum(types[1:] != types[:-1])))
+    # Within a run the most extreme swing sorts first; lexsort is stable, so ties keep the earliest
+    order = np.lexsort((-(types * levels), run))
+    keep = np.sort(order[np.concatenate(([True], run[order][1:] != run[order][:-1]))])
+    return positions[keep], types[keep], levels[keep]
+
+def _range_reduce(ufunc: np.ufunc, values: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """ufunc.reduce over each values[starts[q]:ends[q]] (all non-empty) in one reduceat call."""
+    if not len(starts):
+        return np.empty(0, dtype=values.dtype)
+    if ends.max() >= len(values):
+        values = np.append(values, values[-1])
+    bounds = np.empty(2 * len(starts), dtype=np.int64)
+    bounds[0::2], bounds[1::2] = starts, ends
+    return ufunc.reduceat(values, bounds)[0::2]
+
+def _period_starts(index: pd.DatetimeIndex, time_frame: str) -> np.ndarray:
+    """Start of each timestamp's `time_frame` period as int64 nanoseconds."""
+    if not isinstance(index, pd.DatetimeIndex):
+        raise ValueError("Previous high/low levels need a DatetimeIndex.")
+    if time_frame in ('W', '1W', 'M', '1M'):
+        return index.tz_localize(None).to_period(time_frame[-1]).start_time.asi8
+    return index.floor(time_frame).asi8
+
+def _previous_levels(high: np.ndarray, low: np.ndarray, periods: np.ndarray) -> np.ndarray:
+    """(4, n) array of PREVIOUS_COLUMNS for candles labelled with non-decreasing period starts."""
+    result = np.full((4, len(high)), np.nan)
+    if not len(high):
+        return result
+    new_period = np.concatenate(([True], periods[1:] != periods[:-1]))
+    period = np.cumsum(new_period) - 1
+    starts = np.flatnonzero(new_period)
+    result[0] = np.concatenate(([np.nan], np.maximum.reduceat(high, starts)[:-1]))[period]
+    result[1] = np.concatenate(([np.nan], np.minimum.reduceat(low, starts)[:-1]))[period]
+    running_high = pd.Series(high).groupby(period).cummax().to_numpy()
+    running_low = pd.Series(low).groupby(period).cummin().to_numpy()
+    known = period > 0
+    result[2, known] = running_high[known] > result[0, known]
+    result[3, known] = running_low[known] < result[1, known]
+    return result
+
+def _frame(start: int, stop: int, positions: np.ndarray, columns: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """Rows start..stop-1 of a positional table holding `columns` at `positions` and NaN elsewhere."""
+    shown = positions >= start
+    data = {}
+    for name, values in columns.items():
+        data[name] = np.full(stop - start, np.nan)
+        data[name][positions[shown] - start] = values[shown]
+    return pd.DataFrame(data, index=pd.RangeIndex(start, stop))
+
+def _resized(array: np.ndarray, capacity: int, fill) -> np.ndarray:
+    grown = np.full(array.shape[:-1] + (capacity,), fill, dtype=array.dtype)
+    grown[..., :array.shape[-1]] = array
+    return grown
+
+
+class _Memo:
+    """
+    Values stored under complex keys as sorted arrays, so lookups are one searchsorted.
+    A pair (a, b) is keyed as a + 1j * b, which NumPy sorts lexicographically.
+    """
+    def __init__(self, dtype):
+        self.keys = np.empty(0, dtype=np.complex128)
+        self.values = np.empty(0, dtype=dtype)
+
+    def lookup(self, keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(hit mask, stored values; meaningless where not hit)."""
+        if not len(self.keys):
+            return np.zeros(len(keys), dtype=bool), np.zeros(len(keys), dtype=self.values.dtype)
+        pos = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+        return self.keys[pos] == keys, self.values[pos]
+
+    def replace(self, keys: np.ndarray, values: np.ndarray) -> None:
+        order = np.argsort(keys)
+        self.keys, self.values = keys[order], values[order]
+
+
+class _ReachCache:
+    """
+    Memoised `first_reach` answers keyed by (start, level). A level that was reached stays
+    reached; one that was not is searched again only over the candles appended since. Each
+    query replaces the memo with the keys it asked about, so structures that disappear
+    (a swing superseded by a more extreme one) do not accumulate.
+    """
+    def __init__(self):
+        self._memo = _Memo(np.int64)
+        self._checked = 0  # candles searched when the memo was last replaced
+
+    def query(self, values: np.ndarray, starts: np.ndarray, levels: np.ndarray, side: str) -> np.ndarray:
+        keys = starts + 1j * levels
+        hit, found = self._memo.lookup(keys)
+        found = np.where(hit, found, -1)
+        pending = np.flatnonzero(found < 0)
+        if len(pending):
+            resume = np.where(hit[pending], np.maximum(starts[pending], self._checked), starts[pending])
+            found[pending] = first_reach(values, resume, levels[pending], side)
+        self._memo.replace(keys, found)
+        self._checked = len(values)
+        return found
+
+
+class MarketStructureEngine:
+    """
+    Incremental market structure over a growing OHLC series.
+
+    - Swing highs/lows: a candle whose high (low) is the extreme of the `swing_length // 2`
+      candles on either side, so a swing is confirmed that many candles later. Runs of
+      same-type swings keep only the most extreme one, so highs and lows alternate.
+    - BOS / CHoCH: over four alternating swings, higher lows and higher highs (lower highs
+      and lower lows) are a bullish (bearish) break of structure; a higher high after a
+      lower low (a lower low after a higher high) is a change of character. The signal sits
+      on the third swing, Level is the swing being broken and BrokenIndex the first candle
+      to close (`close_break`, else trade) beyond it; signals show once they are broken.
+    - Order blocks: when a swing high (low) is broken, the candle with the lowest low
+      (highest high) between the swing and the break is a bullish (bearish) order block.
+      MitigatedIndex is the first candle after the break to trade through its far side.
+    - Liquidity: consecutive swing highs (lows) within `liquidity_tolerance` (a fraction of
+      price) of each other, with no trading beyond them in between, pool into one level;
+      Swept is the first candle after the pool to trade beyond its extreme.
+    - Previous high/low: see `previous_high_low`; needs a DatetimeIndex and `time_frame`.
+
+    Candles live in growable NumPy buffers. `append()` only evaluates swings and gaps that
+    the new candles can confirm, and every "first candle to reach a level" search is
+    memoised, so an unresolved level only scans candles appended since it was last checked.
+    """
+    def __init__(self, swing_length: int = 50, close_break: bool = True, join_consecutive: bool = False,
+                 liquidity_tolerance: float = 0.002, time_frame: Optional[str] = '1D'):
+        self.half = max(swing_length // 2, 1)
+        self.close_break = close_break
+        self.join_consecutive = join_consecutive
+        self.liquidity_tolerance = liquidity_tolerance
+        self.time_frame = time_frame
+        self._n = 0
+        self._has_volume = False
+        self._data = np.full((len(OHLC_COLUMNS), 0), np.nan)
+        self._swing = np.zeros(0, dtype=np.int8)
+        self._gaps_raw = np.full((3, 0), np.nan)  # direction, top, bottom before joining
+        self._gaps = np.full((3, 0), np.nan)
+        self._gap_mitigated = np.full(0, -1, dtype=np.int64)
+        self._gap_checked = np.zeros(0, dtype=np.int64)
+        self._open_gaps = np.zeros(0, dtype=np.int64)
+        self._periods: Optional[np.ndarray] = None
+        self._previous = np.full((len(PREVIOUS_COLUMNS), 0), np.nan)
+        self._reaches: Dict[str, _ReachCache] = {}
+        self._extremes = {direction: _Memo(np.float64) for direction in (1, -1)}
+        self._order_block_candles = {direction: _Memo(np.int64) for direction in (1, -1)}
+
+    def __len__(self):
+        return self._n
+
+    def _column(self, name: str) -> np.ndarray:
+        return self._data[OHLC_COLUMNS.index(name), :self._n]
+
+    def _reserve(self, rows: int) -> None:
+        if rows <= self._data.shape[1]:
+            return
+        capacity = max(rows, 2 * self._data.shape[1], 1024)
+        self._data = _resized(self._data, capacity, np.nan)
+        self._swing = _resized(self._swing, capacity, 0)
+        self._gaps_raw = _resized(self._gaps_raw, capacity, np.nan)
+        self._gaps = _resized(self._gaps, capacity, np.nan)
+        self._gap_mitigated = _resized(self._gap_mitigated, capacity, -1)
+        self._gap_checked = _resized(self._gap_checked, capacity, 0)
+        self._previous = _resized(self._previous, capacity, np.nan)
+        if self._periods is not None:
+            self._periods = _resized(self._periods, capacity, 0)
+
+    def append(self, ohlc: pd.DataFrame) -> 'MarketStructureEngine':
+        """Add candles (open/high/low/close[/volume] columns, oldest first) after the existing ones."""
+        if not len(ohlc):
+            return self
+        if self._n == 0:
+            self._has_volume = 'volume' in ohlc
+            if self.time_frame and isinstance(ohlc.index, pd.DatetimeIndex):
+                self._periods = np.zeros(self._data.shape[1], dtype=np.int64)
+        old, n = self._n, self._n + len(ohlc)
+        self._reserve(n)
+        for k, column in enumerate(OHLC_COLUMNS):
+            if column in ohlc:
+                self._data[k, old:n] = ohlc[column].to_numpy(dtype=np.float64)
+        if self._periods is not None:
+            self._periods[old:n] = _period_starts(ohlc.index, self.time_frame)
+        self._n = n
+        self._update_swings(old)
+        self._update_gaps(old)
+        self._update_previous(old)
+        return self
+
+    def _update_swings(self, old: int) -> None:
+        # Candles up to old - half - 1 already had `half` candles after them
+        first = max(old - self.half, self.half)
+        last = self._n - self.half
+        self._swing[first:max(last, first)] = _raw_swings(self._column('high'), self._column('low'), self.half, first, last)
+
+    def _update_gaps(self, old: int) -> None:
+        # A gap on candle i needs candle i + 1, so the previous last candle is evaluated now
+        first, last = max(old - 1, 1), self._n - 1
+        if last <= first:
+            return
+        open_, high, low, close = (self._column(column) for column in OHLC_COLUMNS[:4])
+        self._gaps_raw[:, first:last] = _gap_rows(open_, high, low, close, first, last)
+        start = first
+        if self.join_consecutive:
+            # The gap run ending just before the new candles may continue into them
+            while start > 1 and not np.isnan(self._gaps_raw[0, start - 1]):
+                start -= 1
+            self._gaps[:, start:last] = _join_consecutive_gaps(*self._gaps_raw[:, start:last])
+        else:
+            self._gaps[:, start:last] = self._gaps_raw[:, start:last]
+        self._gap_mitigated[start:last] = -1
+        self._gap_checked[start:last] = 0
+        fresh = start + np.flatnonzero(~np.isnan(self._gaps[0, start:last]))
+        gaps = np.concatenate((self._open_gaps[self._open_gaps < start], fresh))
+        for direction, values, level_row, side in ((1, low, 1, 'below'), (-1, high, 2, 'above')):
+            selected = gaps[self._gaps[0, gaps] == direction]
+            starts = np.maximum(selected + 2, self._gap_checked[selected])
+            touched = first_reach(values, starts, self._gaps[level_row, selected], side)
+            self._gap_mitigated[selected] = touched
+            self._gap_checked[selected] = self._n
+        self._open_gaps = gaps[self._gap_mitigated[gaps] < 0]
+
+    def _update_previous(self, old: int) -> None:
+        if self._periods is None:
+            return
+        n = self._n
+        periods = self._periods[:n]
+        # Recompute from the period before the one the last old candle belongs to
+        current = int(np.searchsorted(periods, periods[old - 1])) if old else 0
+        begin = int(np.searchsorted(periods, periods[current - 1])) if current else 0
+        levels = _previous_levels(self._column('high')[begin:], self._column('low')[begin:], periods[begin:])
+        self._previous[:, current:n] = levels[:, current - begin:]
+
+    def _reach(self, name: str, column: str, starts: np.ndarray, levels: np.ndarray, side: str) -> np.ndarray:
+        cache = self._reaches.setdefault(name, _ReachCache())
+        return cache.query(self._column(column), starts, levels, side)
+
+    def _break_index(self, name: str, starts: np.ndarray, levels: np.ndarray, direction: int) -> np.ndarray:
+        """First candle from `starts` to close (or trade) strictly above (direction 1) or below levels."""
+        if direction == 1:
+            column = 'close' if self.close_break else 'high'
+            return self._reach(f"{name}_up", column, starts, np.nextafter(levels, np.inf), 'above')
+        column = 'close' if self.close_break else 'low'
+        return self._reach(f"{name}_down", column, starts, np.nextafter(levels, -np.inf), 'below')
+
+    def _range_extremes(self, starts: np.ndarray, ends: np.ndarray, direction: int) -> np.ndarray:
+        """Highest high (direction 1) or lowest low of each candle range, cached per range."""
+        keys = starts + 1j * ends
+        hit, extremes = self._extremes[direction].lookup(keys)
+        missing = np.flatnonzero(~hit)
+        if len(missing):
+            ufunc, column = (np.maximum, 'high') if direction == 1 else (np.minimum, 'low')
+            extremes[missing] = _range_reduce(ufunc, self._column(column), starts[missing], ends[missing])
+        self._extremes[direction].replace(keys, extremes)
+        return extremes
+
+    def swing_points(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Positions, types (1 high, -1 low) and price levels of the confirmed, alternating swings."""
+        swing = self._swing[:self._n]
+        positions = np.flatnonzero(swing)
+        types = swing[positions].astype(np.int64)
+        levels = np.where(types == 1, self._column('high')[positions], self._column('low')[positions])
+        return _alternate_swings(positions, types, levels)
+
+    def results(self, start: int = 0) -> dict:
+        """
+        The same tables as `analyze_market_structure` for candles `start` onwards (negative
+        counts from the end, e.g. -500 for a chart of the last 500 candles). Rows keep
+        their absolute positions as the index.
+        """
+        n = self._n
+        start = max(n + start, 0) if start < 0 else min(start, n)
+        positions, types, levels = self.swing_points()
+        fvg, top, bottom = self._gaps[:, start:n]
+        mitigated = np.where(np.isnan(fvg), np.nan, np.maximum(self._gap_mitigated[start:n], 0))
+        result = {
+            "FVG": pd.DataFrame({"FVG": fvg, "Top": top, "Bottom": bottom, "MitigatedIndex": mitigated},
+                                index=pd.RangeIndex(start, n)),
+            "SwingHighsLows": _frame(start, n, positions, {"HighLow": types, "Level": levels}),
+            "BOS_CHOCH": _frame(start, n, *self._structure_breaks(positions, types, levels)),
+            "OrderBlocks": _frame(start, n, *self._order_blocks(positions, types, levels)),
+            "Liquidity": _frame(start, n, *self._liquidity(positions, types, levels)),
+        }
+        if self._periods is not None:
+            result["PreviousHighLow"] = pd.DataFrame(dict(zip(PREVIOUS_COLUMNS, self._previous[:, start:n])),
+                                                     index=pd.RangeIndex(start, n))
+        return result
+
+    def _structure_breaks(self, positions: np.ndarray, types: np.ndarray, levels: np.ndarray):
+        if len(positions) < 4:
+            return np.zeros(0, dtype=np.int64), {name: np.empty(0) for name in ("BOS", "CHOCH", "Level", "BrokenIndex")}
+        # Windows of four alternating swings; up means the window ends with a high
+        v0, v1, v2, v3 = levels[:-3], levels[1:-2], levels[2:-1], levels[3:]
+        up = types[3:] == 1
+        bos = np.where(up & (v0 < v2) & (v2 < v1) & (v1 < v3), 1,
+                       np.where(~up & (v0 > v2) & (v2 > v1) & (v1 > v3), -1, 0))
+        choch = np.where(up & (v3 > v1) & (v1 > v0) & (v0 > v2), 1,
+                         np.where(~up & (v3 < v1) & (v1 < v0) & (v0 < v2), -1, 0))
+        signal = np.flatnonzero((bos != 0) | (choch != 0))
+        at, level = positions[signal + 2], v1[signal]
+        direction = np.where(up[signal], 1, -1)
+        broken = np.full(len(signal), -1, dtype=np.int64)
+        for sign in (1, -1):
+            selected = direction == sign
+            broken[selected] = self._break_index("structure", at[selected] + 1, level[selected], sign)
+        kept = broken >= 0
+        return at[kept], {
+            "BOS": np.where(bos[signal] != 0, direction, np.nan)[kept],
+            "CHOCH": np.where(choch[signal] != 0, direction, np.nan)[kept],
+            "Level": level[kept],
+            "BrokenIndex": broken[kept],
+        }
+
+    def _order_blocks(self, positions: np.ndarray, types: np.ndarray, levels: np.ndarray):
+        high, low, volume = self._column('high'), self._column('low'), self._column('volume')
+        found = {name: [] for name in ("position", "OB", "Top", "Bottom", "OBVolume", "MitigatedIndex")}
+        for direction in (1, -1):
+            swings = positions[types == direction]
+            broken = self._break_index("order_block", swings + 1, levels[types == direction], direction)
+            swings, broken = swings[broken >= 0], broken[broken >= 0]
+            keys = swings + 0j
+            hit, block = self._order_block_candles[direction].lookup(keys)
+            missing = np.flatnonzero(~hit)
+            if len(missing):
+                # The block is the first candle reaching the range's extreme, i.e. its arg-extreme
+                values, side = (low, 'below') if direction == 1 else (high, 'above')
+                starts = swings[missing] + 1
+                extremes = _range_reduce(np.minimum if direction == 1 else np.maximum, values, starts, broken[missing])
+                block[missing] = first_reach(values, starts, extremes, side)
+            self._order_block_candles[direction].replace(keys, block)
+            top, bottom = high[block], low[block]
+            if direction == 1:
+                mitigated = self._reach("block_up", 'low', broken + 1, np.nextafter(bottom, -np.inf), 'below')
+            else:
+                mitigated = self._reach("block_down", 'high', broken + 1, np.nextafter(top, np.inf), 'above')
+            if self._has_volume:
+                traded = sum(volume[np.maximum(broken - lag, 0)] for lag in range(3))
+            else:
+                traded = np.full(len(block), np.nan)
+            for name, values in zip(found, (block, np.full(len(block), direction), top, bottom, traded,
+                                            np.maximum(mitigated, 0))):
+                found[name].append(values)
+        return np.concatenate(found.pop("position")), {name: np.concatenate(values) for name, values in found.items()}
+
+    def _liquidity(self, positions: np.ndarray, types: np.ndarray, levels: np.ndarray):
+        found = {name: [np.empty(0)] for name in ("position", "Liquidity", "Level", "End", "Swept")}
+        for direction in (1, -1):
+            swings, prices = positions[types == direction], levels[types == direction]
+            if len(swings) < 2:
+                continue
+            outer = np.maximum(prices[:-1], prices[1:]) if direction == 1 else np.minimum(prices[:-1], prices[1:])
+            between = self._range_extremes(swings[:-1] + 1, swings[1:], direction)
+            linked = (np.abs(prices[1:] - prices[:-1]) <= self.liquidity_tolerance * np.abs(outer)) & \
+                     (direction * (outer - between) >= 0)
+            # A pool is a maximal run of linked neighbours: swings first..last
+            first = np.flatnonzero(linked & ~np.concatenate(([False], linked[:-1])))
+            last = np.flatnonzero(linked & ~np.concatenate((linked[1:], [False]))) + 1
+            sums = np.concatenate(([0.0], np.cumsum(prices)))
+            mean = (sums[last + 1] - sums[first]) / (last + 1 - first)
+            extreme = _range_reduce(np.maximum if direction == 1 else np.minimum, prices, first, last + 1)
+            end = swings[last]
+            if direction == 1:
+                swept = self._reach("liquidity_up", 'high', end + 1, np.nextafter(extreme, np.inf), 'above')
+            else:
+                swept = self._reach("liquidity_down", 'low', end + 1, np.nextafter(extreme, -np.inf), 'below')
+            for name, values in zip(found, (swings[first], np.full(len(first), direction), mean, end,
+                                            np.maximum(swept, 0))):
+                found[name].append(values)
+        positions = np.concatenate(found.pop("position")).astype(np.int64)
+        return positions, {name: np.concatenate(values) for name, values in found.items()}
@@ -0,0 +1,161 @@
+"""
+OHLCV bars from tick or price series at any interval from '1m' to '1w'.
+
+Timestamps (epoch milliseconds) are mapped to integer bucket numbers, `(t - offset) //
+width`, and each run of equal buckets is reduced with `ufunc.reduceat`, so a whole series
+is aggregated in a handful of vectorised calls. Weekly bars start on Monday 00:00 UTC like
+exchange candles; other intervals are aligned to the epoch. Empty buckets produce no bar.
+"""
+import re
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+BAR_COLUMNS = ('start', 'open', 'high', 'low', 'close', 'volume', 'ticks')
+_UNIT_MS = {'m': 60000, 'h': 3600000, 'd': 86400000, 'w': 604800000}
+# 1970-01-01 was a Thursday; weeks start on Monday 1970-01-05
+_WEEK_OFFSET_MS = 4 * 86400000
+
+def interval_ms(interval: str) -> Tuple[int, int]:
+    """(width, offset) in milliseconds for intervals like '1m', '15m', '4h', '1d' or '1w'."""
+    match = re.fullmatch(r'(\d+)\s*([mhdw])', interval.strip().lower()) if isinstance(interval, str) else None
+    if match is None or int(match.group(1)) <= 0:
+        raise ValueError(f"Unsupported interval '{interval}'. Use a number followed by m, h, d or w, e.g. 1m, 4h, 1d, 1w.")
+    count, unit = int(match.group(1)), match.group(2)
+    return count * _UNIT_MS[unit], _WEEK_OFFSET_MS if unit == 'w' else 0
+
+def resample_ohlcv(timestamps, prices, volumes=None, interval: str = '1h') -> np.ndarray:
+    """Bars with BAR_COLUMNS for a tick/price series, as an (n, 7) array; the last bar may still be open."""
+    return OHLCVResampler(interval).append(timestamps, prices, volumes).bars()
+
+def _aggregate(buckets: np.ndarray, timestamps: np.ndarray, prices: np.ndarray, volumes: np.ndarray):
+    """
+    One row per run of equal buckets in time-sorted ticks: bucket, first and last tick time,
+    then open, high, low, close, volume and tick count.
+    """
+    starts = np.flatnonzero(np.concatenate(([True], buckets[1:] != buckets[:-1])))
+    ends = np.concatenate((starts[1:], [len(buckets)])) - 1
+    rows = np.empty((len(starts), 9))
+    rows[:, 0] = buckets[starts]
+    rows[:, 1] = timestamps[starts]
+    rows[:, 2] = timestamps[ends]
+    rows[:, 3] = prices[starts]
+    rows[:, 4] = np.maximum.reduceat(prices, starts)
+    rows[:, 5] = np.minimum.reduceat(prices, starts)
+    rows[:, 6] = prices[ends]
+    rows[:, 7] = np.add.reduceat(volumes, starts)
+    rows[:, 8] = ends - starts + 1
+    return rows
+
+
+class OHLCVResampler:
+    """
+    Incremental OHLCV bars for one interval.
+
+    `append()` takes ticks in any order within a call. Finished bars are cached in a
+    growable array and never recomputed. New ticks are aggregated in one vectorised pass and
+    folded into the open bar only. Ticks older than the open bar cannot change a finished
+    bar; they are dropped and counted in `late_ticks`.
+    """
+    def __init__(self, interval: str = '1h'):
+        self.interval = interval
+        self.width, self.offset = interval_ms(interval)
+        self._finished = np.empty((0, len(BAR_COLUMNS)))
+        self._count = 0
+        self._open: Optional[np.ndarray] = None  # an _aggregate row
+        self.late_ticks = 0
+
+    def __len__(self):
+        return self._count + (self._open is not None)
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        """Time of the latest tick folded in (epoch ms), or None before the first one."""
+        return None if self._open is None else int(self._open[2])
+
+    def append(self, timestamps, prices, volumes=None) -> 'OHLCVResampler':
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        prices = np.asarray(prices, dtype=np.float64)
+        volumes = np.zeros(len(prices)) if volumes is None else np.asarray(volumes, dtype=np.float64)
+        missing = np.isnan(prices)
+        if missing.any():
+            valid = ~missing
+            timestamps, prices, volumes = timestamps[valid], prices[valid], volumes[valid]
+        if np.isnan(volumes).any():
+            volumes = np.nan_to_num(volumes)
+        if (timestamps[1:] < timestamps[:-1]).any():
+            order = np.argsort(timestamps, kind='stable')
+            timestamps, prices, volumes = timestamps[order], prices[order], volumes[order]
+        buckets = (timestamps - self.offset) // self.width
+        if self._open is not None:
+            late = buckets < self._open[0]
+            if late.any():
+                self.late_ticks += int(late.sum())
+                keep = ~late
+                timestamps, prices, volumes, buckets = timestamps[keep], prices[keep], volumes[keep], buckets[keep]
+        if not len(timestamps):
+            return self
+        rows = _aggregate(buckets, timestamps, prices, volumes)
+        if self._open is not None:
+            if rows[0, 0] == self._open[0]:
+                rows[0] = self._merge(self._open, rows[0])
+            else:
+                rows = np.vstack((self._open, rows))
+        self._finish(rows[:-1])
+        self._open = rows[-1]
+        return self
+
+    @staticmethod
+    def _merge(bar: np.ndarray, update: np.ndarray) -> np.ndarray:
+        """Combine two aggregates of the same bucket; open and close follow tick times."""
+        merged = bar.copy()
+        if update[1] < bar[1]:
+            merged[1], merged[3] = update[1], update[3]
+        if update[2] >= bar[2]:
+            merged[2], merged[6] = update[2], update[6]
+        merged[4] = max(bar[4], update[4])
+        merged[5] = min(bar[5], update[5])
+        merged[7] = bar[7] + update[7]
+        merged[8] = bar[8] + update[8]
+        return merged
+
+    def _bar_rows(self, rows: np.ndarray) -> np.ndarray:
+        bars = np.empty((len(rows), len(BAR_COLUMNS)))
+        bars[:, 0] = rows[:, 0] * self.width + self.offset
+        bars[:, 1:] = rows[:, 3:]
+        return bars
+
+    def _finish(self, rows: np.ndarray) -> None:
+        if not len(rows):
+            return
+        needed = self._count + len(rows)
+        if needed > len(self._finished):
+            grown = np.empty((max(needed, 2 * len(self._finished), 256), len(BAR_COLUMNS)))
+            grown[:self._count] = self._finished[:self._count]
+            self._finished = grown
+        self._finished[self._count:needed] = self._bar_rows(rows)
+        self._count = needed
+
+    def bars(self, include_open: bool = True, limit: Optional[int] = None) -> np.ndarray:
+        """(n, 7) array of BAR_COLUMNS, oldest first; `limit` keeps the latest bars."""
+        with_open = include_open and self._open is not None
+        start = max(self._count - (limit - with_open), 0) if limit else 0
+        # Slice before stacking, so only the requested bars are copied
+        finished = self._finished[start:self._count]
+        if with_open:
+            return np.vstack((finished, self._bar_rows(self._open[None])))
+        return finished.copy()
+
+    def frame(self, include_open: bool = True, limit: Optional[int] = None) -> pd.DataFrame:
+        """Bars as a DataFrame with Date/Open/High/Low/Close/Volume/Ticks columns for candlestick charts."""
+        bars = self.bars(include_open, limit)
+        return pd.DataFrame({
+            'Date': pd.to_datetime(bars[:, 0].astype(np.int64), unit='ms'),
+            'Open': bars[:, 1],
+            'High': bars[:, 2],
+            'Low': bars[:, 3],
+            'Close': bars[:, 4],
+            'Volume': bars[:, 5],
+            'Ticks': bars[:, 6].astype(np.int64),
+        })
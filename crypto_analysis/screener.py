@@ -0,0 +1,238 @@
+"""
+Vectorised multi-asset technical screening.
+
+Kline histories for many symbols are aligned into (coins, time) arrays and every indicator
+referenced by a screen is computed once for all coins with `crypto_analysis.indicators`.
+Screens are written in a small condition language, e.g.
+
+    rsi < 30 and macd crosses above signal
+    close > sma_50 and atr_pct < 5
+    price above bb_upper or stoch_k crossing down stoch_d
+
+Clauses compare two operands (an indicator name or a number) with <, <=, >, >=, above,
+below, 'crosses above' / 'crossing up' or 'crosses below' / 'crossing down'; 'and' binds
+tighter than 'or'. Comparisons use each coin's latest bar; crossings compare the last two.
+"""
+import re
+from typing import Callable, Dict, List, NamedTuple, Sequence, Tuple, Union
+
+import numpy as np
+
+from . import indicators
+
+KLINE_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+INDICATOR_NAMES = ('open, high, low, close (or price), volume, change_pct, rsi[_N], sma_N, ema_N, macd, '
+                   'macd_signal (or signal), macd_hist, bb_upper[_N], bb_middle[_N], bb_lower[_N], atr[_N], '
+                   'atr_pct[_N], stoch_k, stoch_d, obv')
+ALIASES = {'price': 'close', 'signal': 'macd_signal'}
+
+_CROSS_PHRASES = (
+    (re.compile(r'\bcross(?:es|ed|ing)?\s+(?:above|up|over)\b'), ' crosses_above '),
+    (re.compile(r'\bcross(?:es|ed|ing)?\s+(?:below|down|under)\b'), ' crosses_below '),
+    (re.compile(r'\b(?:is\s+)?above\b'), ' > '),
+    (re.compile(r'\b(?:is\s+)?below\b'), ' < '),
+)
+_CLAUSE = re.compile(r'^(?P<left>[\w.\-]+)\s*(?P<op><=|>=|<|>|crosses_above|crosses_below)\s*(?P<right>[\w.\-]+)?$')
+# Unary crossings compare an indicator with its usual partner line
+_CROSS_PARTNERS = {'macd': 'macd_signal', 'stoch_k': 'stoch_d'}
+_COMPARISONS: Dict[str, Callable[[np.ndarray, np.ndarray], np.ndarray]] = {
+    '<': np.less, '<=': np.less_equal, '>': np.greater, '>=': np.greater_equal,
+}
+
+
+class Condition(NamedTuple):
+    left: Union[str, float]
+    op: str
+    right: Union[str, float]
+
+    def __str__(self):
+        return f"{self.left} {self.op.replace('_', ' ')} {self.right}"
+
+
+def _operand(token: str) -> Union[str, float]:
+    try:
+        return float(token)
+    except ValueError:
+        return token
+
+
+def parse_conditions(expression: str) -> List[List[Condition]]:
+    """Parse a screen into OR-groups of AND-ed conditions; raises ValueError on bad syntax."""
+    text = expression.lower().strip()
+    for pattern, replacement in _CROSS_PHRASES:
+        text = pattern.sub(replacement, text)
+    groups = []
+    for group in re.split(r'\s+or\s+', text):
+        clauses = []
+        for clause in re.split(r'\s+and\s+', group.strip()):
+            match = _CLAUSE.match(' '.join(clause.split()))
+            if match is None:
+                raise ValueError(f"Cannot parse condition '{clause.strip()}'. "
+                                 "Use e.g. 'rsi < 30', 'close above sma_50' or 'macd crosses above signal'.")
+            left, op, right = match.group('left'), match.group('op'), match.group('right')
+            if right is None:
+                if op not in ('crosses_above', 'crosses_below') or left not in _CROSS_PARTNERS:
+                    raise ValueError(f"Condition '{clause.strip()}' needs a right-hand side.")
+                right = _CROSS_PARTNERS[left]
+            clauses.append(Condition(_operand(left), op, _operand(right)))
+        groups.append(clauses)
+    return groups
+
+
+def _lookback(name: str) -> int:
+    """Bars an indicator needs before its latest value is defined."""
+    name = ALIASES.get(name, name)
+    base, _, suffix = name.rpartition('_')
+    if not suffix.isdigit():
+        base, suffix = name, ''
+    period = int(suffix) if suffix else None
+    if base == 'rsi':
+        return (period or 14) + 1
+    if base in ('sma', 'ema') and period:
+        return period
+    if base in ('macd', 'macd_signal', 'macd_hist'):
+        return 26 + 9
+    if base in ('bb_upper', 'bb_middle', 'bb_lower'):
+        return period or 20
+    if base in ('atr', 'atr_pct'):
+        return period or 14
+    if base == 'stoch_k':
+        return 14
+    if base == 'stoch_d':
+        return 14 + 3 - 1
+    if base == 'change_pct':
+        return 2
+    return 1
+
+
+def required_bars(groups: List[List[Condition]]) -> int:
+    """The longest history any condition of a parsed screen needs; crossings need one bar more."""
+    return max((_lookback(operand) + (condition.op in ('crosses_above', 'crosses_below'))
+                for clauses in groups for condition in clauses
+                for operand in (condition.left, condition.right) if isinstance(operand, str)), default=1)
+
+
+def kline_array(rows: Sequence[Sequence]) -> np.ndarray:
+    """Binance klines ([open_time, open, high, low, close, volume, ...], numbers or strings) as an (n, 6) float array."""
+    if not len(rows):
+        return np.empty((0, 6))
+    return np.array(rows, dtype=object)[:, :6].astype(np.float64)
+
+
+def align_klines(klines: Dict[str, Union[np.ndarray, Sequence[Sequence]]],
+                 min_bars: int = 35) -> Tuple[List[str], np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Stack per-symbol klines (`kline_array` output or raw Binance rows) into (coins, bars)
+    float arrays ending at the same bar.
+
+    Symbols whose latest bar is not the most recent one (delisted or halted pairs) or that
+    have fewer than `min_bars` bars are dropped; the rest are trimmed to the shortest
+    remaining history, so the arrays hold no gaps. Pass `required_bars(groups)` as
+    `min_bars`, so one newly listed pair cannot cut every coin below what a screen needs.
+    Returns (symbols, open_times, columns).
+    """
+    series = {symbol: rows if isinstance(rows, np.ndarray) else kline_array(rows) for symbol, rows in klines.items()}
+    series = {symbol: rows for symbol, rows in series.items() if len(rows)}
+    if not series:
+        return [], np.empty(0, dtype=np.int64), {column: np.empty((0, 0)) for column in KLINE_COLUMNS}
+    latest = max(rows[-1, 0] for rows in series.values())
+    kept = {symbol: rows for symbol, rows in series.items() if rows[-1, 0] == latest and len(rows) >= min_bars}
+    if not kept:
+        return [], np.empty(0, dtype=np.int64), {column: np.empty((0, 0)) for column in KLINE_COLUMNS}
+    length = min(len(rows) for rows in kept.values())
+    symbols = list(kept)
+    matrix = np.stack([kept[symbol][-length:] for symbol in symbols])
+    columns = {column: matrix[:, :, i + 1] for i, column in enumerate(KLINE_COLUMNS)}
+    return symbols, matrix[0, :, 0].astype(np.int64), columns
+
+
+class IndicatorPanel:
+    """
+    Lazily computed indicators over aligned (coins, time) OHLCV arrays.
+
+    `get(name)` computes an indicator for every coin in one vectorised call and caches it;
+    see `INDICATOR_NAMES` for the names understood.
+    """
+    def __init__(self, symbols: List[str], columns: Dict[str, np.ndarray]):
+        self.symbols = symbols
+        self._cache: Dict[str, np.ndarray] = dict(columns)
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def get(self, name: str) -> np.ndarray:
+        name = ALIASES.get(name, name)
+        if name not in self._cache:
+            self._cache[name] = self._compute(name)
+        return self._cache[name]
+
+    def _compute(self, name: str) -> np.ndarray:
+        close = self._cache['close']
+        base, _, suffix = name.rpartition('_')
+        if not suffix.isdigit():
+            base, suffix = name, ''
+        period = int(suffix) if suffix else None
+        if base == 'rsi':
+            return indicators.rsi(close, period or 14)
+        if base == 'sma' and period:
+            return indicators.sma(close, period)
+        if base == 'ema' and period:
+            return indicators.ema(close, span=period)
+        if base in ('macd', 'macd_signal', 'macd_hist') and not period:
+            line, signal_line, histogram = indicators.macd(close)
+            self._cache.update(macd=line, macd_signal=signal_line, macd_hist=histogram)
+            return self._cache[base]
+        if base in ('bb_upper', 'bb_middle', 'bb_lower'):
+            window = period or 20
+            middle, upper, lower = indicators.bollinger_bands(close, window)
+            self._cache.update({f"bb_middle_{window}": middle, f"bb_upper_{window}": upper, f"bb_lower_{window}": lower})
+            return self._cache[f"{base}_{window}"]
+        if base == 'atr':
+            return indicators.atr(self._cache['high'], self._cache['low'], close, period or 14)
+        if base == 'atr_pct':
+            return 100.0 * self.get(f"atr_{period or 14}") / close
+        if base in ('stoch_k', 'stoch_d') and not period:
+            k, d = indicators.stochastic(self._cache['high'], self._cache['low'], close)
+            self._cache.update(stoch_k=k, stoch_d=d)
+            return self._cache[base]
+        if base == 'obv' and not period:
+            return indicators.obv(close, self._cache['volume'])
+        if base == 'change_pct' and not period:
+            change = np.full(close.shape, np.nan)
+            change[:, 1:] = 100.0 * (close[:, 1:] / close[:, :-1] - 1)
+            return change
+        raise ValueError(f"Unknown indicator '{name}'. Supported: {INDICATOR_NAMES}.")
+
+    def _values(self, operand: Union[str, float], bars: int) -> np.ndarray:
+        """The last `bars` values of an operand as a (coins, bars) array (numbers broadcast)."""
+        if isinstance(operand, float):
+            return np.full((len(self.symbols), bars), operand)
+        values = self.get(operand)
+        if values.shape[-1] < bars:
+            return np.full((len(self.symbols), bars), np.nan)
+        return values[:, -bars:]
+
+    def evaluate(self, condition: Condition) -> np.ndarray:
+        """Boolean mask over coins; NaN (warming-up) values never match."""
+        if condition.op in _COMPARISONS:
+            left, right = self._values(condition.left, 1)[:, 0], self._values(condition.right, 1)[:, 0]
+            with np.errstate(invalid='ignore'):
+                return _COMPARISONS[condition.op](left, right)
+        left, right = self._values(condition.left, 2), self._values(condition.right, 2)
+        with np.errstate(invalid='ignore'):
+            if condition.op == 'crosses_above':
+                return (left[:, 0] <= right[:, 0]) & (left[:, 1] > right[:, 1])
+            return (left[:, 0] >= right[:, 0]) & (left[:, 1] < right[:, 1])
+
+    def screen(self, expression: Union[str, List[List[Condition]]]) -> np.ndarray:
+        groups = parse_conditions(expression) if isinstance(expression, str) else expression
+        mask = np.zeros(len(self.symbols), dtype=bool)
+        for clauses in groups:
+            group_mask = np.ones(len(self.symbols), dtype=bool)
+            for condition in clauses:
+                group_mask &= self.evaluate(condition)
+            mask |= group_mask
+        return mask
+
+    def latest(self, name: str) -> np.ndarray:
+        return self.get(name)[:, -1]
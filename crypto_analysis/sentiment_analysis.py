@@ -1,11 +1,168 @@
-from textblob import TextBlob
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import nullcontext
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
 import pandas as pd
+from textblob import TextBlob
+
+from .text_normalization import iter_chunks
+
+SENTIMENT_LABELS = pd.CategoricalDtype(['Negative', 'Neutral', 'Positive'])
+
+
+def _score_chunk(texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    polarity = np.empty(len(texts))
+    subjectivity = np.empty(len(texts))
+    for i, text in enumerate(texts):
+        sentiment = TextBlob(text).sentiment
+        polarity[i] = sentiment.polarity
+        subjectivity[i] = sentiment.subjectivity
+    return polarity, subjectivity
+
+
+def _score_texts(texts: pd.Series, chunk_size: int, executor: Optional[Executor] = None,
+                 workers: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Polarity and subjectivity for every row of `texts`, scoring each distinct text once.
+    The distinct texts are split into at least `workers` chunks so every worker gets one.
+    """
+    codes, uniques = pd.factorize(texts.fillna('').astype(str))
+    chunk_size = max(1, min(chunk_size, -(-len(uniques) // workers)))
+    chunks = list(iter_chunks(uniques.tolist(), chunk_size))
+    if executor is not None and len(chunks) > 1:
+        scored = list(executor.map(_score_chunk, chunks))
+    else:
+        scored = [_score_chunk(chunk) for chunk in chunks]
+    if not scored:
+        return np.empty(len(codes)), np.empty(len(codes))
+    polarity = np.concatenate([chunk[0] for chunk in scored])
+    subjectivity = np.concatenate([chunk[1] for chunk in scored])
+    return polarity[codes], subjectivity[codes]
+
+
+def _workers(processes: Optional[int]) -> int:
+    return min(processes, os.cpu_count() or 1) if processes and processes > 1 else 1
+
 
-def analyze_social_sentiment(posts_df: pd.DataFrame, text_column: str = 'text') -> pd.DataFrame:
-    """Analyze sentiment across social media posts using TextBlob."""
-    def get_sentiment(text):
-        blob = TextBlob(text)
-        return blob.sentiment.polarity, blob.sentiment.subjectivity
-    posts_df['Polarity'], posts_df['Subjectivity'] = zip(*posts_df[text_column].apply(get_sentiment))
-    posts_df['Sentiment'] = posts_df['Polarity'].apply(lambda x: 'Positive' if x > 0 else ('Negative' if x < 0 else 'Neutral'))
+def _pool(processes: Optional[int]):
+    if _workers(processes) > 1:
+        # Spawned, not forked, so callers that already run threads cannot deadlock the children
+        return ProcessPoolExecutor(max_workers=_workers(processes), mp_context=multiprocessing.get_context('spawn'))
+    return nullcontext()
+
+
+def analyze_social_sentiment(posts_df: pd.DataFrame, text_column: str = 'text', chunk_size: int = 20000,
+                             processes: Optional[int] = None) -> pd.DataFrame:
+    """
+    Analyze sentiment across social media posts using TextBlob.
+
+    Duplicate texts (reposts, copy-pasta) are scored once. Unique texts are scored in chunks,
+    across `processes` worker processes when given, and the labels are assigned vectorised.
+    """
+    with _pool(processes) as executor:
+        polarity, subjectivity = _score_texts(posts_df[text_column], chunk_size, executor, _workers(processes))
+    posts_df['Polarity'] = polarity
+    posts_df['Subjectivity'] = subjectivity
+    posts_df['Sentiment'] = np.select([polarity > 0, polarity < 0], ['Positive', 'Negative'], default='Neutral')
     return posts_df
+
+
+def _iter_source(source, text_column: str, chunk_size: int, columns: Optional[List[str]]) -> Iterator[pd.DataFrame]:
+    if isinstance(source, pd.DataFrame):
+        for start in range(0, len(source), chunk_size):
+            yield source.iloc[start:start + chunk_size]
+        return
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        read_columns = None if columns is None else list(dict.fromkeys([*columns, text_column]))
+        if path.endswith(('.parquet', '.pq')):
+            try:
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise ImportError("Reading Parquet files requires pyarrow. Install it with 'pip install pyarrow'.")
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=read_columns):
+                yield batch.to_pandas()
+        else:
+            yield from pd.read_csv(path, chunksize=chunk_size, usecols=read_columns)
+        return
+    yield from source
+
+
+def iter_social_sentiment(source: Union[pd.DataFrame, str, os.PathLike, Iterable[pd.DataFrame]],
+                          text_column: str = 'text', chunk_size: int = 50000, columns: Optional[List[str]] = None,
+                          drop_text: bool = False, processes: Optional[int] = None) -> Iterator[pd.DataFrame]:
+    """
+    Stream sentiment scores chunk by chunk, so memory is bounded by `chunk_size` rather than input size.
+
+    `source` is a DataFrame, a CSV/Parquet path (read in `chunk_size` rows) or an iterable of
+    DataFrame chunks. Each yielded frame has the chunk's `columns` (all by default, minus the
+    text when `drop_text`) plus float32 Polarity/Subjectivity and a categorical Sentiment.
+    """
+    with _pool(processes) as executor:
+        for chunk in _iter_source(source, text_column, chunk_size, columns):
+            polarity, subjectivity = _score_texts(chunk[text_column], chunk_size, executor, _workers(processes))
+            keep = list(chunk.columns) if columns is None else [column for column in columns if column in chunk.columns]
+            if drop_text and text_column in keep:
+                keep.remove(text_column)
+            result = chunk[keep].copy()
+            result['Polarity'] = polarity.astype(np.float32)
+            result['Subjectivity'] = subjectivity.astype(np.float32)
+            # codes 0/1/2 follow SENTIMENT_LABELS: Negative, Neutral, Positive
+            codes = np.sign(polarity).astype(np.int8) + 1
+            result['Sentiment'] = pd.Categorical.from_codes(codes, dtype=SENTIMENT_LABELS)
+            yield result
+
+
+def analyze_social_sentiment_chunks(source: Union[pd.DataFrame, str, os.PathLike, Iterable[pd.DataFrame]],
+                                    output: Optional[Union[str, os.PathLike]] = None, text_column: str = 'text',
+                                    chunk_size: int = 50000, columns: Optional[List[str]] = None,
+                                    drop_text: bool = False, processes: Optional[int] = None
+                                    ) -> Union[Iterator[pd.DataFrame], Dict[str, Any]]:
+    """
+    Streaming counterpart of `analyze_social_sentiment` for inputs too large for memory.
+
+    Without `output`, returns the `iter_social_sentiment` generator. With an `output` path
+    (.parquet/.pq or CSV), scored chunks are appended to it as they are produced and a
+    summary with the row count, mean polarity/subjectivity and label counts is returned.
+    """
+    chunks = iter_social_sentiment(source, text_column, chunk_size, columns, drop_text, processes)
+    if output is None:
+        return chunks
+
+    path = os.fspath(output)
+    rows, polarity_sum, subjectivity_sum = 0, 0.0, 0.0
+    label_counts = np.zeros(len(SENTIMENT_LABELS.categories), dtype=np.int64)
+    writer = None
+    try:
+        for index, chunk in enumerate(chunks):
+            if path.endswith(('.parquet', '.pq')):
+                try:
+                    import pyarrow as pa
+                    import pyarrow.parquet as pq
+                except ImportError:
+                    raise ImportError("Writing Parquet files requires pyarrow. Install it with 'pip install pyarrow'.")
+                if writer is None:
+                    table = pa.Table.from_pandas(chunk, preserve_index=False)
+                    writer = pq.ParquetWriter(path, table.schema)
+                else:
+                    table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+                writer.write_table(table)
+            else:
+                chunk.to_csv(path, mode='w' if index == 0 else 'a', header=index == 0, index=False)
+            rows += len(chunk)
+            polarity_sum += float(chunk['Polarity'].to_numpy().sum(dtype=np.float64))
+            subjectivity_sum += float(chunk['Subjectivity'].to_numpy().sum(dtype=np.float64))
+            label_counts += np.bincount(chunk['Sentiment'].cat.codes, minlength=len(label_counts))
+    finally:
+        if writer is not None:
+            writer.close()
+    return {
+        'rows': rows,
+        'output': path,
+        'mean_polarity': polarity_sum / rows if rows else 0.0,
+        'mean_subjectivity': subjectivity_sum / rows if rows else 0.0,
+        'sentiment_counts': dict(zip(SENTIMENT_LABELS.categories, label_counts.tolist())),
+    }
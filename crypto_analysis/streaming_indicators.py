@@ -0,0 +1,325 @@
+"""
+Incremental counterparts of `crypto_analysis.indicators` for live prices.
+
+Each indicator keeps just enough state to fold in one new value in O(1) and produces the
+same numbers as the batch function over the full history. `snapshot()` returns that state
+as a JSON-serialisable dict, and `from_snapshot()` rebuilds an identical object, so
+indicators survive restarts without replaying history.
+"""
+import json
+import logging
+import math
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+_NAN = float('nan')
+
+
+class StreamingEMA:
+    """EMA seeded with the first value, like `indicators.ema` / pandas `ewm(adjust=False)`."""
+    def __init__(self, span: Optional[int] = None, alpha: Optional[float] = None):
+        if alpha is None:
+            if span is None:
+                raise ValueError("Either span or alpha must be given.")
+            alpha = 2.0 / (span + 1)
+        self.alpha = alpha
+        self.value = _NAN
+        self.count = 0
+
+    def update(self, x: float) -> float:
+        self.value = x if self.count == 0 else self.alpha * x + (1 - self.alpha) * self.value
+        self.count += 1
+        return self.value
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {'alpha': self.alpha, 'value': self.value, 'count': self.count}
+
+    @classmethod
+    def from_snapshot(cls, state: Dict[str, Any]) -> 'StreamingEMA':
+        ema = cls(alpha=state['alpha'])
+        ema.value, ema.count = state['value'], state['count']
+        return ema
+
+
+class StreamingRSI:
+    """Wilder RSI, like `indicators.rsi`: NaN until `period` price changes have been seen."""
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.last_price = _NAN
+        self.changes = 0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.value = _NAN
+
+    def update(self, price: float) -> float:
+        if self.changes == 0 and math.isnan(self.last_price):
+            self.last_price = price
+            return self.value
+        delta = price - self.last_price
+        self.last_price = price
+        gain, loss = max(delta, 0.0), max(-delta, 0.0)
+        self.changes += 1
+        if self.changes <= self.period:
+            # Seed phase: accumulate sums, averaged once `period` changes are in
+            self.avg_gain += gain
+            self.avg_loss += loss
+            if self.changes < self.period:
+                return self.value
+            self.avg_gain /= self.period
+            self.avg_loss /= self.period
+        else:
+            self.avg_gain += (gain - self.avg_gain) / self.period
+            self.avg_loss += (loss - self.avg_loss) / self.period
+        total = self.avg_gain + self.avg_loss
+        self.value = 100.0 * self.avg_gain / total if total > 0 else 50.0
+        return self.value
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {'period': self.period, 'last_price': self.last_price, 'changes': self.changes,
+                'avg_gain': self.avg_gain, 'avg_loss': self.avg_loss, 'value': self.value}
+
+    @classmethod
+    def from_snapshot(cls, state: Dict[str, Any]) -> 'StreamingRSI':
+        rsi = cls(state['period'])
+        for key in ('last_price', 'changes', 'avg_gain', 'avg_loss', 'value'):
+            setattr(rsi, key, state[key])
+        return rsi
+
+
+class StreamingMACD:
+    """MACD line, signal and histogram, like `indicators.macd`."""
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = StreamingEMA(fast)
+        self.slow = StreamingEMA(slow)
+        self.signal = StreamingEMA(signal)
+        self.line = _NAN
+
+    def update(self, price: float) -> float:
+        self.line = self.fast.update(price) - self.slow.update(price)
+        self.signal.update(self.line)
+        return self.line
+
+    @property
+    def histogram(self) -> float:
+        return self.line - self.signal.value
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {'fast': self.fast.snapshot(), 'slow': self.slow.snapshot(), 'signal': self.signal.snapshot(),
+                'line': self.line}
+
+    @classmethod
+    def from_snapshot(cls, state: Dict[str, Any]) -> 'StreamingMACD':
+        macd = cls.__new__(cls)
+        macd.fast = StreamingEMA.from_snapshot(state['fast'])
+        macd.slow = StreamingEMA.from_snapshot(state['slow'])
+        macd.signal = StreamingEMA.from_snapshot(state['signal'])
+        macd.line = state['line']
+        return macd
+
+
+class RollingStats:
+    """
+    Rolling mean (SMA) and standard deviation over the last `window` values.
+
+    Values sit in a fixed ring buffer; the mean and sum of squared deviations are updated
+    Welford-style as one value enters and the oldest leaves, which avoids the cancellation
+    error of running sums of squares at large price levels.
+    """
+    def __init__(self, window: int = 20):
+        self.window = window
+        self._ring: List[float] = [0.0] * window
+        self._next = 0
+        self.count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, x: float) -> float:
+        if self.count < self.window:
+            self.count += 1
+            delta = x - self._mean
+            self._mean += delta / self.count
+            self._m2 += delta * (x - self._mean)
+        else:
+            old = self._ring[self._next]
+            old_mean = self._mean
+            self._mean += (x - old) / self.window
+            self._m2 += (x - old) * (x - self._mean + old - old_mean)
+            self._m2 = max(self._m2, 0.0)
+        self._ring[self._next] = x
+        self._next = (self._next + 1) % self.window
+        return self.mean
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.window
+
+    @property
+    def mean(self) -> float:
+        return self._mean if self.ready else _NAN
+
+    def std(self, ddof: int = 0) -> float:
+        return math.sqrt(self._m2 / (self.window - ddof)) if self.ready else _NAN
+
+    def bollinger(self, num_std: float = 2.0, ddof: int = 0) -> Dict[str, float]:
+        mean, std = self.mean, self.std(ddof)
+        return {'middle': mean, 'upper': mean + num_std * std, 'lower': mean - num_std * std}
+
+    def snapshot(self) -> Dict[str, Any]:
+        # Store the ring oldest-first so restoring does not depend on the write position
+        size = min(self.count, self.window)
+        start = (self._next - size) % self.window
+        values = [self._ring[(start + i) % self.window] for i in range(size)]
+        return {'window': self.window, 'values': values, 'count': self.count, 'mean': self._mean, 'm2': self._m2}
+
+    @classmethod
+    def from_snapshot(cls, state: Dict[str, Any]) -> 'RollingStats':
+        stats = cls(state['window'])
+        values = state['values']
+        stats._ring[:len(values)] = values
+        stats._next = len(values) % stats.window
+        stats.count, stats._mean, stats._m2 = state['count'], state['mean'], state['m2']
+        return stats
+
+
+class IndicatorSet:
+    """The indicators tracked for one symbol: price EMAs, RSI, MACD and rolling SMA/Bollinger stats."""
+    def __init__(self, ema_spans=(20, 50), rsi_period: int = 14, macd=(12, 26, 9), windows=(20, 50)):
+        self.emas = {span: StreamingEMA(span) for span in ema_spans}
+        self.rsi = StreamingRSI(rsi_period)
+        self.macd = StreamingMACD(*macd)
+        self.rolling = {window: RollingStats(window) for window in windows}
+        self.last = _NAN
+        self.count = 0
+
+    def update(self, price: float) -> None:
+        for ema in self.emas.values():
+            ema.update(price)
+        self.rsi.update(price)
+        self.macd.update(price)
+        for stats in self.rolling.values():
+            stats.update(price)
+        self.last = price
+        self.count += 1
+
+    def values(self) -> Dict[str, float]:
+        values = {'last': self.last, 'samples': self.count, f"rsi_{self.rsi.period}": self.rsi.value,
+                  'macd': self.macd.line, 'macd_signal': self.macd.signal.value, 'macd_histogram': self.macd.histogram}
+        for span, ema in self.emas.items():
+            values[f"ema_{span}"] = ema.value
+        for window, stats in self.rolling.items():
+            values[f"sma_{window}"] = stats.mean
+            values[f"std_{window}"] = stats.std()
+        return values
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'emas': {str(span): ema.snapshot() for span, ema in self.emas.items()},
+            'rsi': self.rsi.snapshot(),
+            'macd': self.macd.snapshot(),
+            'rolling': {str(window): stats.snapshot() for window, stats in self.rolling.items()},
+            'last': self.last,
+            'count': self.count,
+        }
+
+    @classmethod
+    def from_snapshot(cls, state: Dict[str, Any]) -> 'IndicatorSet':
+        indicators = cls.__new__(cls)
+        indicators.emas = {int(span): StreamingEMA.from_snapshot(ema) for span, ema in state['emas'].items()}
+        indicators.rsi = StreamingRSI.from_snapshot(state['rsi'])
+        indicators.macd = StreamingMACD.from_snapshot(state['macd'])
+        indicators.rolling = {int(window): RollingStats.from_snapshot(stats) for window, stats in state['rolling'].items()}
+        indicators.last, indicators.count = state['last'], state['count']
+        return indicators
+
+
+class LiveIndicators:
+    """
+    Per-symbol `IndicatorSet`s fed from a live price stream.
+
+    Prices are sampled into `interval`-second bars: the closing price of each completed bar
+    is folded into the symbol's indicators, so values line up with candle-based charts
+    rather than depending on tick frequency. State is written to `state_path` at most every
+    `save_interval` seconds and reloaded on construction, so a restart resumes from the
+    last saved bar.
+    """
+    def __init__(self, interval: float = 60, state_path: Optional[str] = None, save_interval: float = 60,
+                 **indicator_options):
+        self.interval = interval
+        self.state_path = state_path
+        self.save_interval = save_interval
+        self.indicator_options = indicator_options
+        self._sets: Dict[str, IndicatorSet] = {}
+        self._pending: Dict[str, List[float]] = {}  # symbol -> [bucket, close]
+        self._lock = threading.Lock()
+        self._last_save = time.monotonic()
+        if state_path:
+            self.load()
+
+    def update(self, symbol: str, price: float, timestamp: Optional[float] = None) -> None:
+        """Record a price seen at `timestamp` (epoch seconds, default now)."""
+        bucket = int((time.time() if timestamp is None else timestamp) // self.interval)
+        with self._lock:
+            pending = self._pending.get(symbol)
+            if pending is not None and bucket > pending[0]:
+                indicators = self._sets.get(symbol)
+                if indicators is None:
+                    indicators = self._sets[symbol] = IndicatorSet(**self.indicator_options)
+                indicators.update(pending[1])
+            if pending is None or bucket >= pending[0]:
+                self._pending[symbol] = [bucket, price]
+        if self.state_path and time.monotonic() - self._last_save >= self.save_interval:
+            self.save()
+
+    def get(self, symbol: str) -> Optional[Dict[str, float]]:
+        """Indicator values over completed bars, plus the current (forming) bar's price."""
+        with self._lock:
+            indicators = self._sets.get(symbol)
+            pending = self._pending.get(symbol)
+            if indicators is None:
+                return None
+            values = indicators.values()
+        if pending is not None:
+            values['price'] = pending[1]
+        return values
+
+    def symbols(self) -> List[str]:
+        with self._lock:
+            return sorted(self._sets)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'interval': self.interval,
+                'symbols': {symbol: indicators.snapshot() for symbol, indicators in self._sets.items()},
+                'pending': {symbol: list(pending) for symbol, pending in self._pending.items()},
+            }
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        if state.get('interval') != self.interval:
+            logging.warning(f"Ignoring saved indicator state for {state.get('interval')}s bars (now {self.interval}s)")
+            return
+        with self._lock:
+            self._sets = {symbol: IndicatorSet.from_snapshot(s) for symbol, s in state['symbols'].items()}
+            self._pending = {symbol: list(pending) for symbol, pending in state['pending'].items()}
+
+    def save(self) -> None:
+        state = self.snapshot()
+        self._last_save = time.monotonic()
+        try:
+            os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+            with open(f"{self.state_path}.tmp", 'w') as f:
+                json.dump(state, f)
+            os.replace(f"{self.state_path}.tmp", self.state_path)
+        except OSError as e:
+            logging.error(f"Failed to save indicator state to {self.state_path}: {e}")
+
+    def load(self) -> None:
+        try:
+            with open(self.state_path) as f:
+                self.restore(json.load(f))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError) as e:
+            logging.error(f"Failed to load indicator state from {self.state_path}: {e}")
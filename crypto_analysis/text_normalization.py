@@ -0,0 +1,120 @@
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence
+
+import pandas as pd
+
+# Lower-cased words with an optional cashtag prefix, shared by the Reddit index and topic tracker
+WORD_PATTERN = re.compile(r"\$?[a-z][a-z0-9]+")
+
+
+@lru_cache(maxsize=1)
+def english_stopwords() -> FrozenSet[str]:
+    """NLTK English stopwords, loaded once per process."""
+    from nltk.corpus import stopwords
+    return frozenset(stopwords.words('english'))
+
+
+@lru_cache(maxsize=1)
+def _lemmatizer():
+    from nltk.stem import WordNetLemmatizer
+    return WordNetLemmatizer()
+
+
+@lru_cache(maxsize=200000)
+def cached_lemma(token: str) -> str:
+    """WordNet noun lemma of `token`, memoised since social text repeats a small vocabulary."""
+    return _lemmatizer().lemmatize(token)
+
+
+def iter_chunks(items: Sequence, size: int) -> Iterator[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class TextNormalizer:
+    """
+    Stopword removal and lemmatisation for social posts.
+
+    Every distinct raw token is resolved once into a lookup table (kept token or dropped),
+    so normalising a post is a split plus one dict lookup per token. The defaults match
+    `clean_reddit_text`: case-sensitive stopwords, alphabetic tokens only, WordNet lemmas.
+    Large inputs are processed in chunks, optionally across `processes` worker processes.
+    """
+    def __init__(self, stopwords: Optional[Iterable[str]] = None, lemmatize: bool = True,
+                 lowercase: bool = False, cache_size: int = 500000):
+        self._stopwords = frozenset(stopwords) if stopwords is not None else None
+        self.lemmatize = lemmatize
+        self.lowercase = lowercase
+        self.cache_size = cache_size
+        self._table: Dict[str, str] = {}
+
+    def __getstate__(self):
+        # Workers rebuild their own token table rather than receiving a pickled copy
+        state = self.__dict__.copy()
+        state['_table'] = {}
+        return state
+
+    @property
+    def stopwords(self) -> FrozenSet[str]:
+        if self._stopwords is None:
+            self._stopwords = english_stopwords()
+        return self._stopwords
+
+    def _resolve(self, token: str) -> str:
+        if self.lowercase:
+            token = token.lower()
+        if token in self.stopwords or not token.isalpha():
+            return ''
+        return cached_lemma(token) if self.lemmatize else token
+
+    def tokens(self, text: str) -> List[str]:
+        table = self._table
+        if len(table) > self.cache_size:
+            table.clear()
+        result = []
+        for token in (text or '').split():
+            resolved = table.get(token)
+            if resolved is None:
+                resolved = table[token] = self._resolve(token)
+            if resolved:
+                result.append(resolved)
+        return result
+
+    def normalize(self, text: str) -> str:
+        return ' '.join(self.tokens(text))
+
+    def _normalize_chunk(self, texts: Sequence[str]) -> List[str]:
+        normalize = self.normalize
+        return [normalize(text) for text in texts]
+
+    def normalize_many(self, texts: Sequence[str], chunk_size: int = 50000,
+                       processes: Optional[int] = None) -> List[str]:
+        """Normalise `texts` chunk by chunk; `processes > 1` spreads the chunks over a process pool."""
+        if not processes or processes <= 1 or len(texts) <= chunk_size:
+            results = []
+            for chunk in iter_chunks(texts, chunk_size):
+                results.extend(self._normalize_chunk(chunk))
+            return results
+        with ProcessPoolExecutor(max_workers=min(processes, os.cpu_count() or 1),
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            return [text for chunk in executor.map(self._normalize_chunk, iter_chunks(texts, chunk_size)) for text in chunk]
+
+    def normalize_series(self, series: pd.Series, chunk_size: int = 50000,
+                         processes: Optional[int] = None) -> pd.Series:
+        """`normalize_many` over a text column, preserving its index; missing values become ''."""
+        texts = series.fillna('').astype(str).tolist()
+        return pd.Series(self.normalize_many(texts, chunk_size, processes), index=series.index, name=series.name)
+
+
+_default_normalizer: Optional[TextNormalizer] = None
+
+
+def default_normalizer() -> TextNormalizer:
+    global _default_normalizer
+    if _default_normalizer is None:
+        _default_normalizer = TextNormalizer()
+    return _default_normalizer
@@ -1,7 +1,10 @@
 import os
+import asyncio
+import aiohttp
 import requests
 import json
 from langchain.agents import tool  # Use the @tool decorator for Langchain compatibility
+from http_client import async_http
 
 class APIError(Exception):
     """Custom API Error to handle exceptions from CryptoCompare requests."""
@@ -150,3 +153,92 @@ def get_top_volume_symbols(currency: str = 'USD', limit: int = 10, page: int = 0
         raise APIError(response.status_code, str(e))
 
 
+async def _afetch_json(url: str):
+    """Asynchronously fetch a CryptoCompare endpoint, raising APIError on failure."""
+    api_key = os.getenv('CRYPTOCOMPARE_API_KEY')
+    headers = {'authorization': f'Apikey {api_key}'} if api_key else {}
+    try:
+        return await async_http.get_json(url, headers=headers)
+    except aiohttp.ClientResponseError as e:
+        raise APIError(e.status, str(e))
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        raise APIError(500, str(e))
+
+@tool
+async def aget_current_price(symbol: str, currencies: str = 'USD') -> str:
+    """Fetches the current price of a specified cryptocurrency in one or more currencies (async)."""
+    url = f"https://min-api.cryptocompare.com/data/price?fsym={symbol}&tsyms={currencies}"
+    data = await _afetch_json(url)
+    return f"Current prices for {symbol}: {data}"
+
+@tool
+async def aget_latest_social_stats(coin_symbol: str) -> str:
+    """Retrieves the latest social statistics for a given cryptocurrency symbol (async)."""
+    url = f"https://min-api.cryptocompare.com/data/social/coin/latest?fsym={coin_symbol}"
+    data = await _afetch_json(url)
+    coin_url = f"https://www.cryptocompare.com/coins/{coin_symbol}/overview"
+    return f"Latest social stats for {coin_symbol}: {data}. More details at: {coin_url}"
+
+@tool
+async def aget_historical_social_stats(coin_symbol: str, days: int = 30) -> str:
+    """Fetches historical social data for a given cryptocurrency over a specified number of days (async)."""
+    url = f"https://min-api.cryptocompare.com/data/social/coin/histo/day?fsym={coin_symbol}&limit={days}"
+    data = await _afetch_json(url)
+    coin_url = f"https://www.cryptocompare.com/coins/{coin_symbol}/overview"
+    return f"Historical social stats for {coin_symbol} over the last {days} days: {data}. More details at: {coin_url}"
+
+@tool
+async def alist_news_feeds_and_categories() -> str:
+    """Lists all news feeds and categories available from CryptoCompare (async)."""
+    url = "https://min-api.cryptocompare.com/data/news/feedsandcategories"
+    data = await _afetch_json(url)
+    return f"News feeds and categories: {data}. More details at: <a href='{url}'>CryptoCompare News</a>"
+
+@tool
+async def aget_latest_trading_signals(coin_symbol: str) -> str:
+    """Fetches the latest trading signals for a specified cryptocurrency symbol (async)."""
+    url = f"https://min-api.cryptocompare.com/data/tradingsignals/intotheblock/latest?fsym={coin_symbol}"
+    data = await _afetch_json(url)
+    coin_url = f"https://www.cryptocompare.com/coins/{coin_symbol}/overview"
+    return f"Latest trading signals for {coin_symbol}: {data}. More details at: {coin_url}"
+
+@tool
+async def aget_top_exchanges_by_volume(fsym: str, tsym: str, limit: int = 10) -> str:
+    """Fetches top exchanges by volume for a specific trading pair (async)."""
+    url = f"https://min-api.cryptocompare.com/data/top/exchanges?fsym={fsym}&tsym={tsym}&limit={limit}"
+    data = await _afetch_json(url)
+    return f"Top exchanges by volume for {fsym}/{tsym}: {data}"
+
+async def afetch_top_volume(currency: str = 'USD', limit: int = 10, page: int = 0) -> dict:
+    """
+    Top symbols by 24-hour volume in `currency` as an ordered {symbol: volume} dict.
+    Limits above 100 are fetched as several concurrent pages. Raises KeyError on a malformed response.
+    """
+    per_page = min(limit, 100)
+    first_page = page * limit // per_page
+    last_page = (page * limit + limit - 1) // per_page
+    urls = [f"https://min-api.cryptocompare.com/data/top/totalvolfull?tsym={currency}&limit={per_page}&page={p}"
+            for p in range(first_page, last_page + 1)]
+    items = []
+    for data in await asyncio.gather(*(_afetch_json(url) for url in urls)):
+        items.extend(data['Data'])
+    offset = page * limit - first_page * per_page
+    return {item['CoinInfo']['Name']: item['RAW'][currency]['VOLUME24HOURTO']
+            for item in items[offset:offset + limit] if 'RAW' in item and currency in item['RAW']}
+
+@tool
+async def aget_top_volume_symbols(currency: str = 'USD', limit: int = 10, page: int = 0) -> str:
+    """
+    Fetches the top cryptocurrencies by 24-hour trading volume in a specific currency (async).
+    Args:
+        currency (str): The currency symbol to consider for volume (e.g., 'USD').
+        limit (int): Number of top symbols to retrieve.
+        page (int): The pagination for the request.
+    Returns:
+        str: List of top cryptocurrencies by volume.
+    """
+    try:
+        symbols = await afetch_top_volume(currency, limit, page)
+    except KeyError:
+        return "Error: Missing expected data in the response: 'Data'"
+    return f"Top {limit} symbols by 24-hour volume in {currency}: {symbols}"
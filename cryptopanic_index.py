@@ -0,0 +1,228 @@
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from http_client import async_http
+
+CRYPTOPANIC_POSTS_URL = 'https://cryptopanic.com/api/v1/posts/'
+
+
+class CryptoPanicError(Exception):
+    """Raised when the CryptoPanic posts feed returns a non-200 response."""
+    def __init__(self, status):
+        self.status = status
+        super().__init__(f"CryptoPanic returned HTTP {status}")
+
+
+def _fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query that ANDs the quoted words (prefix match on the last)."""
+    words = re.findall(r'\w+', text)
+    if not words:
+        return ''
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+class NewsIndex:
+    """
+    CryptoPanic posts stored in SQLite with an FTS5 index over titles.
+
+    Posts are deduplicated by id and URL. Currencies live in a side table so currency,
+    source and time filters are indexed lookups that combine with full-text search.
+    """
+    def __init__(self, db_path: str = os.path.join('data', 'cryptopanic.db')):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._init_tables()
+
+    def _init_tables(self):
+        with self._lock:
+            self._conn.executescript('''
+                CREATE TABLE IF NOT EXISTS news_posts (
+                    id INTEGER PRIMARY KEY,
+                    url TEXT UNIQUE,
+                    title TEXT NOT NULL,
+                    domain TEXT,
+                    source TEXT,
+                    kind TEXT,
+                    published_at INTEGER,
+                    raw TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_news_published ON news_posts (published_at);
+                CREATE INDEX IF NOT EXISTS idx_news_domain ON news_posts (domain, published_at);
+                CREATE TABLE IF NOT EXISTS news_currencies (
+                    code TEXT NOT NULL,
+                    post_id INTEGER NOT NULL,
+                    PRIMARY KEY (code, post_id)
+                );
+                CREATE VIRTUAL TABLE IF NOT EXISTS news_fts USING fts5(
+                    title, content='news_posts', content_rowid='id'
+                );
+                CREATE TRIGGER IF NOT EXISTS news_posts_ai AFTER INSERT ON news_posts BEGIN
+                    INSERT INTO news_fts (rowid, title) VALUES (new.id, new.title);
+                END;
+            ''')
+            self._conn.commit()
+
+    def upsert(self, posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert posts not seen before (by id or URL); returns the new ones."""
+        inserted = []
+        with self._lock:
+            for post in posts:
+                published = post.get('published_at')
+                published_ts = int(datetime.fromisoformat(published.replace('Z', '+00:00')).timestamp()) if published else None
+                cursor = self._conn.execute('''
+                    INSERT OR IGNORE INTO news_posts (id, url, title, domain, source, kind, published_at, raw)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    post['id'], post.get('url'), post.get('title') or '', post.get('domain'),
+                    (post.get('source') or {}).get('title'), post.get('kind'), published_ts, json.dumps(post),
+                ))
+                if not cursor.rowcount:
+                    continue
+                self._conn.executemany(
+                    'INSERT OR IGNORE INTO news_currencies (code, post_id) VALUES (?, ?)',
+                    [(currency['code'].upper(), post['id']) for currency in post.get('currencies') or []]
+                )
+                inserted.append(post)
+            self._conn.commit()
+        return inserted
+
+    def known_ids(self, ids: List[int]) -> set:
+        if not ids:
+            return set()
+        placeholders = ','.join('?' * len(ids))
+        with self._lock:
+            rows = self._conn.execute(f'SELECT id FROM news_posts WHERE id IN ({placeholders})', ids).fetchall()
+        return {row[0] for row in rows}
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM news_posts').fetchone()[0]
+
+    def search(self, query: str = '', currency: Optional[str] = None, source: Optional[str] = None,
+               since: Optional[int] = None, until: Optional[int] = None, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Newest-first posts matching the full-text `query` and the optional filters.
+        `source` matches the domain or the source title; `since`/`until` are Unix timestamps.
+        """
+        joins, clauses, params = [], [], []
+        match = _fts_query(query or '')
+        if match:
+            joins.append('JOIN news_fts ON news_fts.rowid = p.id')
+            clauses.append('news_fts MATCH ?')
+            params.append(match)
+        if currency:
+            joins.append('JOIN news_currencies c ON c.post_id = p.id')
+            clauses.append('c.code = ?')
+            params.append(currency.upper())
+        if source:
+            clauses.append('(p.domain = ? OR p.source = ? COLLATE NOCASE)')
+            params.extend([source.lower(), source])
+        if since is not None:
+            clauses.append('p.published_at >= ?')
+            params.append(int(since))
+        if until is not None:
+            clauses.append('p.published_at <= ?')
+            params.append(int(until))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        sql = f"SELECT p.raw FROM news_posts p {' '.join(joins)} {where} ORDER BY p.published_at DESC, p.id DESC LIMIT ?"
+        with self._lock:
+            rows = self._conn.execute(sql, params + [int(limit)]).fetchall()
+        return [json.loads(raw) for (raw,) in rows]
+
+
+class CryptoPanicIngestor:
+    """
+    Incremental poller of the public CryptoPanic posts feed into a `NewsIndex`.
+
+    Each poll walks feed pages newest-first and stops at the first page that contains an
+    already-stored post (or after `max_pages`), so steady-state polling costs one request.
+    Tools call `refresh_if_stale()` so the store is current even without the thread.
+    """
+    def __init__(self, index: NewsIndex, api_key: Optional[str], interval: float = 300,
+                 max_age: float = 120, max_pages: int = 5):
+        self.index = index
+        self.api_key = api_key
+        self.interval = interval
+        self.max_age = max_age
+        self.max_pages = max_pages
+        self.last_poll: Optional[float] = None
+        self._stopping = threading.Event()
+        self._thread = None
+        self._poll_lock = threading.Lock()
+
+    def _params(self) -> dict:
+        return {'auth_token': self.api_key, 'public': 'true'}
+
+    def _ingest_page(self, data: dict) -> bool:
+        """Store one page; returns True if paging should continue."""
+        posts = data.get('results') or []
+        known = self.index.known_ids([post['id'] for post in posts])
+        self.index.upsert(posts)
+        return bool(posts) and not known and bool(data.get('next'))
+
+    def poll_once(self) -> None:
+        with self._poll_lock:
+            url, params = CRYPTOPANIC_POSTS_URL, self._params()
+            for _ in range(self.max_pages):
+                response = requests.get(url, params=params, timeout=10)
+                if response.status_code != 200:
+                    raise CryptoPanicError(response.status_code)
+                data = response.json()
+                if not self._ingest_page(data):
+                    break
+                url, params = data['next'], None
+            self.last_poll = time.monotonic()
+
+    async def apoll_once(self) -> None:
+        url, params = CRYPTOPANIC_POSTS_URL, self._params()
+        for _ in range(self.max_pages):
+            data = await async_http.get_json(url, params=params)
+            if not self._ingest_page(data):
+                break
+            url, params = data['next'], None
+        self.last_poll = time.monotonic()
+
+    def is_stale(self) -> bool:
+        return self.last_poll is None or time.monotonic() - self.last_poll > self.max_age
+
+    def refresh_if_stale(self) -> None:
+        if self.is_stale():
+            self.poll_once()
+
+    async def arefresh_if_stale(self) -> None:
+        if self.is_stale():
+            await self.apoll_once()
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name='CryptoPanicIngestor', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:
+                logging.error(f"CryptoPanic poll failed: {e}")
+            self._stopping.wait(self.interval)
@@ -1,74 +1,144 @@
 import os
-import requests
+import time
+import aiohttp
+from typing import Optional
 from dotenv import load_dotenv
 from langchain.agents import tool
+from cryptopanic_index import NewsIndex, CryptoPanicIngestor, CryptoPanicError
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Posts are retained locally and served from SQLite FTS5; the feed is polled incrementally
+news_index = NewsIndex(os.getenv('CRYPTOPANIC_DB', os.path.join('data', 'cryptopanic.db')))
+news_ingestor = CryptoPanicIngestor(news_index, os.getenv('CRYPTOPANIC_API_KEY'),
+                                    interval=int(os.getenv('CRYPTOPANIC_POLL_INTERVAL', '300')))
+
+MISSING_KEY_MESSAGE = "API key for CryptoPanic not found. Please set it in the environment variables."
+
+def _refresh_error(failure: str, error: str) -> Optional[str]:
+    """Refresh the store if stale; returns an error message only if nothing is stored to fall back on."""
+    try:
+        news_ingestor.refresh_if_stale()
+    except CryptoPanicError as e:
+        if not news_index.count():
+            return f"{failure}: {e.status}"
+    except Exception as e:
+        if not news_index.count():
+            return f"{error}: {str(e)}"
+    return None
+
+async def _arefresh_error(failure: str, error: str) -> Optional[str]:
+    try:
+        await news_ingestor.arefresh_if_stale()
+    except aiohttp.ClientResponseError as e:
+        if not news_index.count():
+            return f"{failure}: {e.status}"
+    except Exception as e:
+        if not news_index.count():
+            return f"{error}: {str(e)}"
+    return None
+
+def _format_latest_news(limit=20) -> str:
+    news_titles = [f"{item['title']} - <a href='{item['url']}'>{item['url']}</a>" for item in news_index.search(limit=limit)]
+    return '<br>'.join(news_titles)
+
+def _format_news_sources(limit=20) -> str:
+    sources = dict.fromkeys(item['domain'] for item in news_index.search(limit=limit))
+    formatted_sources = [f"{i+1}. {source}" for i, source in enumerate(sources)]
+    return '<br>'.join(formatted_sources)
+
+def _format_last_news_title() -> str:
+    latest = news_index.search(limit=1)
+    if latest:
+        item = latest[0]
+        return f"{item['title']} - <a href='{item['url']}'>{item['url']}</a>"
+    return "No news available"
+
 @tool
 def get_latest_news() -> str:
     """
     Fetches the latest news from CryptoPanic.
     """
-    api_key = os.getenv('CRYPTOPANIC_API_KEY')
-    if not api_key:
-        return "API key for CryptoPanic not found. Please set it in the environment variables."
-
-    url = f'https://cryptopanic.com/api/v1/posts/?auth_token={api_key}&public=true'
-    try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            news = response.json()
-            news_titles = [f"{item['title']} - <a href='{item['url']}'>{item['url']}</a>" for item in news['results']]
-            return '<br>'.join(news_titles)
-        else:
-            return f"Failed to fetch news: {response.status_code}"
-    except Exception as e:
-        return f"Error occurred while fetching news: {str(e)}"
+    if not os.getenv('CRYPTOPANIC_API_KEY'):
+        return MISSING_KEY_MESSAGE
+    error = _refresh_error("Failed to fetch news", "Error occurred while fetching news")
+    return error or _format_latest_news()
 
 @tool
 def get_news_sources() -> str:
     """
     Fetches the sources of the latest news from CryptoPanic.
     """
-    api_key = os.getenv('CRYPTOPANIC_API_KEY')
-    if not api_key:
-        return "API key for CryptoPanic not found. Please set it in the environment variables."
-
-    url = f'https://cryptopanic.com/api/v1/posts/?auth_token={api_key}&public=true'
-    try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            news = response.json()
-            sources = set(item['domain'] for item in news['results'])
-            formatted_sources = [f"{i+1}. {source}" for i, source in enumerate(sources)]
-            return '<br>'.join(formatted_sources)
-        else:
-            return f"Failed to fetch news sources: {response.status_code}"
-    except Exception as e:
-        return f"Error occurred while fetching news sources: {str(e)}"
+    if not os.getenv('CRYPTOPANIC_API_KEY'):
+        return MISSING_KEY_MESSAGE
+    error = _refresh_error("Failed to fetch news sources", "Error occurred while fetching news sources")
+    return error or _format_news_sources()
 
 @tool
 def get_last_news_title() -> str:
     """
     Fetches the title of the most recent news from CryptoPanic.
     """
-    api_key = os.getenv('CRYPTOPANIC_API_KEY')
-    if not api_key:
-        return "API key for CryptoPanic not found. Please set it in the environment variables."
+    if not os.getenv('CRYPTOPANIC_API_KEY'):
+        return MISSING_KEY_MESSAGE
+    error = _refresh_error("Failed to fetch the latest news title", "Error occurred while fetching the latest news title")
+    return error or _format_last_news_title()
 
-    url = f'https://cryptopanic.com/api/v1/posts/?auth_token={api_key}&public=true'
-    try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            news = response.json()
-            if news['results']:
-                item = news['results'][0]
-                return f"{item['title']} - <a href='{item['url']}'>{item['url']}</a>"
-            else:
-                return "No news available"
-        else:
-            return f"Failed to fetch the latest news title: {response.status_code}"
-    except Exception as e:
-        return f"Error occurred while fetching the latest news title: {str(e)}"
+@tool
+def search_news(query: str = '', currency: str = None, source: str = None, hours: float = None,
+                hours_ago: float = 0, limit: int = 10) -> str:
+    """
+    Searches stored CryptoPanic news by keywords with optional currency, source and time filters.
+    Args:
+    - query (str): Keywords to match in headlines (e.g., 'ETF approval'). Empty matches everything.
+    - currency (str): Only news tagged with this currency code (e.g., 'BTC').
+    - source (str): Only news from this domain or source (e.g., 'coindesk.com').
+    - hours (float): Only news published within this many hours (before `hours_ago`).
+    - hours_ago (float): Shift the window back, e.g. hours=24, hours_ago=24 for "yesterday".
+    - limit (int): Maximum number of headlines returned.
+    """
+    if os.getenv('CRYPTOPANIC_API_KEY'):
+        error = _refresh_error("Failed to fetch news", "Error occurred while fetching news")
+        if error:
+            return error
+    until = int(time.time() - float(hours_ago) * 3600) if hours_ago else None
+    since = int(time.time() - (float(hours) + float(hours_ago or 0)) * 3600) if hours else None
+    results = news_index.search(query, currency=currency, source=source, since=since, until=until, limit=int(limit))
+    if not results:
+        return "No matching news found."
+    return '<br>'.join(
+        f"{(item.get('published_at') or '')[:16].replace('T', ' ')} {item['title']} ({item.get('domain')}) - "
+        f"<a href='{item['url']}'>{item['url']}</a>"
+        for item in results
+    )
+
+@tool
+async def aget_latest_news() -> str:
+    """
+    Fetches the latest news from CryptoPanic (async).
+    """
+    if not os.getenv('CRYPTOPANIC_API_KEY'):
+        return MISSING_KEY_MESSAGE
+    error = await _arefresh_error("Failed to fetch news", "Error occurred while fetching news")
+    return error or _format_latest_news()
+
+@tool
+async def aget_news_sources() -> str:
+    """
+    Fetches the sources of the latest news from CryptoPanic (async).
+    """
+    if not os.getenv('CRYPTOPANIC_API_KEY'):
+        return MISSING_KEY_MESSAGE
+    error = await _arefresh_error("Failed to fetch news sources", "Error occurred while fetching news sources")
+    return error or _format_news_sources()
+
+@tool
+async def aget_last_news_title() -> str:
+    """
+    Fetches the title of the most recent news from CryptoPanic (async).
+    """
+    if not os.getenv('CRYPTOPANIC_API_KEY'):
+        return MISSING_KEY_MESSAGE
+    error = await _arefresh_error("Failed to fetch the latest news title", "Error occurred while fetching the latest news title")
+    return error or _format_last_news_title()
@@ -3,7 +3,8 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from typing import Any, Dict, List, Tuple
-from .utilities import fetch_cryptocurrency_data, fetch_historical_data, calculate_rsi, arima_forecast, calculate_correlation
+from crypto_analysis.indicators import sma
+from .utilities import fetch_cryptocurrency_data, fetch_historical_data, calculate_rsi, arima_forecast, calculate_correlation, fetch_ohlcv
 
 
 def register_callbacks(dash_app):
@@ -91,7 +92,20 @@ def register_callbacks(dash_app):
                     value='candlestick',
                     clearable=False
                 ),
-                dcc.Graph(id='dynamic-chart')
+                dcc.Dropdown(
+                    id='dynamic-crypto',
+                    options=[{'label': crypto.capitalize(), 'value': crypto} for crypto in ['bitcoin', 'ethereum', 'litecoin', 'binancecoin', 'dogecoin']],
+                    value='bitcoin',
+                    clearable=False
+                ),
+                dcc.Dropdown(
+                    id='dynamic-interval',
+                    options=[{'label': interval, 'value': interval} for interval in ['1m', '5m', '15m', '1h', '4h', '1d', '1w']],
+                    value='1h',
+                    clearable=False
+                ),
+                dcc.Graph(id='dynamic-chart'),
+                dcc.Interval(id='refresh-dynamic-interval', interval=30 * 1000, n_intervals=0)
             ])
 
     # Update market overview charts
@@ -142,9 +156,9 @@ def register_callbacks(dash_app):
             template="plotly_dark",
         )
 
-        correlation_matrix = calculate_correlation(selected_cryptos)
+        correlation_matrix = calculate_correlation(selected_cryptos, historical_data=data)
         corr_fig = px.imshow(
-            correlation_matrix,
+            correlation_matrix.round(2),
             text_auto=True,
             title="Cryptocurrency Correlation Matrix",
             color_continuous_scale="RdBu",
@@ -166,8 +180,8 @@ def register_callbacks(dash_app):
         if data.empty:
             return go.Figure()  # Return an empty figure if no data available
 
-        data["SMA_20"] = data["Price"].rolling(window=20).mean()
-        data["SMA_50"] = data["Price"].rolling(window=50).mean()
+        data["SMA_20"] = sma(data["Price"], 20)
+        data["SMA_50"] = sma(data["Price"], 50)
         data["RSI"] = calculate_rsi(data["Price"], period=14)
 
         fig = go.Figure()
@@ -227,11 +241,11 @@ def register_callbacks(dash_app):
         fig.add_trace(go.Scatter(x=data['Date'], y=data['Price'], mode='lines', name='Bitcoin Price'))
 
         if 'SMA_20' in indicators:
-            data['SMA_20'] = data['Price'].rolling(window=20).mean()
+            data['SMA_20'] = sma(data['Price'], 20)
             fig.add_trace(go.Scatter(x=data['Date'], y=data['SMA_20'], mode='lines', name='SMA 20'))
 
         if 'SMA_50' in indicators:
-            data['SMA_50'] = data['Price'].rolling(window=50).mean()
+            data['SMA_50'] = sma(data['Price'], 50)
             fig.add_trace(go.Scatter(x=data['Date'], y=data['SMA_50'], mode='lines', name='SMA 50'))
 
         if 'RSI' in indicators:
@@ -250,22 +264,28 @@ def register_callbacks(dash_app):
     # Dynamic chart visualization based on selected type
     @dash_app.callback(
         Output('dynamic-chart', 'figure'),
-        Input('dynamic-chart-type', 'value')
+        Input('dynamic-chart-type', 'value'),
+        Input('dynamic-crypto', 'value'),
+        Input('dynamic-interval', 'value'),
+        Input('refresh-dynamic-interval', 'n_intervals')
     )
-    def update_dynamic_chart(chart_type):
-        data = fetch_cryptocurrency_data()
+    def update_dynamic_chart(chart_type, crypto, interval, n_intervals):
         if chart_type == 'candlestick':
+            bars = fetch_ohlcv(crypto, interval)
             fig = go.Figure(
                 data=[go.Candlestick(
-                    x=['BTC', 'ETH', 'LTC', 'BNB', 'DOGE'],
-                    open=[12, 15, 20, 18, 22],
-                    high=[15, 18, 25, 22, 28],
-                    low=[10, 12, 18, 16, 20],
-                    close=[13, 17, 23, 20, 25]
+                    x=bars['Date'],
+                    open=bars['Open'],
+                    high=bars['High'],
+                    low=bars['Low'],
+                    close=bars['Close'],
+                    name=crypto.capitalize()
                 )]
             )
-            fig.update_layout(title='Candlestick Chart', template='plotly_dark')
+            fig.update_layout(title=f'{crypto.capitalize()} {interval} Candlestick Chart', template='plotly_dark',
+                              xaxis_rangeslider_visible=False)
         else:
+            data = fetch_cryptocurrency_data()
             fig = px.bar(data, x='Symbol', y='Price (USD)', title=f'{chart_type.title()} Chart', text='Price (USD)')
             fig.update_layout(template='plotly_dark')
 
@@ -1,8 +1,21 @@
 import time
+import threading
 import requests
 import pandas as pd
 import logging
 from statsmodels.tsa.arima.model import ARIMA
+from crypto_analysis import indicators
+from crypto_analysis.correlation_analysis import correlation_matrix
+from crypto_analysis.resampling import OHLCVResampler, interval_ms
+from price_store import price_store
+
+# Binance pairs whose live ticks, when streamed into the local price store, extend the charts
+BINANCE_PAIRS = {'bitcoin': 'BTCUSDT', 'ethereum': 'ETHUSDT', 'litecoin': 'LTCUSDT',
+                 'binancecoin': 'BNBUSDT', 'dogecoin': 'DOGEUSDT'}
+OHLCV_REFRESH_MS = 5 * 60 * 1000  # CoinGecko's finest price granularity
+# (crypto, interval) -> (resampler, its lock); Dash callbacks run concurrently and share them
+_ohlcv_resamplers = {}
+_ohlcv_lock = threading.Lock()  # guards the dict itself only
 
 def fetch_cryptocurrency_data(retries=3, delay=5):
     """Fetch live cryptocurrency data from CoinGecko with retries and delay on rate limit errors."""
@@ -47,7 +60,7 @@ def fetch_historical_data(symbols, days=30):
     for symbol in symbols:
         try:
             url = f"https://api.coingecko.com/api/v3/coins/{symbol}/market_chart?vs_currency=usd&days={days}"
-            response = requests.get(url)
+            response = requests.get(url, timeout=10)
             response.raise_for_status()  # This will raise an exception for non-200 responses
             data = response.json()
             if 'prices' in data:
@@ -60,17 +73,53 @@ def fetch_historical_data(symbols, days=30):
             historical_data[symbol] = pd.DataFrame(columns=['Timestamp', 'Price', 'Date'])
     return historical_data
 
+def _history_days(interval):
+    """Days of CoinGecko history to seed `interval` bars with: 5-minute, hourly or daily prices."""
+    width, _ = interval_ms(interval)
+    if width < 3600 * 1000:
+        return 1
+    return 30 if width < 86400 * 1000 else 365
+
+def _append_prices(resampler, prices):
+    if prices is None or prices.empty:
+        return
+    timestamps = prices['Timestamp'].to_numpy(dtype='int64')
+    keep = timestamps > resampler.last_timestamp if resampler.last_timestamp is not None else slice(None)
+    resampler.append(timestamps[keep], prices['Price'].to_numpy(dtype=float)[keep])
+
+def fetch_ohlcv(crypto, interval='1h', limit=200):
+    """
+    OHLCV bars for a cryptocurrency at `interval` ('1m'..'1w'), resampled from its price series.
+    CoinGecko history seeds the bars once. Later calls only append newer prices, from the local
+    tick store when the coin's Binance pair is streamed and otherwise from CoinGecko, so finished
+    bars are reused and only the open bar is recomputed. CoinGecko is queried outside the
+    per-chart lock, so a slow request holds up no other chart.
+    """
+    with _ohlcv_lock:
+        entry = _ohlcv_resamplers.get((crypto, interval))
+        if entry is None:
+            entry = _ohlcv_resamplers[(crypto, interval)] = (OHLCVResampler(interval), threading.Lock())
+    resampler, lock = entry
+    with lock:
+        seeded = resampler.last_timestamp is not None
+    history = None if seeded else fetch_historical_data([crypto], _history_days(interval)).get(crypto)
+    pair = BINANCE_PAIRS.get(crypto)
+    with lock:
+        _append_prices(resampler, history)
+        timestamps, prices, volumes = price_store.ticks(pair, since=resampler.last_timestamp) if pair else ((),) * 3
+        if len(timestamps):
+            resampler.append(timestamps, prices, volumes)
+        if len(timestamps) or (resampler.last_timestamp is not None
+                               and time.time() * 1000 - resampler.last_timestamp <= OHLCV_REFRESH_MS):
+            return resampler.frame(limit=limit)
+    recent = fetch_historical_data([crypto], 1).get(crypto)
+    with lock:
+        _append_prices(resampler, recent)
+        return resampler.frame(limit=limit)
 
 def calculate_rsi(prices, period=14):
-    """Calculate the Relative Strength Index (RSI)."""
-    delta = prices.diff()
-    gain = (delta.where(delta > 0, 0)).fillna(0)
-    loss = (-delta.where(delta < 0, 0)).fillna(0)
-    avg_gain = gain.rolling(window=period).mean()
-    avg_loss = loss.rolling(window=period).mean()
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
+    """Calculate Wilder's Relative Strength Index (RSI) for a price Series."""
+    return pd.Series(indicators.rsi(prices.to_numpy(dtype=float), period), index=prices.index)
 
 def arima_forecast(prices, steps=30):
     """Predict future prices using ARIMA model."""
@@ -79,8 +128,18 @@ def arima_forecast(prices, steps=30):
     forecast = model_fit.forecast(steps=steps)
     return forecast
 
-def calculate_correlation(cryptos, days=30):
-    """Fetch historical data and calculate the correlation between selected cryptocurrencies."""
-    historical_data = fetch_historical_data(cryptos, days)
-    prices_df = pd.DataFrame({symbol: df['Price'] for symbol, df in historical_data.items()})
-    return prices_df.corr()
\ No newline at end of file
+def calculate_correlation(cryptos, days=30, historical_data=None, shrinkage=0.0):
+    """
+    Correlation of log returns between selected cryptocurrencies, on prices aligned to the hour.
+    Pass `historical_data` from `fetch_historical_data` to reuse prices already fetched.
+    """
+    if historical_data is None:
+        historical_data = fetch_historical_data(cryptos, days)
+    prices = {}
+    for symbol in cryptos:
+        df = historical_data.get(symbol)
+        if df is None or df.empty:
+            continue
+        hours = pd.to_datetime(df['Timestamp'], unit='ms').dt.floor('h')
+        prices[symbol] = pd.Series(df['Price'].to_numpy(dtype=float), index=hours).groupby(level=0).last()
+    return correlation_matrix(pd.DataFrame(prices), shrinkage=shrinkage)
@@ -0,0 +1,322 @@
+import hashlib
+import logging
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from werkzeug.utils import secure_filename
+
+from embedding_cache import make_embeddings
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+SUPPORTED_EXTENSIONS = ('.pdf', '.txt', '.md', '.csv', '.docx')
+DOC_ID_PATTERN = re.compile(r'[0-9a-f]{32}')
+
+
+def save_upload_stream(stream, folder: str, filename: str, chunk_size: int = UPLOAD_CHUNK_SIZE) -> Tuple[str, str, int]:
+    """
+    Copy an upload stream to `folder/filename` in `chunk_size` pieces, hashing as it goes.
+    The file is written under a temporary name and renamed when complete. Returns (path, sha256, size).
+    """
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, filename)
+    partial = f"{path}.{uuid.uuid4().hex}.part"
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(partial, 'wb') as f:
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                f.write(chunk)
+                size += len(chunk)
+        os.replace(partial, path)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    return path, digest.hexdigest(), size
+
+
+class UploadSpool:
+    """
+    Writable file handed to werkzeug's form parser for an upload (see `DocumentIndexer.spool`).
+
+    The request body's file part is written straight into the document folder and hashed on
+    the way, so keeping the upload is a rename rather than a second copy of werkzeug's own
+    spooled temporary file. Closing it without `commit` deletes the partial file.
+    """
+    def __init__(self, folder: str):
+        os.makedirs(folder, exist_ok=True)
+        self.partial = os.path.join(folder, f".{uuid.uuid4().hex}.part")
+        self._file = open(self.partial, 'w+b')
+        self._digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self._digest.update(data)
+        self.size += len(data)
+        return self._file.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+    def commit(self, path: str) -> Tuple[str, str, int]:
+        """Move the upload to `path`; returns (path, sha256, size) like `save_upload_stream`."""
+        self._file.close()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(self.partial, path)
+        return path, self._digest.hexdigest(), self.size
+
+    def close(self) -> None:
+        self._file.close()
+        if os.path.exists(self.partial):
+            os.remove(self.partial)
+
+
+def load_document(path: str) -> List[Document]:
+    """Parse a file into LangChain documents (one per PDF page / CSV row, else one per file)."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.pdf':
+        from langchain_community.document_loaders import PyPDFLoader
+        return PyPDFLoader(path).load()
+    if extension == '.docx':
+        from langchain_community.document_loaders import Docx2txtLoader
+        return Docx2txtLoader(path).load()
+    if extension == '.csv':
+        from langchain_community.document_loaders import CSVLoader
+        return CSVLoader(path).load()
+    if extension in ('.txt', '.md'):
+        with open(path, encoding='utf-8', errors='replace') as f:
+            return [Document(page_content=f.read(), metadata={'source': path})]
+    raise ValueError(f"Unsupported file type '{extension}'. Supported types: {', '.join(SUPPORTED_EXTENSIONS)}.")
+
+
+class DocumentIndexer:
+    """
+    Uploaded-document store with a background indexing queue and incremental re-indexing.
+
+    Uploads are streamed to disk and queued; a worker thread parses, chunks and embeds
+    them into a persistent Chroma collection, reporting progress through `on_progress`.
+    Each upload gets a new document id and its own directory, unless it names the `doc_id`
+    of a document it replaces. Chunk ids are derived from the chunk text, so re-uploading an
+    edited document deletes the chunks that disappeared and embeds only the new ones; an
+    unchanged file is skipped. Finished jobs are forgotten after `job_ttl` seconds.
+    `save_document(file)` and `query(question)` make it usable as Lenox's document handler.
+    """
+    def __init__(self, document_folder: str, data_folder: str = 'data', embeddings: Optional[Embeddings] = None,
+                 on_progress: Optional[Callable[[Dict[str, Any]], None]] = None, chunk_size: int = 1000,
+                 chunk_overlap: int = 100, embed_batch_size: int = 64, job_ttl: float = 3600):
+        self.document_folder = document_folder
+        self.data_folder = data_folder
+        self._embeddings = embeddings
+        self.on_progress = on_progress
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.embed_batch_size = embed_batch_size
+        self.job_ttl = job_ttl
+        os.makedirs(data_folder, exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(data_folder, 'documents.db'), check_same_thread=False)
+        self._lock = threading.Lock()
+        self._store = None
+        self._chain = None
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._init_tables()
+
+    def _init_tables(self):
+        with self._lock:
+            self._conn.executescript('''
+                CREATE TABLE IF NOT EXISTS indexed_documents (
+                    doc_id TEXT PRIMARY KEY,
+                    path TEXT NOT NULL,
+                    file_hash TEXT NOT NULL,
+                    chunks INTEGER NOT NULL,
+                    indexed_at REAL NOT NULL
+                );
+            ''')
+            self._conn.commit()
+
+    @property
+    def embeddings(self) -> Embeddings:
+        if self._embeddings is None:
+            self._embeddings = make_embeddings()
+        return self._embeddings
+
+    @property
+    def store(self):
+        if self._store is None:
+            from langchain_community.vectorstores import Chroma
+            self._store = Chroma(collection_name='documents', embedding_function=self.embeddings,
+                                 persist_directory=os.path.join(self.data_folder, 'chroma'))
+        return self._store
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name='DocumentIndexer', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5) -> None:
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+        self._thread = None
+
+    def job_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """The job as reported to clients (without its server-side path), or None if unknown."""
+        job = self.jobs.get(job_id)
+        return None if job is None else {key: value for key, value in job.items() if key != 'path'}
+
+    def _emit(self, job_id: str, **update) -> None:
+        if update.get('status') in ('done', 'error'):
+            update['finished_at'] = time.time()
+        self.jobs[job_id].update(update)
+        if self.on_progress is not None:
+            try:
+                self.on_progress(self.job_status(job_id))
+            except Exception as e:
+                logging.error(f"Indexing progress callback failed: {e}")
+
+    def spool(self) -> UploadSpool:
+        """Stream factory for werkzeug's form parser, so uploads land in the document folder directly."""
+        return UploadSpool(self.document_folder)
+
+    def save_upload(self, file, doc_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Store a werkzeug `FileStorage` under the document folder and queue it; returns the job.
+        Pass the `doc_id` of an indexed document to replace it, else a new document is created.
+        """
+        filename = secure_filename(file.filename or '')
+        if not filename or not filename.lower().endswith(SUPPORTED_EXTENSIONS):
+            raise ValueError(f"Unsupported file type. Supported types: {', '.join(SUPPORTED_EXTENSIONS)}.")
+        if doc_id is None:
+            doc_id = uuid.uuid4().hex
+        elif not DOC_ID_PATTERN.fullmatch(doc_id):
+            raise ValueError(f"Invalid document id '{doc_id}'.")
+        folder = os.path.join(self.document_folder, doc_id)
+        if isinstance(file.stream, UploadSpool):
+            path, file_hash, size = file.stream.commit(os.path.join(folder, filename))
+        else:
+            path, file_hash, size = save_upload_stream(file.stream, folder, filename)
+        return self.enqueue(path, file_hash, size, doc_id)
+
+    def _evict_jobs(self) -> None:
+        cutoff = time.time() - self.job_ttl
+        for job_id, job in list(self.jobs.items()):
+            if job.get('finished_at', cutoff) < cutoff:
+                self.jobs.pop(job_id, None)
+
+    def enqueue(self, path: str, file_hash: Optional[str] = None, size: Optional[int] = None,
+                doc_id: Optional[str] = None) -> Dict[str, Any]:
+        self._evict_jobs()
+        job_id = uuid.uuid4().hex
+        self.jobs[job_id] = {'job_id': job_id, 'doc_id': doc_id or os.path.basename(path),
+                             'document': os.path.basename(path), 'path': path,
+                             'file_hash': file_hash, 'size': size, 'status': 'queued', 'progress': 0.0}
+        self._emit(job_id)
+        self.start()
+        self._queue.put(job_id)
+        return self.job_status(job_id)
+
+    def save_document(self, file) -> Tuple[bool, str]:
+        try:
+            job = self.save_upload(file)
+            return True, f"'{job['document']}' uploaded; indexing in the background (job {job['job_id']})."
+        except Exception as e:
+            return False, f"Error saving document: {e}"
+
+    def _run(self):
+        while True:
+            job_id = self._queue.get()
+            if job_id is None:
+                break
+            try:
+                self.index(job_id)
+            except Exception as e:
+                logging.error(f"Indexing {self.jobs[job_id]['document']} failed: {e}")
+                self._emit(job_id, status='error', error=str(e))
+
+    def _split(self, documents: List[Document], doc_id: str) -> List[Document]:
+        from langchain_text_splitters import RecursiveCharacterTextSplitter
+        splitter = RecursiveCharacterTextSplitter(chunk_size=self.chunk_size, chunk_overlap=self.chunk_overlap)
+        chunks = splitter.split_documents(documents)
+        seen: Dict[str, int] = {}
+        for chunk in chunks:
+            chunk_hash = hashlib.sha256(chunk.page_content.encode('utf-8')).hexdigest()[:20]
+            occurrence = seen.get(chunk_hash, 0)
+            seen[chunk_hash] = occurrence + 1
+            # Chroma only accepts scalar metadata values
+            metadata = {key: value for key, value in chunk.metadata.items() if isinstance(value, (str, int, float, bool))}
+            metadata.update(doc_id=doc_id, chunk_id=f"{doc_id}:{chunk_hash}:{occurrence}")
+            chunk.metadata = metadata
+        return chunks
+
+    def index(self, job_id: str) -> None:
+        """Parse, chunk and embed one queued document, touching only chunks that changed."""
+        job = self.jobs[job_id]
+        path, doc_id = job['path'], job['doc_id']
+        file_hash = job['file_hash']
+        if file_hash is None:
+            digest = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(UPLOAD_CHUNK_SIZE), b''):
+                    digest.update(block)
+            file_hash = digest.hexdigest()
+        with self._lock:
+            row = self._conn.execute('SELECT file_hash, path FROM indexed_documents WHERE doc_id = ?',
+                                     (doc_id,)).fetchone()
+        if row is not None and row[0] == file_hash:
+            self._emit(job_id, status='done', progress=1.0, added=0, removed=0, unchanged=True)
+            return
+
+        self._emit(job_id, status='parsing', progress=0.05)
+        chunks = self._split(load_document(path), doc_id)
+        wanted = {chunk.metadata['chunk_id']: chunk for chunk in chunks}
+        existing = set(self.store.get(where={'doc_id': doc_id}, include=[])['ids'])
+        removed = [chunk_id for chunk_id in existing if chunk_id not in wanted]
+        added = [chunk for chunk_id, chunk in wanted.items() if chunk_id not in existing]
+        if removed:
+            self.store.delete(ids=removed)
+        self._emit(job_id, status='embedding', progress=0.1, chunks=len(wanted), added=len(added), removed=len(removed))
+
+        for start in range(0, len(added), self.embed_batch_size):
+            batch = added[start:start + self.embed_batch_size]
+            self.store.add_documents(batch, ids=[chunk.metadata['chunk_id'] for chunk in batch])
+            done = min(start + self.embed_batch_size, len(added))
+            self._emit(job_id, progress=0.1 + 0.9 * done / len(added))
+
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO indexed_documents (doc_id, path, file_hash, chunks, indexed_at) VALUES (?, ?, ?, ?, ?)',
+                (doc_id, path, file_hash, len(wanted), time.time())
+            )
+            self._conn.commit()
+        if row is not None and row[1] != path and os.path.exists(row[1]):
+            os.remove(row[1])  # the replaced version, uploaded under another name
+        self._emit(job_id, status='done', progress=1.0, unchanged=False)
+
+    def retrieve(self, question: str, k: int = 4) -> List[Document]:
+        return self.store.similarity_search(question, k=k)
+
+    def query(self, question: str, k: int = 4) -> str:
+        """Answer `question` from the most relevant indexed chunks."""
+        with self._lock:
+            (count,) = self._conn.execute('SELECT COUNT(*) FROM indexed_documents').fetchone()
+        if not count:
+            return "No documents have been indexed yet."
+        if self._chain is None:
+            from langchain.chains.question_answering import load_qa_chain
+            from langchain_openai import OpenAI
+            self._chain = load_qa_chain(OpenAI(temperature=0), chain_type="stuff")
+        documents = self.retrieve(question, k)
+        return self._chain.run(input_documents=documents, question=question)
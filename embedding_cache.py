@@ -0,0 +1,270 @@
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+class HashEmbeddings(Embeddings):
+    """
+    Deterministic local embeddings from signed feature hashing of words.
+
+    No network or model download is needed, so it suits tests and offline use; retrieval
+    quality is lexical (shared words), not semantic.
+    """
+    def __init__(self, dimensions: int = 384):
+        self.dimensions = dimensions
+        self.model = f"hash-{dimensions}"
+
+    def _embed(self, text: str) -> List[float]:
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for word in WORD_PATTERN.findall(text.lower()):
+            digest = int.from_bytes(hashlib.blake2b(word.encode(), digest_size=8).digest(), 'little')
+            vector[digest % self.dimensions] += 1.0 if (digest >> 63) & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+
+def model_identity(embeddings: Embeddings) -> str:
+    """Backend class and model name, e.g. 'OpenAIEmbeddings:text-embedding-ada-002'."""
+    if isinstance(embeddings, CachedEmbeddings):
+        return embeddings.identity
+    model = getattr(embeddings, 'model', None) or getattr(embeddings, 'model_name', None) or ''
+    return f"{type(embeddings).__name__}:{model}"
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token for English text)."""
+    return max(1, len(text) // 4)
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that never embeds the same text twice for the same model.
+
+    Vectors are keyed by (model identity, sha256 of the text). The key index lives in SQLite
+    and the vectors in one memory-mapped float32 matrix per model, so hits are a lookup
+    plus a row read. Misses are deduplicated and sent to the wrapped backend in batches of
+    `batch_size`, at most `max_concurrency` at a time. `stats()` reports hits, misses, hit
+    rate and the tokens (and cost, given `cost_per_1k_tokens`) saved by cache hits.
+
+    Several instances (or processes) may share a cache directory: new rows are allocated
+    inside an immediate SQLite transaction, and the matrix file only ever grows.
+    """
+    def __init__(self, underlying: Embeddings, cache_dir: str = os.path.join('data', 'embeddings'),
+                 batch_size: int = 256, max_concurrency: int = 4, cost_per_1k_tokens: float = 0.0001):
+        self.underlying = underlying
+        self.identity = model_identity(underlying)
+        self.tag = hashlib.sha256(self.identity.encode()).hexdigest()[:16]
+        self.cache_dir = cache_dir
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.cost_per_1k_tokens = cost_per_1k_tokens
+        os.makedirs(cache_dir, exist_ok=True)
+        self._matrix_path = os.path.join(cache_dir, f"{self.tag}.f32")
+        self._conn = sqlite3.connect(os.path.join(cache_dir, 'embeddings.db'), check_same_thread=False)
+        self._lock = threading.Lock()
+        self._matrix: Optional[np.memmap] = None
+        self._dimensions: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.saved_tokens = 0
+        self.embedded_tokens = 0
+        self._init_tables()
+        self._open()
+
+    def _init_tables(self):
+        with self._lock:
+            self._conn.executescript('''
+                CREATE TABLE IF NOT EXISTS embedding_models (
+                    tag TEXT PRIMARY KEY,
+                    identity TEXT NOT NULL,
+                    dimensions INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS embedding_keys (
+                    tag TEXT NOT NULL,
+                    hash TEXT NOT NULL,
+                    row INTEGER NOT NULL,
+                    PRIMARY KEY (tag, hash)
+                );
+            ''')
+            self._conn.commit()
+
+    def _open(self):
+        row = self._conn.execute('SELECT dimensions FROM embedding_models WHERE tag = ?', (self.tag,)).fetchone()
+        if row is None:
+            return
+        if not os.path.exists(self._matrix_path):
+            logging.warning(f"Embedding cache {self._matrix_path} is missing; starting it afresh")
+            self._reset()
+            return
+        self._dimensions = row[0]
+        if os.path.getsize(self._matrix_path) // (4 * self._dimensions) < self._next_row():
+            logging.warning(f"Embedding cache {self._matrix_path} is truncated; starting it afresh")
+            self._reset()
+            return
+        self._map()
+
+    def _reset(self):
+        self._conn.execute('DELETE FROM embedding_keys WHERE tag = ?', (self.tag,))
+        self._conn.commit()
+        self._matrix = None
+        if os.path.exists(self._matrix_path):
+            os.remove(self._matrix_path)
+
+    def _next_row(self) -> int:
+        (row,) = self._conn.execute('SELECT COALESCE(MAX(row) + 1, 0) FROM embedding_keys WHERE tag = ?',
+                                    (self.tag,)).fetchone()
+        return row
+
+    def _map(self) -> None:
+        """(Re)map the whole matrix file, which other instances may have grown."""
+        capacity = os.path.getsize(self._matrix_path) // (4 * self._dimensions)
+        if self._matrix is not None and self._matrix.shape[0] == capacity:
+            return
+        if self._matrix is not None:
+            self._matrix.flush()
+        self._matrix = np.memmap(self._matrix_path, dtype=np.float32, mode='r+', shape=(capacity, self._dimensions))
+
+    def _ensure_capacity(self, rows: int, dimensions: int) -> None:
+        """Grow the matrix file to hold `rows`; only called inside the row-allocating transaction."""
+        if self._dimensions is None:
+            known = self._conn.execute('SELECT dimensions FROM embedding_models WHERE tag = ?', (self.tag,)).fetchone()
+            self._dimensions = known[0] if known else dimensions
+            if known is None:
+                self._conn.execute('INSERT INTO embedding_models (tag, identity, dimensions) VALUES (?, ?, ?)',
+                                   (self.tag, self.identity, dimensions))
+        with open(self._matrix_path, 'ab') as f:
+            capacity = f.seek(0, os.SEEK_END) // (4 * self._dimensions)
+            if rows > capacity:
+                # Never shrinks: the file is extended, so rows other instances wrote stay put
+                f.truncate(max(rows, 2 * capacity, 1024) * self._dimensions * 4)
+        self._map()
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def _lookup(self, hashes: List[str]) -> Dict[str, int]:
+        found = {}
+        unique = list(dict.fromkeys(hashes))
+        for start in range(0, len(unique), 500):
+            batch = unique[start:start + 500]
+            placeholders = ','.join('?' * len(batch))
+            found.update(self._conn.execute(
+                f'SELECT hash, row FROM embedding_keys WHERE tag = ? AND hash IN ({placeholders})',
+                [self.tag, *batch]
+            ).fetchall())
+        return found
+
+    def _embed_misses(self, texts: List[str]) -> List[List[float]]:
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        if len(batches) == 1 or self.max_concurrency <= 1:
+            return [vector for batch in batches for vector in self.underlying.embed_documents(batch)]
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            return [vector for result in executor.map(self.underlying.embed_documents, batches) for vector in result]
+
+    def _store(self, missing: Dict[str, str], vectors: np.ndarray, rows: Dict[str, int]) -> None:
+        """Write the vectors not yet in `rows` at freshly allocated rows and record them in `rows`."""
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Other threads or instances sharing the cache may have stored some of these, or taken rows
+            rows.update(self._lookup(list(missing)))
+            new = [(digest, vector) for digest, vector in zip(missing, vectors) if digest not in rows]
+            if not new:
+                self._conn.commit()
+                return
+            start = self._next_row()
+            self._ensure_capacity(start + len(new), vectors.shape[1])
+            self._matrix[start:start + len(new)] = np.stack([vector for _, vector in new])
+            self._matrix.flush()
+            keys = [(self.tag, digest, start + i) for i, (digest, _) in enumerate(new)]
+            self._conn.executemany('INSERT INTO embedding_keys (tag, hash, row) VALUES (?, ?, ?)', keys)
+            self._conn.commit()
+        except BaseException:
+            self._conn.rollback()
+            raise
+        rows.update((digest, row) for _, digest, row in keys)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        hashes = [self._hash(text) for text in texts]
+        with self._lock:
+            rows = self._lookup(hashes)
+        missing = {}
+        for text, digest in zip(texts, hashes):
+            if digest not in rows and digest not in missing:
+                missing[digest] = text
+
+        if missing:
+            vectors = np.asarray(self._embed_misses(list(missing.values())), dtype=np.float32)
+            with self._lock:
+                self._store(missing, vectors, rows)
+
+        with self._lock:
+            for text, digest in zip(texts, hashes):
+                if digest in missing:
+                    self.misses += 1
+                    self.embedded_tokens += estimate_tokens(text)
+                    missing.pop(digest)  # repeats within this call count as hits
+                else:
+                    self.hits += 1
+                    self.saved_tokens += estimate_tokens(text)
+            if not texts:
+                return []
+            if self._matrix is None or max(rows.values()) >= self._matrix.shape[0]:
+                # Rows stored by another instance since this one last mapped the file
+                if self._dimensions is None:
+                    (self._dimensions,) = self._conn.execute(
+                        'SELECT dimensions FROM embedding_models WHERE tag = ?', (self.tag,)).fetchone()
+                self._map()
+            matrix = np.asarray(self._matrix[[rows[digest] for digest in hashes]])
+        return matrix.tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'cached_vectors': self._conn.execute('SELECT COUNT(*) FROM embedding_keys WHERE tag = ?',
+                                                     (self.tag,)).fetchone()[0],
+                'saved_tokens': self.saved_tokens,
+                'embedded_tokens': self.embedded_tokens,
+                'saved_cost': self.saved_tokens / 1000 * self.cost_per_1k_tokens,
+            }
+
+
+def make_embeddings(backend: Optional[str] = None, cache: bool = True) -> Embeddings:
+    """
+    Embeddings backend by name: 'openai' (default) or 'hash', or from EMBEDDINGS_BACKEND,
+    wrapped in a `CachedEmbeddings` under EMBEDDING_CACHE_DIR unless `cache` is False.
+    """
+    backend = (backend or os.getenv('EMBEDDINGS_BACKEND', 'openai')).lower()
+    if backend == 'hash':
+        embeddings = HashEmbeddings()
+    elif backend == 'openai':
+        from langchain_openai import OpenAIEmbeddings
+        embeddings = OpenAIEmbeddings()
+    else:
+        raise ValueError(f"Unsupported embeddings backend '{backend}'. Supported backends: openai, hash.")
+    if not cache:
+        return embeddings
+    return CachedEmbeddings(embeddings, os.getenv('EMBEDDING_CACHE_DIR', os.path.join('data', 'embeddings')))
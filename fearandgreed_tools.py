@@ -1,5 +1,8 @@
 import requests
+import asyncio
+import aiohttp
 from langchain.tools import tool
+from http_client import async_http
 
 class FearAndGreedIndexAPI:
     def __init__(self):
@@ -14,6 +17,13 @@ class FearAndGreedIndexAPI:
             print(f"Error fetching data from Alternative.me: {e}")
             return None
 
+    async def amake_request(self, parameters):
+        try:
+            return await async_http.get_json(self.base_url, params=parameters, raise_for_status=False)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Error fetching data from Alternative.me: {e}")
+            return None
+
 fng_api = FearAndGreedIndexAPI()
 
 @tool
@@ -31,3 +41,20 @@ def get_fear_and_greed_index(limit=1, format='json', date_format=''):
         'date_format': date_format
     }
     return fng_api.make_request(parameters)
+
+
+@tool
+async def aget_fear_and_greed_index(limit=1, format='json', date_format=''):
+    """
+    Get the latest data of the Fear and Greed Index (async).
+    Args:
+    - limit (int): Limit the number of returned results. Default is 1.
+    - format (str): Format of the data ('json' or 'csv'). Default is 'json'.
+    - date_format (str): Date format ('us', 'cn', 'kr', or 'world'). Default is '' (unixtime).
+    """
+    parameters = {
+        'limit': limit,
+        'format': format,
+        'date_format': date_format
+    }
+    return await fng_api.amake_request(parameters)
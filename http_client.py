@@ -0,0 +1,68 @@
+import asyncio
+import threading
+import aiohttp
+
+class AsyncHTTPClient:
+    """
+    Shared aiohttp client used by the async tool coroutines.
+
+    A single connection pool is reused for every provider so that one event loop can serve
+    many concurrent agent sessions. The underlying session is created lazily on the running
+    loop and recreated if the loop changes (e.g. between separate `asyncio.run` calls).
+    Synchronous tools should go through `run`, which keeps one background loop and therefore
+    one session, instead of calling `asyncio.run` and abandoning a session per call.
+    """
+    def __init__(self, timeout: float = 10, limit: int = 100, limit_per_host: int = 20):
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self._session = None
+        self._loop = None
+        self._background_loop = None
+        self._background_lock = threading.Lock()
+
+    def _get_background_loop(self) -> asyncio.AbstractEventLoop:
+        with self._background_lock:
+            if self._background_loop is None:
+                self._background_loop = asyncio.new_event_loop()
+                threading.Thread(target=self._background_loop.run_forever, name='AsyncHTTPClient',
+                                 daemon=True).start()
+            return self._background_loop
+
+    def run(self, coro):
+        """Run `coro` to completion on the client's long-lived background loop and return its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self._get_background_loop()).result()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+            self._loop = loop
+        return self._session
+
+    async def get_json(self, url, params=None, headers=None, raise_for_status=True):
+        """
+        Perform a GET request and return the decoded JSON body.
+        Args:
+        - url (str): The full URL to request.
+        - params (dict): Query string parameters. `None` values are dropped.
+        - headers (dict): Extra request headers.
+        - raise_for_status (bool): Raise `aiohttp.ClientResponseError` for 4xx/5xx responses.
+        """
+        session = self._get_session()
+        if params:
+            params = {k: str(v) if isinstance(v, bool) else v for k, v in params.items() if v is not None}
+        async with session.get(url, params=params, headers=headers) as response:
+            if raise_for_status:
+                response.raise_for_status()
+            return await response.json(content_type=None)
+
+    async def close(self):
+        """Close the shared session, if one is open."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+async_http = AsyncHTTPClient()
@@ -14,6 +14,7 @@ from prompts import PromptEngine, PromptEngineConfig
 import requests
 import json
 from web_search import WebSearchManager
+from http_client import async_http
 
 
 class Lenox:
@@ -81,7 +82,9 @@ class Lenox:
 
         # If intent is unknown or response type is not handled, use general conversational handling
         if intent == "unknown" or response["type"] not in ["text", "visualization"]:
-            result = self.qa.invoke({"input": query, "chat_history": chat_history})
+            # Run on the shared background loop, so the tools' async variants from every session
+            # await their requests on one event loop and connection pool
+            result = async_http.run(self.qa.ainvoke({"input": query, "chat_history": chat_history}))
             output = result.get('output', 'Error processing the request.')
 
             # Ensure output is a string
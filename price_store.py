@@ -0,0 +1,74 @@
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Ticks kept per symbol; the oldest are dropped once a symbol holds twice this many
+PRICE_STORE_MAX_TICKS = int(os.getenv('PRICE_STORE_MAX_TICKS', '500000'))
+
+
+class PriceStore:
+    """
+    Recent ticks (epoch-ms time, price, volume) per symbol, fed from the live streams.
+
+    Ticks are kept in time order in growable NumPy columns, so ingesting one is O(1)
+    amortised (a late tick from the interleaved trade and ticker streams is shifted into
+    place) and reading the ticks after a time is a binary search and a slice;
+    `dashboards.utilities.fetch_ohlcv` resamples them into bars.
+    """
+    def __init__(self, max_ticks: int = PRICE_STORE_MAX_TICKS):
+        self.max_ticks = max_ticks
+        self._lock = threading.Lock()
+        self._columns: Dict[str, np.ndarray] = {}  # symbol -> (3, capacity) time/price/volume
+        self._sizes: Dict[str, int] = {}
+
+    def add(self, symbol: str, timestamp: int, price: float, volume: float = 0.0) -> None:
+        symbol = symbol.upper()
+        with self._lock:
+            columns = self._columns.get(symbol)
+            size = self._sizes.get(symbol, 0)
+            if columns is None or size == columns.shape[1]:
+                columns, size = self._grow(symbol, size)
+            at = size
+            if size and timestamp < columns[0, size - 1]:
+                at = int(np.searchsorted(columns[0, :size], timestamp, side='right'))
+                columns[:, at + 1:size + 1] = columns[:, at:size]
+            columns[:, at] = (timestamp, price, volume)
+            self._sizes[symbol] = size + 1
+
+    def _grow(self, symbol: str, size: int) -> Tuple[np.ndarray, int]:
+        """Make room for one more tick: trim to `max_ticks` when full, else double the capacity."""
+        columns = self._columns.get(symbol)
+        if columns is not None and size >= 2 * self.max_ticks:
+            keep = self.max_ticks
+            columns[:, :keep] = columns[:, size - keep:size]
+            return columns, keep
+        grown = np.empty((3, min(max(2 * size, 1024), 2 * self.max_ticks)))
+        if columns is not None:
+            grown[:, :size] = columns[:, :size]
+        self._columns[symbol] = grown
+        return grown, size
+
+    def symbols(self) -> List[str]:
+        with self._lock:
+            return [symbol for symbol, size in self._sizes.items() if size]
+
+    def ticks(self, symbol: str, since: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Timestamps, prices and volumes of the stored ticks, only those after `since` (epoch ms) if given."""
+        symbol = symbol.upper()
+        with self._lock:
+            start = 0
+            if since is not None and self._sizes.get(symbol):
+                start = int(np.searchsorted(self._columns[symbol][0, :self._sizes[symbol]], since, side='right'))
+            return self._slice(symbol, start)
+
+    def _slice(self, symbol: str, start: int):
+        size = self._sizes.get(symbol, 0)
+        if not size:
+            return np.empty(0, dtype=np.int64), np.empty(0), np.empty(0)
+        columns = self._columns[symbol][:, start:size]
+        return columns[0].astype(np.int64), columns[1].copy(), columns[2].copy()
+
+
+price_store = PriceStore()
@@ -0,0 +1,299 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from crypto_analysis.text_normalization import WORD_PATTERN
+
+TIME_FILTER_SECONDS = {
+    'hour': 3600,
+    'day': 86400,
+    'week': 7 * 86400,
+    'month': 30 * 86400,
+    'year': 365 * 86400,
+    'all': None,
+}
+
+
+def tokenize(text: str) -> Set[str]:
+    """Lower-cased word tokens; cashtags like `$BTC` index as both `btc` and `$btc`."""
+    tokens = set()
+    for token in WORD_PATTERN.findall((text or '').lower()):
+        if token[0] == '$':
+            tokens.add(token)
+            token = token[1:]
+        tokens.add(token)
+    return tokens
+
+
+class _Postings:
+    """Item ids for one term, kept sorted by creation time so windows are two bisects."""
+    __slots__ = ('timestamps', 'ids')
+
+    def __init__(self):
+        self.timestamps: List[float] = []
+        self.ids: List[int] = []
+
+    def add(self, timestamp: float, item_id: int) -> None:
+        if not self.timestamps or timestamp >= self.timestamps[-1]:
+            self.timestamps.append(timestamp)
+            self.ids.append(item_id)
+        else:
+            position = bisect_right(self.timestamps, timestamp)
+            self.timestamps.insert(position, timestamp)
+            self.ids.insert(position, item_id)
+
+    def window(self, since: Optional[float], until: Optional[float]) -> Tuple[int, int]:
+        lo = bisect_left(self.timestamps, since) if since is not None else 0
+        hi = bisect_right(self.timestamps, until) if until is not None else len(self.timestamps)
+        return lo, hi
+
+
+class RedditIndex:
+    """
+    Local store of subreddit posts and comments with an in-memory inverted index.
+
+    Items are persisted in SQLite; the postings (term -> item ids sorted by creation time)
+    are rebuilt from it on start. Counting a keyword over a time window is then two bisects
+    per term plus a set intersection for multi-word keywords, with no API calls.
+    """
+    def __init__(self, db_path: str = os.path.join('data', 'reddit.db')):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Dict[str, _Postings]] = {}
+        self._fullnames: Dict[str, int] = {}
+        self._listeners = []
+        self._init_tables()
+        self._load()
+
+    def _init_tables(self):
+        with self._lock:
+            self._conn.executescript('''
+                CREATE TABLE IF NOT EXISTS reddit_items (
+                    id INTEGER PRIMARY KEY,
+                    fullname TEXT UNIQUE NOT NULL,
+                    subreddit TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    created_utc REAL NOT NULL,
+                    title TEXT,
+                    body TEXT,
+                    permalink TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_reddit_subreddit ON reddit_items (subreddit, kind, created_utc);
+                CREATE TABLE IF NOT EXISTS reddit_ingest_state (
+                    subreddit TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    newest_fullname TEXT,
+                    covered_since REAL,
+                    PRIMARY KEY (subreddit, kind)
+                );
+            ''')
+            self._conn.commit()
+
+    def _load(self):
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT id, fullname, subreddit, created_utc, title, body FROM reddit_items ORDER BY created_utc'
+            ).fetchall()
+            for item_id, fullname, subreddit, created, title, body in rows:
+                self._fullnames[fullname] = item_id
+                self._index_item(subreddit, item_id, created, f"{title or ''} {body or ''}")
+
+    def _index_item(self, subreddit: str, item_id: int, created: float, text: str) -> None:
+        postings = self._postings.setdefault(subreddit, {})
+        for token in tokenize(text):
+            entry = postings.get(token)
+            if entry is None:
+                entry = postings[token] = _Postings()
+            entry.add(created, item_id)
+
+    def add_listener(self, callback: Callable[[List[Dict[str, Any]]], None]) -> None:
+        """Register `callback(new_items)`, called after every insert that adds items."""
+        self._listeners.append(callback)
+
+    def add_items(self, items: List[Dict[str, Any]]) -> int:
+        """Store and index items (`fullname`, `subreddit`, `kind`, `created_utc`, `title`, `body`); returns how many were new."""
+        added = []
+        with self._lock:
+            for item in items:
+                if item['fullname'] in self._fullnames:
+                    continue
+                subreddit = item['subreddit'].lower()
+                cursor = self._conn.execute('''
+                    INSERT INTO reddit_items (fullname, subreddit, kind, created_utc, title, body, permalink)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', (item['fullname'], subreddit, item['kind'], float(item['created_utc']),
+                      item.get('title'), item.get('body'), item.get('permalink')))
+                self._fullnames[item['fullname']] = cursor.lastrowid
+                self._index_item(subreddit, cursor.lastrowid, float(item['created_utc']),
+                                 f"{item.get('title') or ''} {item.get('body') or ''}")
+                added.append(item)
+            self._conn.commit()
+        if added:
+            for callback in self._listeners:
+                try:
+                    callback(added)
+                except Exception as e:
+                    logging.error(f"Reddit item listener failed: {e}")
+        return len(added)
+
+    def items_since(self, since: float) -> Iterator[Dict[str, Any]]:
+        """Stored items created at or after `since`, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT fullname, subreddit, kind, created_utc, title, body FROM reddit_items '
+                'WHERE created_utc >= ? ORDER BY created_utc', (float(since),)
+            ).fetchall()
+        keys = ('fullname', 'subreddit', 'kind', 'created_utc', 'title', 'body')
+        return (dict(zip(keys, row)) for row in rows)
+
+    def _matching_ids(self, subreddit: str, keyword: str, since: Optional[float], until: Optional[float]) -> Set[int]:
+        postings = self._postings.get(subreddit.lower(), {})
+        terms = tokenize(keyword)
+        if not terms:
+            return set()
+        # Bare terms also count cashtag spellings; a `$btc` keyword only matches cashtags
+        terms = {term for term in terms if not ('$' + term) in terms}
+        windows = []
+        for term in terms:
+            entry = postings.get(term)
+            if entry is None:
+                return set()
+            windows.append((entry, *entry.window(since, until)))
+        windows.sort(key=lambda window: window[2] - window[1])
+        entry, lo, hi = windows[0]
+        matches = set(entry.ids[lo:hi])
+        for entry, lo, hi in windows[1:]:
+            if not matches:
+                break
+            matches.intersection_update(entry.ids[lo:hi])
+        return matches
+
+    def count(self, subreddit: str, keyword: str, since: Optional[float] = None,
+              until: Optional[float] = None) -> int:
+        """Number of stored posts and comments containing every term of `keyword`."""
+        with self._lock:
+            return len(self._matching_ids(subreddit, keyword, since, until))
+
+    def lookup(self, subreddit: str, keyword: str, since: Optional[float] = None, until: Optional[float] = None,
+               kind: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
+        """Newest-first stored items containing every term of `keyword`."""
+        with self._lock:
+            ids = self._matching_ids(subreddit, keyword, since, until)
+            if not ids:
+                return []
+            # Matches are joined through a temp table: common keywords can match more ids than
+            # SQLite allows as bound parameters
+            self._conn.execute('CREATE TEMP TABLE IF NOT EXISTS reddit_lookup_ids (id INTEGER PRIMARY KEY)')
+            self._conn.executemany('INSERT INTO reddit_lookup_ids (id) VALUES (?)', ((item_id,) for item_id in ids))
+            try:
+                sql = ('SELECT i.fullname, i.kind, i.created_utc, i.title, i.body, i.permalink FROM reddit_lookup_ids l '
+                       'JOIN reddit_items i ON i.id = l.id' + (' WHERE i.kind = ?' if kind else '') +
+                       ' ORDER BY i.created_utc DESC LIMIT ?')
+                rows = self._conn.execute(sql, ([kind] if kind else []) + [int(limit)]).fetchall()
+            finally:
+                self._conn.execute('DELETE FROM reddit_lookup_ids')
+                self._conn.commit()
+        keys = ('fullname', 'kind', 'created_utc', 'title', 'body', 'permalink')
+        return [dict(zip(keys, row)) for row in rows]
+
+    def get_state(self, subreddit: str, kind: str) -> Tuple[Optional[str], Optional[float]]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT newest_fullname, covered_since FROM reddit_ingest_state WHERE subreddit = ? AND kind = ?',
+                (subreddit.lower(), kind)
+            ).fetchone()
+        return (row[0], row[1]) if row else (None, None)
+
+    def set_state(self, subreddit: str, kind: str, newest_fullname: Optional[str], covered_since: Optional[float]) -> None:
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO reddit_ingest_state (subreddit, kind, newest_fullname, covered_since) VALUES (?, ?, ?, ?)',
+                (subreddit.lower(), kind, newest_fullname, covered_since)
+            )
+            self._conn.commit()
+
+    def covered_since(self, subreddit: str) -> Optional[float]:
+        """Earliest time from which both posts and comments of `subreddit` are stored, if ingested."""
+        covered = [self.get_state(subreddit, kind)[1] for kind in ('submission', 'comment')]
+        if any(value is None for value in covered):
+            return None
+        return max(covered)
+
+
+class RedditIngestor:
+    """
+    Incremental ingestion of a subreddit's `new` posts and comments into a `RedditIndex`.
+
+    Each refresh walks the newest-first listings and stops at the last fullname seen, so
+    steady-state refreshes fetch only what was posted since. The first refresh of a
+    subreddit backfills up to `backfill_limit` items of each kind (Reddit listings stop
+    at about 1000). Subreddits refreshed within `max_age` seconds are not fetched again.
+    """
+    def __init__(self, reddit, index: RedditIndex, max_age: float = 300, backfill_limit: int = 1000):
+        self.reddit = reddit
+        self.index = index
+        self.max_age = max_age
+        self.backfill_limit = backfill_limit
+        self._last_refresh: Dict[str, float] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def _subreddit_lock(self, subreddit: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(subreddit, threading.Lock())
+
+    @staticmethod
+    def _submission_item(submission, subreddit: str) -> Dict[str, Any]:
+        return {
+            'fullname': submission.fullname, 'subreddit': subreddit, 'kind': 'submission',
+            'created_utc': submission.created_utc, 'title': submission.title,
+            'body': submission.selftext, 'permalink': submission.permalink,
+        }
+
+    @staticmethod
+    def _comment_item(comment, subreddit: str) -> Dict[str, Any]:
+        return {
+            'fullname': comment.fullname, 'subreddit': subreddit, 'kind': 'comment',
+            'created_utc': comment.created_utc, 'title': None,
+            'body': comment.body, 'permalink': comment.permalink,
+        }
+
+    def _ingest_listing(self, subreddit: str, kind: str, listing_factory, to_item) -> int:
+        newest_seen, covered_since = self.index.get_state(subreddit, kind)
+        items = []
+        for thing in listing_factory(self.backfill_limit):
+            if thing.fullname == newest_seen:
+                break
+            items.append(to_item(thing, subreddit))
+        if not items:
+            return 0
+        if newest_seen is None or len(items) >= self.backfill_limit:
+            # First run, or more arrived than a listing returns: only the fetched span is complete
+            covered_since = min(item['created_utc'] for item in items)
+        added = self.index.add_items(items)
+        self.index.set_state(subreddit, kind, items[0]['fullname'], covered_since)
+        return added
+
+    def refresh(self, subreddit: str) -> int:
+        """Fetch posts and comments newer than the last ones seen; returns how many were stored."""
+        subreddit = subreddit.lower()
+        with self._subreddit_lock(subreddit):
+            sub = self.reddit.subreddit(subreddit)
+            added = self._ingest_listing(subreddit, 'submission', lambda limit: sub.new(limit=limit), self._submission_item)
+            added += self._ingest_listing(subreddit, 'comment', lambda limit: sub.comments(limit=limit), self._comment_item)
+            self._last_refresh[subreddit] = time.monotonic()
+        return added
+
+    def refresh_if_stale(self, subreddit: str) -> None:
+        last = self._last_refresh.get(subreddit.lower())
+        if last is None or time.monotonic() - last > self.max_age:
+            try:
+                self.refresh(subreddit)
+            except Exception as e:
+                logging.error(f"Failed to refresh r/{subreddit}: {e}")
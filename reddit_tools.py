@@ -1,13 +1,14 @@
 import praw
-from collections import Counter
-from textblob import TextBlob
 from langchain.agents import tool  # Use the @tool decorator
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 import os
 from typing import List, Union
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-import string
+
+from sentiment_pipeline import SentimentPipeline
+from reddit_index import RedditIndex, RedditIngestor, TIME_FILTER_SECONDS
+from trending_topics import TrendingTopics
+from crypto_analysis.text_normalization import default_normalizer
+import time
+from datetime import datetime
 
 from dotenv import load_dotenv
 load_dotenv()
@@ -19,6 +20,35 @@ reddit = praw.Reddit(
     user_agent=os.getenv('REDDIT_USER_AGENT')
 )
 
+# Scores are cached by comment id across calls; workers are spawned on the first large batch
+sentiment_pipeline = SentimentPipeline()
+
+# Posts and comments are ingested incrementally and counted from a local inverted index
+reddit_index = RedditIndex(os.getenv('REDDIT_DB', os.path.join('data', 'reddit.db')))
+reddit_ingestor = RedditIngestor(reddit, reddit_index, max_age=int(os.getenv('REDDIT_REFRESH_INTERVAL', '300')))
+
+# Decayed heavy-hitter counts over every ingested title and comment (1h and 24h half-lives)
+trending_topics = TrendingTopics(half_life=86400, short_half_life=3600)
+
+def _track_topics(items):
+    for item in items:
+        trending_topics.add_text(item['subreddit'], f"{item.get('title') or ''} {item.get('body') or ''}", item['created_utc'])
+
+_track_topics(reddit_index.items_since(time.time() - 4 * trending_topics.half_life))
+reddit_index.add_listener(_track_topics)
+
+def _window_start(time_filter: str):
+    if time_filter not in TIME_FILTER_SECONDS:
+        raise ValueError(f"Unsupported time filter '{time_filter}'. Supported filters: {', '.join(TIME_FILTER_SECONDS)}.")
+    seconds = TIME_FILTER_SECONDS[time_filter]
+    return time.time() - seconds if seconds else None
+
+def _coverage_note(subreddit: str, since) -> str:
+    covered_since = reddit_index.covered_since(subreddit)
+    if covered_since is not None and (since is None or covered_since > since):
+        return f" (local history starts {datetime.utcfromtimestamp(covered_since).strftime('%Y-%m-%d %H:%M')} UTC)"
+    return ""
+
 @tool
 def get_reddit_data(subreddit: str, category: str = 'hot') -> str:
     """
@@ -34,44 +64,53 @@ def get_reddit_data(subreddit: str, category: str = 'hot') -> str:
 @tool
 def count_mentions(subreddit: str, keyword: str, time_filter='week') -> str:
     """
-    Counts how often a keyword is mentioned in a subreddit within the specified time period.
+    Counts how often a keyword is mentioned in posts and comments of a subreddit within the specified time period (hour, day, week, month, year, all).
+    """
+    try:
+        since = _window_start(time_filter)
+    except ValueError as e:
+        return str(e)
+    reddit_ingestor.refresh_if_stale(subreddit)
+    mentions = reddit_index.count(subreddit, keyword, since=since)
+    return f"'{keyword}' was mentioned {mentions} times in r/{subreddit} over the past {time_filter}{_coverage_note(subreddit, since)}."
+
+@tool
+def find_mentions(subreddit: str, keyword: str, time_filter='week', limit: int = 5) -> str:
+    """
+    Lists the most recent posts and comments in a subreddit that mention a keyword within the specified time period (hour, day, week, month, year, all).
     """
-    mentions = sum(1 for _ in reddit.subreddit(subreddit).search(keyword, time_filter=time_filter))
-    return f"'{keyword}' was mentioned {mentions} times in r/{subreddit} over the past {time_filter}."
+    try:
+        since = _window_start(time_filter)
+    except ValueError as e:
+        return str(e)
+    reddit_ingestor.refresh_if_stale(subreddit)
+    items = reddit_index.lookup(subreddit, keyword, since=since, limit=limit)
+    if not items:
+        return f"No mentions of '{keyword}' found in r/{subreddit} over the past {time_filter}{_coverage_note(subreddit, since)}."
+    lines = []
+    for item in items:
+        text = item['title'] if item['kind'] == 'submission' else item['body']
+        text = ' '.join((text or '').split())[:200]
+        lines.append(f"[{item['kind']}] {text} (https://www.reddit.com{item['permalink']})")
+    return f"Recent mentions of '{keyword}' in r/{subreddit}:\n" + "\n".join(lines)
 
 @tool
 def analyze_sentiment(subreddit: str, keyword: str, time_filter='week') -> str:
     """
     Conducts a sentiment analysis for posts and comments containing a specific keyword, providing both the average score and a qualitative interpretation.
     """
-    sentiment_analyzer = SentimentIntensityAnalyzer()
-    sentiment_scores = []
-    for submission in reddit.subreddit(subreddit).search(keyword, time_filter=time_filter):
-        # Using TextBlob
-        analysis_tb = TextBlob(submission.title)
-        sentiment_scores.append(analysis_tb.sentiment.polarity)
-        
-        # Using VADER
-        analysis_vader = sentiment_analyzer.polarity_scores(submission.title)
-        sentiment_scores.append(analysis_vader['compound'])
-        
-        for comment in submission.comments.list():
-            if isinstance(comment, praw.models.MoreComments):
-                continue
-            analysis_tb = TextBlob(comment.body)
-            sentiment_scores.append(analysis_tb.sentiment.polarity)
-            
-            analysis_vader = sentiment_analyzer.polarity_scores(comment.body)
-            sentiment_scores.append(analysis_vader['compound'])
-
-    if sentiment_scores:
-        average_sentiment = sum(sentiment_scores) / len(sentiment_scores)
+    submissions = reddit.subreddit(subreddit).search(keyword, time_filter=time_filter)
+    result = sentiment_pipeline.analyze(submissions)
+
+    if result.texts:
+        average_sentiment = result.average
         sentiment_description = interpret_sentiment(average_sentiment)
     else:
         average_sentiment = 0
         sentiment_description = "No sentiment data available."
 
-    return f"Average sentiment for '{keyword}' in r/{subreddit} over the past {time_filter}: {average_sentiment:.2f} ({sentiment_description})"
+    return (f"Average sentiment for '{keyword}' in r/{subreddit} over the past {time_filter}: {average_sentiment:.2f} ({sentiment_description})"
+            f" [{result.texts} texts, {result.cached} cached, {result.texts_per_second:.0f} texts/sec]")
 
 def interpret_sentiment(score: float) -> str:
     """
@@ -88,16 +127,17 @@ def interpret_sentiment(score: float) -> str:
 @tool
 def find_trending_topics(subreddits: List[str], time_filter='day') -> str:
     """
-    Identifies trending topics in the given subreddits within the specified time period.
+    Identifies trending topics (tickers, words and phrases) in the given subreddits. time_filter 'hour' ranks by
+    the last hour's activity, anything else by the last day's; velocity > 1 means mentions are accelerating.
     """
-    topics = Counter()
-    stopwords_set = set(stopwords.words('english'))  # Ensure stopwords are being used to filter
     for subreddit in subreddits:
-        for submission in reddit.subreddit(subreddit).hot(limit=100):
-            words = [word for word in submission.title.split() if word.lower() not in stopwords_set]
-            topics.update(words)
-    most_common_topics = topics.most_common(10)
-    topics_str = "\n".join([f"{topic[0]}: {topic[1]} mentions" for topic in most_common_topics])
+        reddit_ingestor.refresh_if_stale(subreddit)
+    by = 'short' if time_filter == 'hour' else 'long'
+    topics = trending_topics.top(subreddits, n=10, by=by)
+    if not topics:
+        return "No trending topics found."
+    count_key = 'short_count' if by == 'short' else 'count'
+    topics_str = "\n".join([f"{topic['term']}: {topic[count_key]:.0f} weighted mentions (velocity x{topic['velocity']:.1f})" for topic in topics])
     return f"Trending topics:\n{topics_str}"
 
 
@@ -105,14 +145,4 @@ def clean_reddit_text(docs: List[str]) -> List[str]:
     """
     Cleans and prepares Reddit text for sentiment analysis.
     """
-    stop_words = set(stopwords.words('english'))
-    lemmatizer = WordNetLemmatizer()
-    translator = str.maketrans('', '', string.punctuation)
-
-    clean_docs = []
-    for doc in docs:
-        tokens = doc.split()
-        clean_tokens = [lemmatizer.lemmatize(token) for token in tokens if token not in stop_words and token.isalpha()]
-        clean_doc = ' '.join(clean_tokens).translate(translator)
-        clean_docs.append(clean_doc)
-    return clean_docs
+    return default_normalizer().normalize_many(docs)
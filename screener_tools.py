@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional
+
+import aiohttp
+import numpy as np
+from cachetools import TTLCache
+from langchain.agents import tool
+
+from binance_tools import binance_api
+from cryptocompare_tools import afetch_top_volume
+from http_client import async_http
+from crypto_analysis.screener import (ALIASES, IndicatorPanel, align_klines, kline_array, parse_conditions,
+                                      required_bars)
+
+KLINE_INTERVALS = ('15m', '1h', '4h', '1d', '1w')
+# Skipped in the default universe: their USDT pair is meaningless or missing
+STABLECOINS = {'USDT', 'USDC', 'BUSD', 'DAI', 'TUSD', 'FDUSD', 'USDP', 'USDD', 'PYUSD', 'EUR', 'WBTC'}
+
+# Bars every coin must have even for screens needing less, so the listed RSI is defined
+MIN_BARS = 35
+
+kline_cache = TTLCache(maxsize=4096, ttl=60)
+
+
+async def _aload_symbol(symbol: str, interval: str, limit: int, semaphore: asyncio.Semaphore) -> Optional[np.ndarray]:
+    key = (symbol, interval, limit)
+    if key in kline_cache:
+        return kline_cache[key]
+    async with semaphore:
+        try:
+            rows = await binance_api.amake_request('api/v3/klines', {'symbol': symbol, 'interval': interval, 'limit': limit})
+        except aiohttp.ClientResponseError as e:
+            # 400 means Binance has no such pair; remember that like any other answer
+            if e.status != 400:
+                logging.warning(f"Failed to fetch {symbol} klines: {e}")
+                return None
+            rows = []
+    if rows is None:
+        return None
+    klines = kline_cache[key] = kline_array(rows)
+    return klines
+
+
+async def aload_klines(symbols: List[str], interval: str = '1d', limit: int = 200,
+                       concurrency: int = 20) -> Dict[str, np.ndarray]:
+    """
+    Fetch klines for many Binance symbols concurrently (at most `concurrency` requests in
+    flight) as `kline_array`s; unknown pairs are left out.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    results = await asyncio.gather(*(_aload_symbol(symbol, interval, limit, semaphore) for symbol in symbols))
+    return {symbol: klines for symbol, klines in zip(symbols, results) if klines is not None and len(klines)}
+
+
+async def _ascreen(conditions: str, symbols: Optional[List[str]], universe_size: int, interval: str,
+                   quote: str, bars: int, max_results: int) -> str:
+    if interval not in KLINE_INTERVALS:
+        return f"Unsupported interval '{interval}'. Supported intervals: {', '.join(KLINE_INTERVALS)}."
+    try:
+        groups = parse_conditions(conditions)
+    except ValueError as e:
+        return str(e)
+
+    started = time.perf_counter()
+    quote = quote.upper()
+    if symbols:
+        pairs = [s.upper() if s.upper().endswith(quote) else f"{s.upper()}{quote}" for s in symbols]
+    else:
+        try:
+            top = await afetch_top_volume('USD', universe_size + len(STABLECOINS))
+        except Exception as e:
+            return f"Failed to fetch the top-volume universe: {e}"
+        pairs = [f"{coin}{quote}" for coin in top if coin not in STABLECOINS][:universe_size]
+    klines = await aload_klines(pairs, interval, bars)
+    loaded = time.perf_counter()
+
+    # Coins too short for the screen are dropped rather than trimming every coin down to them
+    min_bars = max(required_bars(groups), MIN_BARS)
+    short = sorted(symbol for symbol, rows in klines.items() if len(rows) < min_bars)
+    screened, _, columns = align_klines(klines, min_bars)
+    panel = IndicatorPanel(screened, columns)
+    if not len(panel):
+        return f"No {interval} price history of at least {min_bars} bars available for the requested symbols."
+    try:
+        mask = panel.screen(groups)
+    except ValueError as e:
+        return str(e)
+    elapsed = time.perf_counter() - loaded
+
+    header = (f"Screened {len(panel)} of {len(pairs)} {quote} pairs on {interval} bars for '{conditions}' "
+              f"(data {loaded - started:.2f}s, screen {elapsed * 1000:.0f}ms): {int(mask.sum())} match.")
+    if short:
+        header += f"\nSkipped {len(short)} pairs with fewer than {min_bars} {interval} bars: {', '.join(short)}."
+    if not mask.any():
+        return header
+    referenced = [ALIASES.get(operand, operand) for clauses in groups for condition in clauses
+                  for operand in (condition.left, condition.right) if isinstance(operand, str)]
+    columns = list(dict.fromkeys(['close', 'rsi', *referenced]))
+    latest = {column: panel.latest(column) for column in columns}
+    lines = [header]
+    for i in np.flatnonzero(mask)[:max_results]:
+        readings = ', '.join(f"{column} {latest[column][i]:.6g}" for column in columns)
+        lines.append(f"{panel.symbols[i]}: {readings}")
+    if mask.sum() > max_results:
+        lines.append(f"... and {int(mask.sum()) - max_results} more")
+    return "\n".join(lines)
+
+
+@tool
+def screen_market(conditions: str, symbols: Optional[List[str]] = None, universe_size: int = 100,
+                  interval: str = '1d', quote: str = 'USDT', bars: int = 200, max_results: int = 25) -> str:
+    """
+    Screen many coins at once for technical conditions, e.g. 'rsi < 30 and macd crosses above signal'
+    or 'close above sma_50 and atr_pct < 5'. Indicators: close/price, volume, change_pct, rsi[_N],
+    sma_N, ema_N, macd, signal, macd_hist, bb_upper/bb_lower[_N], atr[_N], atr_pct, stoch_k, stoch_d, obv.
+    Args:
+    - conditions (str): Conditions joined by 'and' / 'or'; compare with <, >, above, below, crosses above/below.
+    - symbols (List[str]): Coins or pairs to screen (e.g. ['BTC', 'ETHUSDT']); defaults to the top coins by volume.
+    - universe_size (int): Number of top-volume coins screened when no symbols are given.
+    - interval (str): Bar interval: 15m, 1h, 4h, 1d or 1w.
+    - quote (str): Quote asset of the Binance pairs.
+    - bars (int): Bars of history loaded per coin.
+    - max_results (int): Maximum number of matches listed.
+    """
+    return async_http.run(_ascreen(conditions, symbols, universe_size, interval, quote, bars, max_results))
+
+
+@tool
+async def ascreen_market(conditions: str, symbols: Optional[List[str]] = None, universe_size: int = 100,
+                         interval: str = '1d', quote: str = 'USDT', bars: int = 200, max_results: int = 25) -> str:
+    """
+    Screen many coins at once for technical conditions (async), e.g. 'rsi < 30 and macd crosses above signal'.
+    Args:
+    - conditions (str): Conditions joined by 'and' / 'or'; compare with <, >, above, below, crosses above/below.
+    - symbols (List[str]): Coins or pairs to screen; defaults to the top coins by volume.
+    - universe_size (int): Number of top-volume coins screened when no symbols are given.
+    - interval (str): Bar interval: 15m, 1h, 4h, 1d or 1w.
+    - quote (str): Quote asset of the Binance pairs.
+    - bars (int): Bars of history loaded per coin.
+    - max_results (int): Maximum number of matches listed.
+    """
+    return await _ascreen(conditions, symbols, universe_size, interval, quote, bars, max_results)
@@ -0,0 +1,139 @@
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from textblob import TextBlob
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+# Per-process analyzer, built once by the pool initializer (or lazily in the parent)
+_vader: Optional[SentimentIntensityAnalyzer] = None
+
+
+def _init_worker() -> None:
+    global _vader
+    _vader = SentimentIntensityAnalyzer()
+
+
+def score_texts(texts: List[str]) -> List[Tuple[float, float]]:
+    """(TextBlob polarity, VADER compound) for each text, using this process's analyzer."""
+    if _vader is None:
+        _init_worker()
+    return [(TextBlob(text).sentiment.polarity, _vader.polarity_scores(text)['compound']) for text in texts]
+
+
+class SentimentResult(NamedTuple):
+    average: float
+    texts: int
+    scored: int
+    cached: int
+    fetch_seconds: float
+    score_seconds: float
+
+    @property
+    def texts_per_second(self) -> float:
+        """Scoring throughput, cache hits included."""
+        return self.texts / self.score_seconds if self.score_seconds > 0 else 0.0
+
+
+class SentimentPipeline:
+    """
+    Batched TextBlob + VADER scoring of Reddit submissions and comments.
+
+    Comment trees are fetched concurrently on a thread pool; texts missing from the LRU
+    cache (keyed by Reddit fullname) are scored in batches of `batch_size` on a process
+    pool whose workers build their analyzers once. Inputs smaller than `min_parallel`
+    texts are scored in-process, where pool dispatch would cost more than it saves.
+    """
+    def __init__(self, max_workers: Optional[int] = None, batch_size: int = 256, fetch_workers: int = 8,
+                 cache_size: int = 100000, min_parallel: int = 512):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.fetch_workers = fetch_workers
+        self.cache_size = cache_size
+        self.min_parallel = min_parallel
+        self._cache: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                # Spawned, not forked: the parent already runs websocket, poller and indexer threads
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                                 mp_context=multiprocessing.get_context('spawn'))
+            return self._pool
+
+    def close(self) -> None:
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def score(self, items: Iterable[Tuple[str, str]]) -> Tuple[Dict[str, Tuple[float, float]], int]:
+        """Scores for `(id, text)` pairs; returns the scores by id and how many came from the cache."""
+        scores, missing = {}, {}
+        with self._cache_lock:
+            for item_id, text in items:
+                cached = self._cache.get(item_id)
+                if cached is not None:
+                    self._cache.move_to_end(item_id)
+                    scores[item_id] = cached
+                else:
+                    missing[item_id] = text or ''
+        cached_count = len(scores)
+        if not missing:
+            return scores, cached_count
+
+        ids, texts = list(missing), list(missing.values())
+        if len(texts) < self.min_parallel or self.max_workers == 1:
+            results = score_texts(texts)
+        else:
+            batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+            results = [result for batch in self._get_pool().map(score_texts, batches) for result in batch]
+
+        with self._cache_lock:
+            for item_id, result in zip(ids, results):
+                scores[item_id] = result
+                self._cache[item_id] = result
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return scores, cached_count
+
+    def _comment_items(self, submission) -> List[Tuple[str, str]]:
+        # Imported here so the scoring side of the module does not depend on PRAW
+        from praw.models import MoreComments
+        return [(comment.fullname, comment.body) for comment in submission.comments.list()
+                if not isinstance(comment, MoreComments)]
+
+    def collect(self, submissions: Iterable) -> List[Tuple[str, str]]:
+        """`(id, text)` pairs for the submissions' titles and comments, fetching comment trees concurrently."""
+        submissions = list(submissions)
+        items = [(submission.fullname, submission.title) for submission in submissions]
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as executor:
+            futures = [executor.submit(self._comment_items, submission) for submission in submissions]
+            for future in futures:
+                try:
+                    items.extend(future.result())
+                except Exception as e:
+                    logging.warning(f"Failed to load comments: {e}")
+        return items
+
+    def analyze(self, submissions: Iterable) -> SentimentResult:
+        """Average of the TextBlob and VADER scores over all titles and comments."""
+        start = time.perf_counter()
+        items = self.collect(submissions)
+        fetched = time.perf_counter()
+        scores, cached = self.score(items)
+        scored = time.perf_counter()
+        values = [value for pair in scores.values() for value in pair]
+        average = sum(values) / len(values) if values else 0.0
+        result = SentimentResult(average, len(scores), len(scores) - cached, cached, fetched - start, scored - fetched)
+        logging.info(f"Sentiment: {result.texts} texts ({result.cached} cached), fetched in {result.fetch_seconds:.2f}s, "
+                     f"scored at {result.texts_per_second:.0f} texts/sec")
+        return result
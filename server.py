@@ -0,0 +1,257 @@
+from flask import Flask, Request, render_template, request, jsonify, session, send_from_directory, redirect
+from flask_socketio import SocketIO, emit
+from flask_cors import CORS
+import os
+import logging
+from logging.handlers import RotatingFileHandler
+from dotenv import load_dotenv
+from document_indexing import DocumentIndexer
+from lenox import Lenox  # Ensure this imports the updated lenox.py
+from prompts import PromptEngine, PromptEngineConfig
+from werkzeug.utils import secure_filename
+from tool_imports import import_tools
+from binance_tools import ticker_stream, depth_stream, trade_stream
+from whale_alert_tools import whale_poller, WHALE_ALERT_POLL_INTERVAL
+from cryptopanic_tools import news_ingestor
+import whisper
+from dashboards.dashboard import create_dashboard
+
+# Load environment variables
+load_dotenv()
+app = Flask(__name__)
+_whisper_model = None
+openai_api_key = os.getenv('OPENAI_API_KEY')
+CORS(app)
+app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'my_secret_key')
+app.config['UPLOAD_FOLDER'] = '/Users/lenox27/LENOX/uploaded_documents'
+socketio = SocketIO(app)
+
+# Pass the `app` object to `create_dashboard` to integrate Dash
+app = create_dashboard(app)
+
+# Configure structured logging
+logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+handler = RotatingFileHandler('app.log', maxBytes=10000, backupCount=1)
+handler.setLevel(logging.DEBUG)
+app.logger.addHandler(handler)
+
+# Import tools before they are used
+tools = import_tools()
+
+def get_whisper_model():
+    """Load the Whisper model on first transcription rather than at startup."""
+    global _whisper_model
+    if _whisper_model is None:
+        _whisper_model = whisper.load_model("base")
+    return _whisper_model
+
+def start_background_services():
+    """Start the background feeds; called by main.py before serving."""
+    # Serve configured Binance tickers and order books from local websocket-fed state
+    # (each is a no-op without BINANCE_STREAM_SYMBOLS / BINANCE_DEPTH_SYMBOLS / BINANCE_TRADE_SYMBOLS)
+    ticker_stream.start()
+    depth_stream.start()
+    trade_stream.start()
+
+    # Keep the local Whale Alert transaction index current (set WHALE_ALERT_POLL_INTERVAL=0 to disable)
+    if WHALE_ALERT_POLL_INTERVAL > 0:
+        whale_poller.start()
+
+    # Keep the local CryptoPanic news store current (tools also refresh it on demand)
+    if news_ingestor.api_key and news_ingestor.interval > 0:
+        news_ingestor.start()
+
+# Create instances of your components
+# Uploads are parsed, chunked and embedded on a background queue; progress is pushed to clients
+document_handler = DocumentIndexer(document_folder=app.config['UPLOAD_FOLDER'], data_folder="data",
+                                   on_progress=lambda job: socketio.emit('document_progress', job))
+
+class UploadRequest(Request):
+    """Writes /upload file parts straight into the document folder instead of a temporary spool."""
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if self.endpoint == 'upload_document':
+            return document_handler.spool()
+        return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+
+app.request_class = UploadRequest
+prompt_engine_config = PromptEngineConfig(context_length=10, max_tokens=4096)
+prompt_engine = PromptEngine(config=prompt_engine_config, tools=tools)
+
+# Initialize Lenox with all necessary components
+lenox = Lenox(tools=tools, document_handler=document_handler, prompt_engine=prompt_engine, openai_api_key=openai_api_key)
+
+@app.route('/dashboard')
+def dashboard_page():
+    return redirect('/dashboard/')
+
+@app.before_request
+def log_request():
+    app.logger.debug(f'Incoming request: {request.method} {request.path}')
+    session.setdefault('session_id', os.urandom(24).hex())
+
+@app.after_request
+def log_response(response):
+    app.logger.debug(f'Outgoing response: {response.status}')
+    return response
+
+@app.route('/')
+def index():
+    return render_template('index.html')
+
+@app.route('/audio/<filename>')
+def serve_audio(filename):
+    return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+
+@app.route('/transcribe', methods=['POST'])
+def transcribe_audio():
+    audio_file = request.files.get('file')
+    if not audio_file:
+        return jsonify({'error': 'No file provided'}), 400
+
+    # Ensure the filename is not None
+    filename = audio_file.filename
+    if filename:
+        audio_path = secure_filename(filename)
+    else:
+        audio_path = secure_filename("default_filename.wav")
+
+    audio_file.save(os.path.join(app.config['UPLOAD_FOLDER'], audio_path))
+
+    # Perform transcription using the Whisper model
+    result = get_whisper_model().transcribe(os.path.join(app.config['UPLOAD_FOLDER'], audio_path))
+    transcription = result['text']
+    detected_language = result['language']
+
+    # Clean up the saved file after processing
+    os.remove(os.path.join(app.config['UPLOAD_FOLDER'], audio_path))
+
+    return jsonify({
+        'transcription': transcription,
+        'language': detected_language
+    })
+
+@app.route('/upload', methods=['POST'])
+def upload_document():
+    if 'file' not in request.files:
+        return jsonify({'error': 'No file part in the request'}), 400
+
+    file = request.files['file']
+    if file.filename == '':
+        return jsonify({'error': 'No file selected'}), 400
+
+    try:
+        # A doc_id field replaces that document; otherwise the upload is a new document
+        job = document_handler.save_upload(file, request.form.get('doc_id') or None)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        app.logger.error(f"Error saving document: {e}")
+        return jsonify({'error': 'Failed to save document.'}), 500
+    return jsonify({'message': f"'{job['document']}' uploaded; indexing in the background.", 'job': job}), 202
+
+@app.route('/upload/<job_id>', methods=['GET'])
+def upload_status(job_id):
+    job = document_handler.job_status(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown indexing job'}), 404
+    return jsonify(job)
+
+@app.route('/document_query', methods=['POST'])
+def document_query():
+    try:
+        data = request.get_json()
+        query = data.get('query', '')
+        if not query:
+            return jsonify({'error': 'Empty query.'}), 400
+
+        result = lenox.handle_document_query(query)
+        return jsonify({'type': 'document_response', 'response': result})
+    except Exception as e:
+        app.logger.error(f"Error processing document query: {e}")
+        return jsonify({'error': 'Failed to process document query.'}), 500
+
+@app.route('/synthesize', methods=['POST'])
+def synthesize_speech():
+    data = request.get_json()
+    input_text = data.get('input')
+    voice = data.get('voice', 'onyx')
+    tts_model = data.get('model', 'tts-1-hd')  # Avoid shadowing `model`
+
+    if not input_text:
+        return jsonify({'error': 'Input text is missing'}), 400
+
+    try:
+        audio_path = lenox.synthesize_text(tts_model, input_text, voice)
+        if audio_path:
+            directory = os.path.dirname(audio_path)
+            filename = os.path.basename(audio_path)
+            return send_from_directory(directory=directory, path=filename, as_attachment=True)
+        else:
+            return jsonify({'error': 'Failed to generate audio'}), 500
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/query', methods=['POST'])
+def handle_query():
+    try:
+        data = request.get_json()
+        query = data.get('query', '').lower()
+
+        if not query:
+            app.logger.debug("No query provided in the request.")
+            return jsonify({'error': 'Empty query.'}), 400
+
+        result = lenox.convchain(query, session['session_id'])
+        app.logger.debug(f"Processed query with convchain, result: {result}")
+        return jsonify(result)
+    except Exception as e:
+        app.logger.error(f"Error processing request: {str(e)}")
+        return jsonify({'error': 'Failed to process request.'}), 500
+
+@app.route('/feedback', methods=['POST'])
+def handle_feedback():
+    feedback_data = request.get_json()
+    if 'query' not in feedback_data or 'feedback' not in feedback_data:
+        return jsonify({'error': 'Missing necessary feedback data.'}), 400
+
+    query = feedback_data['query']
+    feedback = feedback_data['feedback']
+
+    try:
+        lenox.teach_from_feedback(query, feedback, session['session_id'])
+        return jsonify({'message': 'Feedback processed successfully, and learning was updated.'})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/search', methods=['POST'])
+def search():
+    query = request.json.get('query')
+    if not query:
+        return jsonify({'error': 'Empty query.'}), 400
+    search_results = lenox.web_search_manager.aggregate_search_results(query)
+    app.logger.debug(f"Search results: {search_results}")
+    return jsonify({'type': 'search_results', 'results': search_results})
+
+@app.route('/create_visualization', methods=['POST'])
+def create_visualization():
+    try:
+        data = request.get_json()
+        visualization_result = lenox.handle_visualization_query(data['query'], session.get('session_id', 'default_session'))
+        
+        # Ensure proper formatting for the UI
+        if visualization_result['type'] == 'visualization':
+            return jsonify({"status": "success", "data": visualization_result['content']})
+        else:
+            return jsonify({"status": "error", "message": visualization_result['content']}), 400
+    except Exception as e:
+        app.logger.error(f"Failed to create visualization: {str(e)}")
+        return jsonify({'error': 'Failed to process visualization.'}), 500
+
+@socketio.on('connect')
+def on_connect():
+    emit('status', {'data': 'Connected to real-time updates'})
+
+@socketio.on('send_feedback')
+def on_feedback(data):
+    response = lenox.process_feedback(data['feedback'], session['session_id'])
+    emit('feedback_response', {'message': 'Feedback processed', 'data': response})
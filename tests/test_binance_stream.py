@@ -0,0 +1,172 @@
+import asyncio
+import json
+import threading
+import time
+import types
+
+import pytest
+import websockets
+
+import binance_stream
+from binance_stream import BinanceTickerStream
+
+
+class LocalStreamServer:
+    """A local stand-in for Binance's combined stream endpoint that sends frames on demand."""
+    def __init__(self):
+        self.paths = []
+        self._clients = set()
+        self._loop = asyncio.new_event_loop()
+        self._started = threading.Event()
+        self._thread = threading.Thread(target=self._main, daemon=True)
+
+    async def _handler(self, websocket):
+        self.paths.append(websocket.request.path)
+        self._clients.add(websocket)
+        try:
+            await websocket.wait_closed()
+        finally:
+            self._clients.discard(websocket)
+
+    async def _serve(self):
+        return await websockets.serve(self._handler, '127.0.0.1', 0)
+
+    def _main(self):
+        asyncio.set_event_loop(self._loop)
+        self._server = self._loop.run_until_complete(self._serve())
+        self.url = f"ws://127.0.0.1:{self._server.sockets[0].getsockname()[1]}/stream"
+        self._started.set()
+        self._loop.run_forever()
+
+    def start(self):
+        self._thread.start()
+        self._started.wait(5)
+        return self
+
+    def send(self, stream, data):
+        message = json.dumps({'stream': stream, 'data': data})
+
+        async def broadcast():
+            for client in list(self._clients):
+                await client.send(message)
+
+        asyncio.run_coroutine_threadsafe(broadcast(), self._loop).result(5)
+
+    def stop(self):
+        async def shutdown():
+            self._server.close()
+            await self._server.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result(5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
+
+
+def mini_ticker(symbol, close, event_time=1700000000000):
+    return {'e': '24hrMiniTicker', 'E': event_time, 's': symbol, 'c': str(close), 'o': '100.0',
+            'h': '110.0', 'l': '90.0', 'v': '1000.0', 'q': '100000.0'}
+
+
+def book_ticker(symbol, bid, ask):
+    return {'u': 1, 's': symbol, 'b': str(bid), 'B': '2.5', 'a': str(ask), 'A': '1.5'}
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture
+def server():
+    server = LocalStreamServer().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def stream(server):
+    stream = BinanceTickerStream(['btcusdt'], url=server.url, max_age=10)
+    assert stream.start()
+    assert stream.connected.wait(5)
+    assert wait_for(lambda: server._clients)
+    yield stream
+    stream.stop()
+
+
+def test_stream_subscribes_and_fills_table(server, stream):
+    assert server.paths == ['/stream?streams=btcusdt@miniTicker/btcusdt@bookTicker']
+    snapshots = []
+    stream.add_listener(snapshots.append)
+
+    server.send('btcusdt@bookTicker', book_ticker('BTCUSDT', 101.5, 101.6))
+    assert wait_for(lambda: 'BTCUSDT' in stream._table)
+    # Quotes alone carry no price yet
+    assert stream.get('BTCUSDT') is None
+
+    server.send('btcusdt@miniTicker', mini_ticker('BTCUSDT', 101.55))
+    assert wait_for(lambda: stream.get('btcusdt') is not None)
+    snapshot = stream.get('btcusdt')
+    assert snapshot.price == 101.55
+    assert (snapshot.open, snapshot.high, snapshot.low) == (100.0, 110.0, 90.0)
+    assert (snapshot.bid, snapshot.bid_qty, snapshot.ask, snapshot.ask_qty) == (101.5, 2.5, 101.6, 1.5)
+    assert snapshot.event_time == 1700000000000
+    assert [s.price for s in snapshots] == [101.55]
+    assert stream.get('ETHUSDT') is None
+
+
+def test_get_max_age_tracks_price_not_quotes(server, stream, monkeypatch):
+    clock = types.SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(binance_stream, 'time', types.SimpleNamespace(monotonic=lambda: clock.now))
+
+    server.send('btcusdt@miniTicker', mini_ticker('BTCUSDT', 100.0))
+    assert wait_for(lambda: stream.get('BTCUSDT') is not None)
+    clock.now += 5
+    assert stream.get('BTCUSDT').price == 100.0
+
+    # Quotes keep arriving after the mini-ticker stopped: the price still ages out
+    clock.now += 6
+    server.send('btcusdt@bookTicker', book_ticker('BTCUSDT', 99.0, 99.1))
+    assert wait_for(lambda: stream._table['BTCUSDT'].bid == 99.0)
+    assert stream.get('BTCUSDT') is None
+    assert stream.get('BTCUSDT', max_age=20).bid == 99.0
+    assert stream.get('BTCUSDT', max_age=0) is not None  # 0 disables the age check
+
+    server.send('btcusdt@miniTicker', mini_ticker('BTCUSDT', 99.05))
+    assert wait_for(lambda: stream.get('BTCUSDT') is not None)
+    assert stream.get('BTCUSDT').price == 99.05
+
+
+def test_get_binance_ticker_falls_back_to_rest(server, stream, monkeypatch):
+    monkeypatch.setenv('BINANCE_API_KEY', 'test-key')
+    monkeypatch.setenv('BINANCE_API_SECRET', 'test-secret')
+    binance_tools = pytest.importorskip('binance_tools')
+    requests = []
+
+    def make_request(endpoint, parameters=None):
+        requests.append((endpoint, parameters))
+        return {'symbol': parameters['symbol'], 'price': '2000.00000000'}
+
+    monkeypatch.setattr(binance_tools, 'ticker_stream', stream)
+    monkeypatch.setattr(binance_tools.binance_api, 'make_request', make_request)
+
+    server.send('btcusdt@miniTicker', mini_ticker('BTCUSDT', 101.0))
+    assert wait_for(lambda: stream.get('BTCUSDT') is not None)
+
+    # Same shape as Binance's REST answer, whichever path serves it
+    result = binance_tools.get_binance_ticker.invoke({'symbol': 'BTCUSDT'})
+    assert result == {'symbol': 'BTCUSDT', 'price': '101.00000000'}
+    assert requests == []
+
+    # Not subscribed: served from REST
+    result = binance_tools.get_binance_ticker.invoke({'symbol': 'ETHUSDT'})
+    assert result == {'symbol': 'ETHUSDT', 'price': '2000.00000000'}
+    assert requests == [('api/v3/ticker/price', {'symbol': 'ETHUSDT'})]
+
+    # Subscribed but stale: served from REST too
+    stream.max_age = 1e-9
+    binance_tools.get_binance_ticker.invoke({'symbol': 'BTCUSDT'})
+    assert requests[-1] == ('api/v3/ticker/price', {'symbol': 'BTCUSDT'})
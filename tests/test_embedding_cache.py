@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from embedding_cache import CachedEmbeddings, HashEmbeddings
+
+
+class CountingEmbeddings(HashEmbeddings):
+    def __init__(self):
+        super().__init__(dimensions=16)
+        self.embedded = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return super().embed_documents(texts)
+
+
+@pytest.fixture
+def backend():
+    return CountingEmbeddings()
+
+
+def test_hits_skip_the_backend(tmp_path, backend):
+    cache = CachedEmbeddings(backend, str(tmp_path))
+    first = cache.embed_documents(['btc rally', 'eth merge', 'btc rally'])
+    assert backend.embedded == ['btc rally', 'eth merge']
+    assert cache.embed_documents(['eth merge']) == [first[1]]
+    assert backend.embedded == ['btc rally', 'eth merge']
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['cached_vectors']) == (2, 2, 2)
+
+
+def test_instances_sharing_a_directory_keep_their_rows_apart(tmp_path, backend):
+    expected = HashEmbeddings(dimensions=16)
+    first = CachedEmbeddings(backend, str(tmp_path))
+    second = CachedEmbeddings(backend, str(tmp_path))
+    first.embed_documents(['bitcoin halving'])
+    second.embed_documents(['solana outage'])
+    # Enough new rows to grow the matrix file past what `first` has mapped
+    texts = [f"doge post {i}" for i in range(3000)]
+    second.embed_documents(texts)
+    first.embed_documents(['ether staking'])
+
+    fresh = CachedEmbeddings(backend, str(tmp_path))
+    calls = len(backend.embedded)
+    for text in ['bitcoin halving', 'solana outage', 'ether staking', texts[0], texts[-1]]:
+        np.testing.assert_allclose(fresh.embed_query(text), expected.embed_query(text), rtol=1e-6)
+        np.testing.assert_allclose(first.embed_query(text), expected.embed_query(text), rtol=1e-6)
+    assert len(backend.embedded) == calls
+    assert fresh.stats()['cached_vectors'] == 3003
+
+
+def test_reopened_cache_serves_stored_vectors(tmp_path, backend):
+    vector = CachedEmbeddings(backend, str(tmp_path)).embed_query('xrp ruling')
+    reopened = CachedEmbeddings(CountingEmbeddings(), str(tmp_path))
+    assert reopened.embed_query('xrp ruling') == vector
+    assert reopened.underlying.embedded == []
@@ -0,0 +1,142 @@
+import threading
+import time
+
+import pytest
+
+from web_search import SearchResult, WebSearchManager, normalize_url
+
+
+class StubBackend:
+    """Returns canned results, optionally after blocking until released or failing."""
+    def __init__(self, name, urls=(), delay=0.0, error=None):
+        self.name = name
+        self.urls = list(urls)
+        self.delay = delay
+        self.error = error
+        self.calls = []
+        self.release = threading.Event()
+        if not delay:
+            self.release.set()
+
+    def __call__(self, query):
+        self.calls.append(query)
+        self.release.wait(self.delay or None)
+        if self.error is not None:
+            raise self.error
+        return [SearchResult(f"{self.name} {i}", url, f"{self.name} snippet {i}", self.name)
+                for i, url in enumerate(self.urls)]
+
+
+@pytest.fixture
+def backends():
+    fast = StubBackend('fast', ['https://a.example/1', 'https://a.example/2'])
+    slow = StubBackend('slow', ['https://b.example/1'], delay=10)
+    yield fast, slow
+    slow.release.set()
+
+
+def test_deadline_returns_what_arrived(backends):
+    fast, slow = backends
+    manager = WebSearchManager({'fast': fast, 'slow': slow}, deadline=0.2)
+    start = time.monotonic()
+    results, status = manager.search('btc price')
+    assert time.monotonic() - start < 2
+    assert [result.url for result in results] == ['https://a.example/1', 'https://a.example/2']
+    assert status == {'fast': 'ok', 'slow': 'timeout'}
+
+
+def test_waits_for_every_backend_within_the_deadline():
+    first = StubBackend('first', ['https://a.example/1'])
+    second = StubBackend('second', ['https://b.example/1'], delay=0.1)
+    second.release.clear()
+    threading.Timer(0.1, second.release.set).start()
+    results, status = WebSearchManager({'first': first, 'second': second}, deadline=5).search('eth')
+    assert [result.source for result in results] == ['first', 'second']
+    assert status == {'first': 'ok', 'second': 'ok'}
+
+
+def test_hedge_returns_first_backend_with_results(backends):
+    fast, slow = backends
+    empty = StubBackend('empty')
+    manager = WebSearchManager({'empty': empty, 'slow': slow, 'fast': fast}, deadline=5, hedge=True)
+    start = time.monotonic()
+    results, status = manager.search('btc price')
+    assert time.monotonic() - start < 2
+    assert {result.source for result in results} == {'fast'}
+    # An empty answer does not win the hedge
+    assert status == {'empty': 'empty', 'slow': 'hedged', 'fast': 'ok'}
+
+
+def test_hedge_can_be_enabled_per_call(backends):
+    fast, slow = backends
+    manager = WebSearchManager({'fast': fast, 'slow': slow}, deadline=0.3)
+    _, status = manager.search('sol', hedge=True)
+    assert status['slow'] == 'hedged'
+
+
+def test_results_deduplicated_by_normalized_url():
+    first = StubBackend('first', ['http://www.a.example/news/?utm_source=x&id=7', 'https://c.example/'])
+    second = StubBackend('second', ['https://a.example/news?id=7#top', 'https://b.example/x'])
+    manager = WebSearchManager({'first': first, 'second': second}, deadline=5, max_results=10)
+    results, _ = manager.search('btc news')
+    # Interleaved by rank in backend order, keeping the first copy of each URL
+    assert [(result.source, result.url) for result in results] == [
+        ('first', 'http://www.a.example/news/?utm_source=x&id=7'),
+        ('first', 'https://c.example/'),
+        ('second', 'https://b.example/x'),
+    ]
+    assert normalize_url('HTTPS://WWW.A.example/news/?id=7&fbclid=1') == 'a.example/news?id=7'
+
+    limited = WebSearchManager({'first': first, 'second': second}, deadline=5, max_results=2)
+    assert len(limited.search('btc news')[0]) == 2
+
+
+def test_complete_results_cached_per_normalized_query():
+    first = StubBackend('first', ['https://a.example/1'])
+    second = StubBackend('second', [])
+    manager = WebSearchManager({'first': first, 'second': second}, deadline=5, cache_ttl=0.3)
+    outcome = manager.search('BTC  price')
+    assert manager.search('btc price') == outcome
+    assert len(first.calls) == len(second.calls) == 1
+    time.sleep(0.4)
+    manager.search('btc price')
+    assert len(first.calls) == 2
+
+
+def test_partial_results_expire_quickly(backends):
+    fast, slow = backends
+    manager = WebSearchManager({'fast': fast, 'slow': slow}, deadline=0.2, cache_ttl=60, partial_ttl=0.3)
+    _, status = manager.search('btc price')
+    assert status['slow'] == 'timeout'
+    manager.search('btc price')
+    assert len(fast.calls) == 1
+
+    # Once the slow backend recovers, the query is answered in full and cached for cache_ttl
+    slow.release.set()
+    time.sleep(0.4)
+    results, status = manager.search('btc price')
+    assert status == {'fast': 'ok', 'slow': 'ok'}
+    assert 'https://b.example/1' in [result.url for result in results]
+    manager.search('btc price')
+    assert len(fast.calls) == 2
+
+
+def test_failed_backend_reported_and_not_cached_for_long():
+    broken = StubBackend('broken', error=RuntimeError('rate limited'))
+    fast = StubBackend('fast', ['https://a.example/1'])
+    manager = WebSearchManager({'broken': broken, 'fast': fast}, deadline=5, partial_ttl=0.2)
+    results, status = manager.search('doge')
+    assert status == {'broken': 'error: rate limited', 'fast': 'ok'}
+    assert len(results) == 1
+    assert 'Unavailable: broken (error: rate limited)' in manager.aggregate_search_results('doge')
+    time.sleep(0.3)
+    manager.search('doge')
+    assert len(broken.calls) == 2
+
+
+def test_no_results_not_cached():
+    empty = StubBackend('empty')
+    manager = WebSearchManager({'empty': empty}, deadline=5)
+    assert manager.search('nothing') == ([], {'empty': 'empty'})
+    manager.search('nothing')
+    assert len(empty.calls) == 2
@@ -0,0 +1,72 @@
+import pytest
+
+pytest.importorskip('langchain_community.vectorstores')
+pytest.importorskip('chromadb')
+
+from langchain_core.documents import Document  # noqa: E402
+
+from embedding_cache import HashEmbeddings  # noqa: E402
+from youtube_index import VideoIndex, embeddings_tag  # noqa: E402
+
+URL = 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'
+TRANSCRIPT = [
+    Document(page_content="Bitcoin halving cuts the block subsidy in half every four years. " * 6,
+             metadata={'source': 'dQw4w9WgXcQ', 'title': 'Crypto explained'}),
+    Document(page_content="Ethereum staking pays validators a yield for securing the network. " * 6,
+             metadata={'source': 'dQw4w9WgXcQ', 'title': 'Crypto explained'}),
+]
+
+
+class CountingEmbeddings(HashEmbeddings):
+    def __init__(self):
+        super().__init__(dimensions=64)
+        self.embedded = 0
+
+    def embed_documents(self, texts):
+        self.embedded += len(texts)
+        return super().embed_documents(texts)
+
+
+class Loader:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, url):
+        self.calls += 1
+        return TRANSCRIPT
+
+
+def make_index(tmp_path, loader, embeddings):
+    return VideoIndex(str(tmp_path), loader, embeddings=embeddings, chunk_size=200, chunk_overlap=0)
+
+
+def test_follow_up_questions_and_restarts_reuse_the_index(tmp_path):
+    loader, embeddings = Loader(), CountingEmbeddings()
+    index = make_index(tmp_path, loader, embeddings)
+    [hit] = index.retrieve(URL, 'what does staking pay validators', k=1)
+    assert 'staking' in hit.page_content
+    chunks = embeddings.embedded
+    assert chunks > 2 and loader.calls == 1
+
+    index.retrieve(URL, 'when is the halving', k=1)
+    restarted = make_index(tmp_path, Loader(), embeddings)
+    [hit] = restarted.retrieve(URL, 'when is the bitcoin halving', k=1)
+    assert 'halving' in hit.page_content
+    assert embeddings.embedded == chunks
+    assert restarted.loader.calls == 0
+
+
+def test_half_written_collection_is_indexed_again(tmp_path):
+    from langchain_community.vectorstores import Chroma
+
+    loader, embeddings = Loader(), CountingEmbeddings()
+    index = make_index(tmp_path, loader, embeddings)
+    name = f"yt_dQw4w9WgXcQ_{embeddings_tag(embeddings)}"
+    # A crash after the first chunk was added, before the index was marked complete
+    partial = Chroma(collection_name=name, embedding_function=embeddings,
+                     persist_directory=str(tmp_path / 'chroma'))
+    partial.add_documents(index._split(TRANSCRIPT)[:1], ids=['dQw4w9WgXcQ:0'])
+
+    store = index.store(URL)
+    assert len(store.get()['ids']) == len(index._split(TRANSCRIPT))
+    assert loader.calls == 1
@@ -1,5 +1,5 @@
 # Continue to import other necessary functions as before
-from reddit_tools import get_reddit_data, count_mentions, analyze_sentiment, find_trending_topics
+from reddit_tools import get_reddit_data, count_mentions, find_mentions, analyze_sentiment, find_trending_topics
 from cryptocompare_tools import (
     get_current_price, get_top_volume_symbols,
     get_latest_social_stats, get_historical_social_stats, list_news_feeds_and_categories,
@@ -9,13 +9,29 @@ from coingecko_tools import (
     get_market_data, get_historical_market_data, get_ohlc,
     get_trending_cryptos, calculate_macd, get_exchange_rates, calculate_rsi
 )
-from youtube_tools import search_youtube, process_youtube_video, query_youtube_video
+from youtube_tools import search_youtube, search_youtube_batch, process_youtube_video, query_youtube_video
 from coinpaprika_tools import get_coin_details, get_coin_tags, get_market_overview, get_ticker_info
-from cryptopanic_tools import get_latest_news, get_news_sources, get_last_news_title
+from cryptopanic_tools import get_latest_news, get_news_sources, get_last_news_title, search_news
 from coinmarketcap_tools import get_latest_listings, get_crypto_metadata, get_global_metrics
 from fearandgreed_tools import get_fear_and_greed_index
-from whale_alert_tools import get_whale_alert_status, get_transaction_by_hash, get_recent_transactions
-from binance_tools import get_binance_ticker, get_binance_order_book, get_binance_recent_trades
+from whale_alert_tools import get_whale_alert_status, get_transaction_by_hash, get_recent_transactions, get_whale_flows
+from binance_tools import get_binance_ticker, get_binance_order_book, get_binance_recent_trades, get_binance_liquidity, get_binance_trade_stats, get_binance_live_indicators
+from screener_tools import screen_market, ascreen_market
+from cryptocompare_tools import (
+    aget_current_price, aget_top_volume_symbols,
+    aget_latest_social_stats, aget_historical_social_stats, alist_news_feeds_and_categories,
+    aget_latest_trading_signals, aget_top_exchanges_by_volume
+)
+from coingecko_tools import (
+    aget_market_data, aget_historical_market_data, aget_ohlc,
+    aget_trending_cryptos, aget_exchange_rates
+)
+from coinpaprika_tools import aget_coin_details, aget_coin_tags, aget_market_overview, aget_ticker_info
+from cryptopanic_tools import aget_latest_news, aget_news_sources, aget_last_news_title
+from coinmarketcap_tools import aget_latest_listings, aget_crypto_metadata, aget_global_metrics
+from fearandgreed_tools import aget_fear_and_greed_index
+from whale_alert_tools import aget_whale_alert_status, aget_transaction_by_hash, aget_recent_transactions
+from binance_tools import aget_binance_ticker, aget_binance_order_book, aget_binance_recent_trades
 
 def import_tools():
     """
@@ -45,11 +61,13 @@ def import_tools():
         # Reddit Tools
         get_reddit_data,
         count_mentions,
+        find_mentions,
         analyze_sentiment,
         find_trending_topics,
 
         # YouTube Tools
         search_youtube,
+        search_youtube_batch,
         process_youtube_video,
         query_youtube_video,
 
@@ -63,6 +81,7 @@ def import_tools():
         get_latest_news,
         get_news_sources,
         get_last_news_title,
+        search_news,
 
         # CoinMarketCap Tools
         get_latest_listings,
@@ -76,11 +95,93 @@ def import_tools():
         get_whale_alert_status,
         get_transaction_by_hash,
         get_recent_transactions,
+        get_whale_flows,
 
         # Binance Tools
         get_binance_ticker,
         get_binance_order_book,
         get_binance_recent_trades,
+        get_binance_liquidity,
+        get_binance_trade_stats,
+        get_binance_live_indicators,
+
+        # Screener Tools
+        screen_market,
+    ]
+
+    return _attach_coroutines(tools, import_async_tools())
+
+
+def _attach_coroutines(tools, async_tools):
+    """
+    Give each tool its a-prefixed async counterpart as its coroutine, so an agent run with
+    `ainvoke` awaits it on the event loop instead of running the blocking function in a thread.
+    """
+    coroutines = {tool.name[1:]: tool.coroutine for tool in async_tools if tool.coroutine is not None}
+    for tool in tools:
+        if tool.name in coroutines:
+            tool.coroutine = coroutines[tool.name]
+    return tools
+
+
+def import_async_tools():
+    """
+    Collects the coroutine-based counterparts of the network-bound tools.
+    They share a single aiohttp connection pool (see http_client.py), so one event loop can
+    serve many agent sessions concurrently. CPU-only tools such as calculate_rsi/calculate_macd
+    have no async variant and are listed as-is. `import_tools` attaches these coroutines to
+    the synchronous tools it returns.
+    """
+    tools = [
+        # CryptoCompare Tools
+        aget_current_price,
+        aget_top_volume_symbols,
+        aget_latest_social_stats,
+        aget_historical_social_stats,
+        alist_news_feeds_and_categories,
+        aget_latest_trading_signals,
+        aget_top_exchanges_by_volume,
+
+        # CoinGecko Tools
+        aget_market_data,
+        aget_historical_market_data,
+        aget_ohlc,
+        aget_trending_cryptos,
+        calculate_macd,
+        aget_exchange_rates,
+        calculate_rsi,
+
+        # CoinPaprika Tools
+        aget_coin_details,
+        aget_coin_tags,
+        aget_market_overview,
+        aget_ticker_info,
+
+        # CryptoPanic Tools
+        aget_latest_news,
+        aget_news_sources,
+        aget_last_news_title,
+
+        # CoinMarketCap Tools
+        aget_latest_listings,
+        aget_crypto_metadata,
+        aget_global_metrics,
+
+        # Fear and Greed Index Tools
+        aget_fear_and_greed_index,
+
+        # Whale Alert Tools
+        aget_whale_alert_status,
+        aget_transaction_by_hash,
+        aget_recent_transactions,
+
+        # Binance Tools
+        aget_binance_ticker,
+        aget_binance_order_book,
+        aget_binance_recent_trades,
+
+        # Screener Tools
+        ascreen_market,
     ]
 
     return tools
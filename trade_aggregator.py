@@ -0,0 +1,258 @@
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from binance_stream import BinanceStream, BINANCE_STREAM_URL
+
+BAR_FIELDS = ('start', 'end', 'open', 'high', 'low', 'close', 'volume', 'quote_volume', 'buy_volume', 'trades')
+
+
+class RingBuffer:
+    """Fixed-capacity float64 ring of rows with `width` columns; appends are O(1)."""
+    def __init__(self, capacity: int, width: int):
+        self.capacity = capacity
+        self._data = np.zeros((capacity, width))
+        self._next = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, row) -> Optional[np.ndarray]:
+        """Append `row`; returns the evicted row when the buffer was full, else None."""
+        evicted = self._data[self._next].copy() if self._size == self.capacity else None
+        self._data[self._next] = row
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        return evicted
+
+    def first(self) -> np.ndarray:
+        return self._data[(self._next - self._size) % self.capacity]
+
+    def last(self) -> np.ndarray:
+        return self._data[(self._next - 1) % self.capacity]
+
+    def values(self) -> np.ndarray:
+        """Rows in insertion order (oldest first)."""
+        if self._size < self.capacity:
+            return self._data[:self._size].copy()
+        return np.concatenate((self._data[self._next:], self._data[:self._next]))
+
+
+class BarBuilder:
+    """
+    Builds time, volume or dollar bars from a trade stream.
+
+    `kind='time'` closes a bar when a trade falls into a new `threshold`-second bucket;
+    `'volume'` and `'dollar'` close once the bar's base volume / quote notional reaches
+    `threshold`. Closed bars are kept in a ring buffer of `capacity` rows.
+    """
+    def __init__(self, kind: str, threshold: float, capacity: int = 1000):
+        if kind not in ('time', 'volume', 'dollar'):
+            raise ValueError(f"Unsupported bar type '{kind}'. Supported types: time, volume, dollar.")
+        self.kind = kind
+        self.threshold = threshold
+        self.closed = RingBuffer(capacity, len(BAR_FIELDS))
+        self._bar = None
+        self._bucket = None
+
+    def update(self, timestamp: int, price: float, qty: float, is_buy: bool) -> None:
+        if self.kind == 'time':
+            bucket = timestamp // int(self.threshold * 1000)
+            if self._bar is not None and bucket != self._bucket:
+                self._close()
+            self._bucket = bucket
+        bar = self._bar
+        if bar is None:
+            start = self._bucket * int(self.threshold * 1000) if self.kind == 'time' else timestamp
+            self._bar = [start, timestamp, price, price, price, price, qty, price * qty, qty if is_buy else 0.0, 1]
+        else:
+            bar[1] = timestamp
+            if price > bar[3]:
+                bar[3] = price
+            if price < bar[4]:
+                bar[4] = price
+            bar[5] = price
+            bar[6] += qty
+            bar[7] += price * qty
+            if is_buy:
+                bar[8] += qty
+            bar[9] += 1
+        if self.kind == 'volume' and self._bar[6] >= self.threshold:
+            self._close()
+        elif self.kind == 'dollar' and self._bar[7] >= self.threshold:
+            self._close()
+
+    def _close(self) -> None:
+        self.closed.append(self._bar)
+        self._bar = None
+
+    def bars(self, include_open: bool = True) -> np.ndarray:
+        """Closed bars (plus the in-progress one) as an array with BAR_FIELDS columns."""
+        bars = self.closed.values()
+        if include_open and self._bar is not None:
+            bars = np.vstack((bars, np.asarray(self._bar, dtype=float)))
+        return bars
+
+
+class RollingTradeStats:
+    """
+    VWAP, buy/sell volume and trade-rate over the last `window` trades.
+
+    Running sums are adjusted on every append/evict so each trade is O(1); they are
+    recomputed from the buffer once per `window` evictions to bound float drift.
+    """
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self._trades = RingBuffer(window, 4)  # timestamp, price, qty, is_buy
+        self._evictions = 0
+        self._reset_sums()
+
+    def _reset_sums(self):
+        self.notional = 0.0
+        self.volume = 0.0
+        self.buy_volume = 0.0
+
+    def update(self, timestamp: int, price: float, qty: float, is_buy: bool) -> None:
+        evicted = self._trades.append((timestamp, price, qty, 1.0 if is_buy else 0.0))
+        self.notional += price * qty
+        self.volume += qty
+        if is_buy:
+            self.buy_volume += qty
+        if evicted is not None:
+            self._evictions += 1
+            if self._evictions >= self.window:
+                self._evictions = 0
+                values = self._trades.values()
+                self.notional = float(values[:, 1] @ values[:, 2])
+                self.volume = float(values[:, 2].sum())
+                self.buy_volume = float(values[:, 2] @ values[:, 3])
+            else:
+                self.notional -= evicted[1] * evicted[2]
+                self.volume -= evicted[2]
+                if evicted[3]:
+                    self.buy_volume -= evicted[2]
+
+    def snapshot(self) -> dict:
+        count = len(self._trades)
+        if not count:
+            return {'trades': 0}
+        sell_volume = self.volume - self.buy_volume
+        span = (self._trades.last()[0] - self._trades.first()[0]) / 1000
+        return {
+            'trades': count,
+            'vwap': self.notional / self.volume if self.volume else None,
+            'volume': self.volume,
+            'buy_volume': self.buy_volume,
+            'sell_volume': sell_volume,
+            'buy_sell_ratio': self.buy_volume / sell_volume if sell_volume else None,
+            'avg_trade_size': self.volume / count,
+            'trades_per_second': count / span if span > 0 else None,
+            'last_price': float(self._trades.last()[1]),
+        }
+
+
+class TradeAggregator:
+    """
+    Incremental per-symbol trade aggregation: time/volume/dollar bars plus rolling stats.
+
+    Accepts Binance REST trades (`api/v3/trades`) or `aggTrade` stream events; trades with an
+    id at or below the last one seen are ignored, so overlapping REST polls are safe. Feed
+    one source per aggregator, since REST trade ids and aggTrade ids are different sequences.
+    """
+    def __init__(self, symbol: str, time_intervals=(60,), volume_threshold: Optional[float] = None,
+                 dollar_threshold: Optional[float] = None, bar_capacity: int = 1000, stats_window: int = 1000):
+        self.symbol = symbol.upper()
+        self.builders: Dict[str, BarBuilder] = {}
+        for interval in time_intervals:
+            self.builders[f"time_{interval}"] = BarBuilder('time', interval, bar_capacity)
+        if volume_threshold:
+            self.builders['volume'] = BarBuilder('volume', volume_threshold, bar_capacity)
+        if dollar_threshold:
+            self.builders['dollar'] = BarBuilder('dollar', dollar_threshold, bar_capacity)
+        self.stats = RollingTradeStats(stats_window)
+        self.last_trade_id: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def add_trade(self, timestamp: int, price: float, qty: float, is_buy: bool, trade_id: Optional[int] = None) -> bool:
+        with self._lock:
+            if trade_id is not None:
+                if self.last_trade_id is not None and trade_id <= self.last_trade_id:
+                    return False
+                self.last_trade_id = trade_id
+            for builder in self.builders.values():
+                builder.update(timestamp, price, qty, is_buy)
+            self.stats.update(timestamp, price, qty, is_buy)
+            return True
+
+    def add_binance_trade(self, trade: dict) -> bool:
+        """Add a REST trade or an `aggTrade` event. `isBuyerMaker`/`m` means the taker sold."""
+        if trade.get('e') == 'aggTrade':
+            return self.add_trade(trade['T'], float(trade['p']), float(trade['q']), not trade['m'], trade['a'])
+        return self.add_trade(trade['time'], float(trade['price']), float(trade['qty']),
+                              not trade['isBuyerMaker'], trade.get('id'))
+
+    def add_binance_trades(self, trades: List[dict]) -> int:
+        return sum(self.add_binance_trade(trade) for trade in trades)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return self.stats.snapshot()
+
+    def bars(self, key: str = 'time_60', include_open: bool = True) -> np.ndarray:
+        with self._lock:
+            return self.builders[key].bars(include_open)
+
+    def to_frame(self, key: str = 'time_60', include_open: bool = True) -> pd.DataFrame:
+        """Bars as a DataFrame with Date/Open/High/Low/Close/Volume columns for candlestick charts."""
+        bars = self.bars(key, include_open)
+        frame = pd.DataFrame(bars, columns=BAR_FIELDS)
+        return pd.DataFrame({
+            'Date': pd.to_datetime(frame['start'], unit='ms'),
+            'Open': frame['open'],
+            'High': frame['high'],
+            'Low': frame['low'],
+            'Close': frame['close'],
+            'Volume': frame['volume'],
+            'BuyVolume': frame['buy_volume'],
+            'Trades': frame['trades'].astype(int),
+        })
+
+
+class BinanceTradeStream(BinanceStream):
+    """
+    Feeds `TradeAggregator`s from the `<symbol>@aggTrade` streams. Listeners registered with
+    `add_listener` receive each event the symbol's aggregator accepted (duplicates are skipped).
+    """
+    def __init__(self, aggregators: Dict[str, TradeAggregator], url: str = BINANCE_STREAM_URL, **kwargs):
+        super().__init__(url=url, **kwargs)
+        self.aggregators = aggregators
+        self._listeners = []
+
+    def add_listener(self, callback: Callable[[str, dict], None]) -> None:
+        """Register `callback(symbol, event)`, called on the stream thread after every new trade."""
+        self._listeners.append(callback)
+
+    def stream_names(self) -> List[str]:
+        return [f"{symbol.lower()}@aggTrade" for symbol in self.aggregators]
+
+    def on_message(self, stream: str, data: dict) -> None:
+        aggregator = self.aggregators.get(data.get('s'))
+        if aggregator is not None and aggregator.add_binance_trade(data):
+            for callback in self._listeners:
+                try:
+                    callback(aggregator.symbol, data)
+                except Exception as e:
+                    logging.error(f"Trade listener failed: {e}")
+
+
+def poll_trades(aggregator: TradeAggregator, fetcher: Callable[[str, int], Optional[list]], limit: int = 1000) -> int:
+    """Feed the latest REST trades into `aggregator`; returns how many were new."""
+    trades = fetcher(aggregator.symbol, limit)
+    if not trades:
+        logging.warning(f"No trades returned for {aggregator.symbol}")
+        return 0
+    return aggregator.add_binance_trades(trades)
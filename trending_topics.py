@@ -0,0 +1,216 @@
+import heapq
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from crypto_analysis.text_normalization import WORD_PATTERN, english_stopwords
+
+# Common names folded onto their ticker so "bitcoin", "btc" and "$BTC" count as one topic
+TICKER_ALIASES = {
+    'bitcoin': 'BTC', 'btc': 'BTC',
+    'ethereum': 'ETH', 'eth': 'ETH', 'ether': 'ETH',
+    'solana': 'SOL', 'sol': 'SOL',
+    'ripple': 'XRP', 'xrp': 'XRP',
+    'cardano': 'ADA', 'ada': 'ADA',
+    'dogecoin': 'DOGE', 'doge': 'DOGE',
+    'binance': 'BNB', 'bnb': 'BNB',
+    'litecoin': 'LTC', 'ltc': 'LTC',
+    'polkadot': 'DOT',
+    'chainlink': 'LINK',
+    'avalanche': 'AVAX', 'avax': 'AVAX',
+    'tether': 'USDT', 'usdt': 'USDT',
+    'usdc': 'USDC',
+}
+
+REDDIT_STOPWORDS = frozenset({
+    'http', 'https', 'www', 'com', 'reddit', 'amp', 'gt', 'lt', 'deleted', 'removed',
+    'im', 'dont', 'get', 'got', 'like', 'one', 'would', 'could', 'also', 'even',
+    'still', 'much', 'really', 'think', 'know', 'people', 'make', 'going', 'want', 'see', 'say',
+})
+
+
+@lru_cache(maxsize=1)
+def stopword_set() -> FrozenSet[str]:
+    """English NLTK stopwords plus Reddit noise, loaded once per process."""
+    return english_stopwords() | REDDIT_STOPWORDS
+
+
+def extract_terms(text: str, ngram: int = 2) -> List[str]:
+    """
+    Topic terms of `text`: tickers (cashtags and aliases, upper-cased), other non-stopword
+    words, and n-grams of up to `ngram` adjacent kept words. Each term is returned once.
+    """
+    stop = stopword_set()
+    words = []
+    for token in WORD_PATTERN.findall((text or '').lower()):
+        cashtag = token[0] == '$'
+        token = token.lstrip('$')
+        if len(token) < 2:
+            words.append(None)
+            continue
+        ticker = TICKER_ALIASES.get(token)
+        if ticker is not None or (cashtag and token.isalpha() and len(token) <= 6):
+            words.append(ticker or token.upper())
+        elif token in stop or token.isdigit():
+            words.append(None)  # breaks n-grams across stopwords
+        else:
+            words.append(token)
+    terms = dict.fromkeys(word for word in words if word)
+    for n in range(2, ngram + 1):
+        for i in range(len(words) - n + 1):
+            gram = words[i:i + n]
+            if all(gram) and len(set(gram)) == n:
+                terms[' '.join(gram)] = None
+    return list(terms)
+
+
+class DecayedSpaceSaving:
+    """
+    Space-Saving heavy hitters over exponentially time-decayed counts, in bounded memory.
+
+    Counts use forward decay: an occurrence at time `t` adds `2 ** ((t - landmark) / half_life)`
+    and a count is read back by scaling with the current time, so decay never touches
+    stored entries and the Space-Saving order is unaffected by the passage of time. The
+    landmark is moved forward (rescaling the `capacity` entries) before weights overflow.
+    Each entry also carries a count decayed with `short_half_life`; the ratio of the two
+    rates gives a term's velocity (>1 means mentions are accelerating).
+    """
+    RENORMALIZE_EXPONENT = 60.0
+
+    def __init__(self, capacity: int = 2000, half_life: float = 86400, short_half_life: float = 3600):
+        self.capacity = capacity
+        self.half_life = half_life
+        self.short_half_life = short_half_life
+        self.landmark: Optional[float] = None
+        # term -> [long weight, short weight, error (long weight inherited on eviction)]
+        self._entries: Dict[str, List[float]] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _weights(self, timestamp: float) -> Tuple[float, float]:
+        if self.landmark is None:
+            self.landmark = timestamp
+        elapsed = timestamp - self.landmark
+        if elapsed / self.short_half_life > self.RENORMALIZE_EXPONENT:
+            self._renormalize(timestamp)
+            elapsed = 0.0
+        return 2.0 ** (elapsed / self.half_life), 2.0 ** (elapsed / self.short_half_life)
+
+    def _renormalize(self, landmark: float) -> None:
+        shift = landmark - self.landmark
+        long_scale = 2.0 ** (-shift / self.half_life)
+        short_scale = 2.0 ** (-shift / self.short_half_life)
+        for entry in self._entries.values():
+            entry[0] *= long_scale
+            entry[1] *= short_scale
+            entry[2] *= long_scale
+        self.landmark = landmark
+        self._rebuild_heap()
+
+    def _rebuild_heap(self) -> None:
+        self._heap = [(entry[0], term) for term, entry in self._entries.items()]
+        heapq.heapify(self._heap)
+
+    def _pop_min(self) -> Tuple[str, List[float]]:
+        while True:
+            weight, term = heapq.heappop(self._heap)
+            entry = self._entries.get(term)
+            if entry is not None and entry[0] == weight:
+                return term, self._entries.pop(term)
+
+    def add(self, terms: Iterable[str], timestamp: Optional[float] = None) -> None:
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            long_weight, short_weight = self._weights(timestamp)
+            for term in terms:
+                entry = self._entries.get(term)
+                if entry is None:
+                    if len(self._entries) >= self.capacity:
+                        # Space-Saving: the newcomer inherits the evicted minimum as its error bound
+                        _, evicted = self._pop_min()
+                        entry = [evicted[0], evicted[1], evicted[0]]
+                    else:
+                        entry = [0.0, 0.0, 0.0]
+                    self._entries[term] = entry
+                entry[0] += long_weight
+                entry[1] += short_weight
+                heapq.heappush(self._heap, (entry[0], term))
+            # Stale heap entries from lazy updates are bounded by a periodic rebuild
+            if len(self._heap) > 4 * self.capacity:
+                self._rebuild_heap()
+
+    def top(self, n: int = 10, now: Optional[float] = None, by: str = 'long') -> List[Dict[str, float]]:
+        """
+        The `n` heaviest terms with their decayed `count`, guaranteed count (`count - error`),
+        `short_count` and `velocity`, ranked by the long (`by='long'`) or short decayed count.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            if self.landmark is None:
+                return []
+            long_scale = 2.0 ** (-(now - self.landmark) / self.half_life)
+            short_scale = 2.0 ** (-(now - self.landmark) / self.short_half_life)
+            column = 1 if by == 'short' else 0
+            ranked = heapq.nlargest(n, self._entries.items(), key=lambda item: item[1][column])
+        results = []
+        for term, (weight, short_weight, error) in ranked:
+            count, short_count = weight * long_scale, short_weight * short_scale
+            long_rate = count / self.half_life
+            short_rate = short_count / self.short_half_life
+            results.append({
+                'term': term,
+                'count': count,
+                'guaranteed': count - error * long_scale,
+                'short_count': short_count,
+                'velocity': short_rate / long_rate if long_rate else 0.0,
+            })
+        return results
+
+
+class TrendingTopics:
+    """Per-source `DecayedSpaceSaving` trackers fed with raw texts, merged at query time."""
+    def __init__(self, capacity: int = 2000, half_life: float = 86400, short_half_life: float = 3600, ngram: int = 2):
+        self.capacity = capacity
+        self.half_life = half_life
+        self.short_half_life = short_half_life
+        self.ngram = ngram
+        self._trackers: Dict[str, DecayedSpaceSaving] = {}
+        self._lock = threading.Lock()
+
+    def tracker(self, source: str) -> DecayedSpaceSaving:
+        with self._lock:
+            tracker = self._trackers.get(source)
+            if tracker is None:
+                tracker = self._trackers[source] = DecayedSpaceSaving(self.capacity, self.half_life, self.short_half_life)
+            return tracker
+
+    def add_text(self, source: str, text: str, timestamp: Optional[float] = None) -> None:
+        terms = extract_terms(text, self.ngram)
+        if terms:
+            self.tracker(source.lower()).add(terms, timestamp)
+
+    def top(self, sources: Iterable[str], n: int = 10, now: Optional[float] = None, by: str = 'long') -> List[Dict[str, float]]:
+        """Top terms over `sources`, summing counts of terms tracked by several of them."""
+        merged: Dict[str, Dict[str, float]] = {}
+        for source in sources:
+            with self._lock:
+                tracker = self._trackers.get(source.lower())
+            if tracker is None:
+                continue
+            for item in tracker.top(n * 3, now=now, by=by):
+                total = merged.get(item['term'])
+                if total is None:
+                    merged[item['term']] = dict(item)
+                else:
+                    for key in ('count', 'guaranteed', 'short_count'):
+                        total[key] += item[key]
+        results = list(merged.values())
+        for item in results:
+            long_rate = item['count'] / self.half_life
+            item['velocity'] = (item['short_count'] / self.short_half_life) / long_rate if long_rate else 0.0
+        results.sort(key=lambda item: item['short_count' if by == 'short' else 'count'], reverse=True)
+        return results[:n]
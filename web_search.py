@@ -1,16 +1,108 @@
+import logging
 import os
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from cachetools import TTLCache
 from langchain_community.utilities import SerpAPIWrapper
 from langchain_community.tools import DuckDuckGoSearchResults
 from youtube_tools import search_youtube
 
+
+class SearchResult(NamedTuple):
+    title: str
+    url: str
+    snippet: str
+    source: str
+
+
+# A backend takes a query and returns results; anything callable works, e.g. a stub in tests
+SearchBackend = Callable[[str], List[SearchResult]]
+
+TRACKING_PARAMS = re.compile(r'^(utm_.*|gclid|fbclid|ref|ref_src)$')
+
+
+def normalize_query(query: str) -> str:
+    return ' '.join(query.lower().split())
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form used for deduplication: no scheme/www/fragment/tracking params or trailing slash."""
+    if not url:
+        return ''
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    query = urlencode([(key, value) for key, value in parse_qsl(parts.query) if not TRACKING_PARAMS.match(key)])
+    return urlunsplit(('', host, parts.path.rstrip('/'), query, '')).lstrip('/')
+
+
+class SerpAPIBackend:
+    def __init__(self, wrapper: SerpAPIWrapper, max_results: int = 8):
+        self.wrapper = wrapper
+        self.max_results = max_results
+
+    def __call__(self, query: str) -> List[SearchResult]:
+        data = self.wrapper.results(query)
+        results = []
+        answer = data.get('answer_box') or {}
+        if answer.get('answer') or answer.get('snippet'):
+            results.append(SearchResult(answer.get('title', 'Answer'), answer.get('link', ''),
+                                        answer.get('answer') or answer.get('snippet'), 'SerpAPI'))
+        for item in (data.get('organic_results') or [])[:self.max_results]:
+            results.append(SearchResult(item.get('title', ''), item.get('link', ''), item.get('snippet', ''), 'SerpAPI'))
+        return results
+
+
+class DuckDuckGoBackend:
+    def __init__(self, tool: DuckDuckGoSearchResults, max_results: int = 8):
+        self.tool = tool
+        self.max_results = max_results
+
+    def __call__(self, query: str) -> List[SearchResult]:
+        items = self.tool.api_wrapper.results(query, max_results=self.max_results)
+        return [SearchResult(item.get('title', ''), item.get('link', ''), item.get('snippet', ''), 'DuckDuckGo')
+                for item in items]
+
+
 class WebSearchManager:
-    def __init__(self):
-        serpapi_key = os.getenv('SERPAPI_API_KEY')
-        if not serpapi_key:
-            raise ValueError("SERPAPI_API_KEY not found in environment variables.")
-        
-        self.serpapi_search = SerpAPIWrapper(serpapi_api_key=serpapi_key)
-        self.duckduckgo_search = DuckDuckGoSearchResults()
+    """
+    Routes queries by intent and aggregates web search backends.
+
+    All backends are queried concurrently and the call returns once they have all answered
+    or `deadline` seconds have passed, with whatever arrived by then. With `hedge=True` the
+    first backend returning results wins and the rest are not waited for. Results are
+    deduplicated by normalized URL and cached per normalized query: for `cache_ttl` seconds
+    when every backend answered, and only `partial_ttl` seconds when some timed out, failed
+    or were hedged away, so a recovered backend is queried again soon.
+    """
+    def __init__(self, backends: Optional[Dict[str, SearchBackend]] = None, deadline: float = 8.0,
+                 hedge: bool = False, cache_ttl: float = 300, partial_ttl: float = 15, max_results: int = 10):
+        if backends is None:
+            serpapi_key = os.getenv('SERPAPI_API_KEY')
+            if not serpapi_key:
+                raise ValueError("SERPAPI_API_KEY not found in environment variables.")
+
+            self.serpapi_search = SerpAPIWrapper(serpapi_api_key=serpapi_key)
+            self.duckduckgo_search = DuckDuckGoSearchResults()
+            backends = {
+                'SerpAPI': SerpAPIBackend(self.serpapi_search),
+                'DuckDuckGo': DuckDuckGoBackend(self.duckduckgo_search),
+            }
+        self.backends = backends
+        self.deadline = deadline
+        self.hedge = hedge
+        self.max_results = max_results
+        self._cache = TTLCache(maxsize=512, ttl=cache_ttl)
+        self._partial_cache = TTLCache(maxsize=512, ttl=partial_ttl)
+        self._cache_lock = threading.Lock()
+        # Long-lived pool: a backend still running past the deadline never blocks the caller
+        self._executor = ThreadPoolExecutor(max_workers=max(4, 2 * len(backends)), thread_name_prefix='web-search')
 
     def detect_intent(self, query: str) -> str:
         if any(keyword in query.lower() for keyword in ["search youtube", "youtube video", "youtube"]):
@@ -25,24 +117,100 @@ class WebSearchManager:
             return "visualization"
         return "unknown"
 
+    def _run_backend(self, name: str, query: str) -> Tuple[Optional[List[SearchResult]], Optional[str]]:
+        try:
+            return self.backends[name](query), None
+        except Exception as e:
+            logging.warning(f"{name} search failed: {e}")
+            return None, str(e)
+
+    def _merge(self, answered: Dict[str, List[SearchResult]]) -> List[SearchResult]:
+        """Interleave backends in configured order, keeping the first result per normalized URL."""
+        merged, seen = [], set()
+        lists = [answered[name] for name in self.backends if name in answered]
+        for rank in range(max((len(results) for results in lists), default=0)):
+            for results in lists:
+                if rank >= len(results):
+                    continue
+                result = results[rank]
+                key = normalize_url(result.url) or normalize_query(result.snippet)
+                if key and key not in seen:
+                    seen.add(key)
+                    merged.append(result)
+        return merged[:self.max_results]
+
+    def search(self, query: str, hedge: Optional[bool] = None,
+               deadline: Optional[float] = None) -> Tuple[List[SearchResult], Dict[str, str]]:
+        """Merged results and a per-backend status ('ok', 'empty', 'timeout' or the error)."""
+        key = normalize_query(query)
+        with self._cache_lock:
+            cached = self._cache.get(key) or self._partial_cache.get(key)
+        if cached is not None:
+            return cached
+
+        hedge = self.hedge if hedge is None else hedge
+        end = time.monotonic() + (self.deadline if deadline is None else deadline)
+        futures = {self._executor.submit(self._run_backend, name, query): name for name in self.backends}
+        pending = set(futures)
+        answered: Dict[str, List[SearchResult]] = {}
+        status = {name: 'timeout' for name in self.backends}
+        while pending:
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = futures[future]
+                results, error = future.result()
+                if error is not None:
+                    status[name] = f"error: {error}"
+                else:
+                    status[name] = 'ok' if results else 'empty'
+                    answered[name] = results
+            if hedge and any(answered.values()):
+                break
+        if pending and hedge and any(answered.values()):
+            for future in pending:
+                status[futures[future]] = 'hedged'
+        elif pending:
+            logging.warning(f"Web search deadline reached; no answer from {', '.join(futures[f] for f in pending)}")
+
+        outcome = (self._merge(answered), status)
+        if any(answered.values()):
+            complete = all(state in ('ok', 'empty') for state in status.values())
+            with self._cache_lock:
+                (self._cache if complete else self._partial_cache)[key] = outcome
+        return outcome
+
     def search_serpapi(self, query: str) -> str:
         try:
-            results = self.serpapi_search.run(query)
-            return f"SerpAPI results: {results}"
+            results = self.backends['SerpAPI'](query)
+            return f"SerpAPI results: {self._format(results)}"
         except Exception as e:
             return f"Error using SerpAPI: {e}"
 
     def search_duckduckgo(self, query: str) -> str:
         try:
-            results = self.duckduckgo_search.run(query)
-            return f"DuckDuckGo results: {results}"
+            results = self.backends['DuckDuckGo'](query)
+            return f"DuckDuckGo results: {self._format(results)}"
         except Exception as e:
             return f"Error using DuckDuckGo: {e}"
 
+    @staticmethod
+    def _format(results: List[SearchResult]) -> str:
+        lines = []
+        for i, result in enumerate(results, 1):
+            link = f" ({result.url})" if result.url else ""
+            lines.append(f"{i}. {result.title}{link} [{result.source}]\n   {result.snippet}")
+        return "\n".join(lines)
+
     def aggregate_search_results(self, query: str) -> str:
-        serpapi_result = self.search_serpapi(query)
-        duckduckgo_result = self.search_duckduckgo(query)
-        return f"Aggregated results:\n\n{serpapi_result}\n\n{duckduckgo_result}"
+        results, status = self.search(query)
+        missing = [f"{name} ({state})" for name, state in status.items() if state not in ('ok', 'empty', 'hedged')]
+        note = f"\n\nUnavailable: {', '.join(missing)}" if missing else ""
+        if not results:
+            return f"Aggregated results:\n\nNo results found.{note}"
+        return f"Aggregated results:\n\n{self._format(results)}{note}"
 
     def handle_intent(self, intent: str, query: str) -> dict:
         if intent == "search":
@@ -59,4 +227,4 @@ class WebSearchManager:
             return {"type": "text", "content": sports_result}
         if intent == "visualization":
             return {"type": "visualization", "content": "Visualization logic not implemented yet."}
-        return {"type": "text", "content": "I don't understand your query."}
\ No newline at end of file
+        return {"type": "text", "content": "I don't understand your query."}
@@ -0,0 +1,259 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+_INSERT = '''
+    INSERT OR IGNORE INTO whale_transactions
+    (blockchain, hash, symbol, transfer_id, transaction_type, timestamp, amount, amount_usd,
+     from_owner, from_owner_type, to_owner, to_owner_type, raw)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+def _transfer_id(tx: Dict[str, Any]) -> str:
+    """Whale Alert's transaction id, or the transfer's addresses and amount when it has none."""
+    if tx.get('id') is not None:
+        return str(tx['id'])
+    sender = tx.get('from') or {}
+    receiver = tx.get('to') or {}
+    return f"{sender.get('address') or ''}>{receiver.get('address') or ''}:{tx.get('amount')}"
+
+def _row(tx: Dict[str, Any]) -> tuple:
+    sender = tx.get('from') or {}
+    receiver = tx.get('to') or {}
+    return (
+        tx['blockchain'], tx['hash'], (tx.get('symbol') or '').lower(), _transfer_id(tx), tx.get('transaction_type'),
+        int(tx['timestamp']), tx.get('amount'), tx.get('amount_usd'),
+        sender.get('owner'), sender.get('owner_type'), receiver.get('owner'), receiver.get('owner_type'),
+        json.dumps(tx),
+    )
+
+
+class WhaleTransactionIndex:
+    """
+    Local SQLite table of Whale Alert transactions.
+
+    Rows are keyed by (blockchain, hash, symbol, transfer_id), so transfers that share a hash
+    (multi-output UTXO transfers, batched sends) are all kept. They are indexed on timestamp,
+    symbol and amount_usd, so recent-transaction and hash lookups never touch the network. The raw API
+    object is stored alongside the indexed columns and returned unchanged.
+    """
+    def __init__(self, db_path: str = os.path.join('data', 'whale_alert.db')):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._listeners = []
+        self._init_tables()
+
+    def _init_tables(self):
+        with self._lock:
+            columns = [row[1] for row in self._conn.execute('PRAGMA table_info(whale_transactions)')]
+            if columns and 'transfer_id' not in columns:
+                # Tables keyed without the transfer are rebuilt; their raw objects carry the id
+                self._conn.execute('ALTER TABLE whale_transactions RENAME TO whale_transactions_old')
+                for index in ('timestamp', 'symbol', 'amount_usd', 'hash'):
+                    self._conn.execute(f'DROP INDEX IF EXISTS idx_whale_{index}')
+            self._conn.executescript('''
+                CREATE TABLE IF NOT EXISTS whale_transactions (
+                    blockchain TEXT NOT NULL,
+                    hash TEXT NOT NULL,
+                    symbol TEXT NOT NULL,
+                    transfer_id TEXT NOT NULL,
+                    transaction_type TEXT,
+                    timestamp INTEGER NOT NULL,
+                    amount REAL,
+                    amount_usd REAL,
+                    from_owner TEXT,
+                    from_owner_type TEXT,
+                    to_owner TEXT,
+                    to_owner_type TEXT,
+                    raw TEXT NOT NULL,
+                    PRIMARY KEY (blockchain, hash, symbol, transfer_id)
+                );
+                CREATE INDEX IF NOT EXISTS idx_whale_timestamp ON whale_transactions (timestamp);
+                CREATE INDEX IF NOT EXISTS idx_whale_symbol ON whale_transactions (symbol, timestamp);
+                CREATE INDEX IF NOT EXISTS idx_whale_amount_usd ON whale_transactions (amount_usd);
+                CREATE INDEX IF NOT EXISTS idx_whale_hash ON whale_transactions (hash);
+                CREATE TABLE IF NOT EXISTS whale_poller_state (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+            ''')
+            if columns and 'transfer_id' not in columns:
+                old = self._conn.execute('SELECT raw FROM whale_transactions_old')
+                self._conn.executemany(_INSERT, (_row(json.loads(raw)) for (raw,) in old))
+                self._conn.execute('DROP TABLE whale_transactions_old')
+            self._conn.commit()
+
+    def add_listener(self, callback: Callable[[List[Dict[str, Any]]], None]) -> None:
+        """Register `callback(new_transactions)`, called after every insert that adds rows."""
+        self._listeners.append(callback)
+
+    def upsert(self, transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert API transaction objects, skipping ones already indexed; returns the new ones."""
+        inserted = []
+        with self._lock:
+            for tx in transactions:
+                cursor = self._conn.execute(_INSERT, _row(tx))
+                if cursor.rowcount:
+                    inserted.append(tx)
+            self._conn.commit()
+        if inserted:
+            for callback in self._listeners:
+                try:
+                    callback(inserted)
+                except Exception as e:
+                    logging.error(f"Whale transaction listener failed: {e}")
+        return inserted
+
+    def query(self, start: Optional[int] = None, end: Optional[int] = None, symbol: Optional[str] = None,
+              blockchain: Optional[str] = None, min_value: Optional[float] = None, max_value: Optional[float] = None,
+              owner: Optional[str] = None, owner_type: Optional[str] = None, transaction_type: Optional[str] = None,
+              limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Filter indexed transactions, newest first. `start` is exclusive like the API's;
+        `owner`/`owner_type` match either side of the transfer.
+        """
+        clauses, params = [], []
+        if start is not None:
+            clauses.append('timestamp > ?')
+            params.append(int(start))
+        if end is not None:
+            clauses.append('timestamp <= ?')
+            params.append(int(end))
+        if symbol:
+            clauses.append('symbol = ?')
+            params.append(symbol.lower())
+        if blockchain:
+            clauses.append('blockchain = ?')
+            params.append(blockchain.lower())
+        if min_value is not None:
+            clauses.append('amount_usd >= ?')
+            params.append(float(min_value))
+        if max_value is not None:
+            clauses.append('amount_usd <= ?')
+            params.append(float(max_value))
+        if owner:
+            clauses.append('(from_owner = ? OR to_owner = ?)')
+            params.extend([owner.lower(), owner.lower()])
+        if owner_type:
+            clauses.append('(from_owner_type = ? OR to_owner_type = ?)')
+            params.extend([owner_type.lower(), owner_type.lower()])
+        if transaction_type:
+            clauses.append('transaction_type = ?')
+            params.append(transaction_type.lower())
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        sql = f'SELECT raw FROM whale_transactions {where} ORDER BY timestamp DESC LIMIT ?'
+        with self._lock:
+            rows = self._conn.execute(sql, params + [int(limit)]).fetchall()
+        return [json.loads(raw) for (raw,) in rows]
+
+    def get(self, blockchain: str, hash: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT raw FROM whale_transactions WHERE hash = ? AND blockchain = ?',
+                (hash, blockchain.lower())
+            ).fetchall()
+        return [json.loads(raw) for (raw,) in rows]
+
+    def oldest_timestamp(self) -> Optional[int]:
+        with self._lock:
+            (value,) = self._conn.execute('SELECT MIN(timestamp) FROM whale_transactions').fetchone()
+        return value
+
+    def get_state(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute('SELECT value FROM whale_poller_state WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_state(self, key: str, value: str) -> None:
+        with self._lock:
+            self._conn.execute('INSERT OR REPLACE INTO whale_poller_state (key, value) VALUES (?, ?)', (key, value))
+            self._conn.commit()
+
+
+class WhaleAlertPoller:
+    """
+    Background poller that follows the Whale Alert `/transactions` cursor into the index.
+
+    Each cycle pages forward with the stored cursor until a short page is returned. The
+    cursor and the newest timestamp are persisted, so a restart resumes where it stopped.
+    `covered_since` is the earliest timestamp from which the index is known to be complete.
+    """
+    def __init__(self, api, index: WhaleTransactionIndex, interval: float = 60, min_value: int = 500000,
+                 lookback: int = 3600, page_size: int = 100):
+        self.api = api
+        self.index = index
+        self.interval = interval
+        self.min_value = min_value
+        self.lookback = lookback
+        self.page_size = page_size
+        self.covered_since: Optional[int] = None
+        self._stopping = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name='WhaleAlertPoller', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:
+                logging.error(f"Whale Alert poll failed: {e}")
+            self._stopping.wait(self.interval)
+
+    def poll_once(self) -> int:
+        """Fetch every page newer than the stored cursor; returns the number of new rows."""
+        now = int(time.time())
+        last_timestamp = self.index.get_state('last_timestamp')
+        cursor = self.index.get_state('cursor')
+        if last_timestamp and int(last_timestamp) >= now - self.lookback:
+            start = int(last_timestamp)
+            if self.covered_since is None:
+                covered = self.index.get_state('covered_since')
+                self.covered_since = int(covered) if covered else start
+        else:
+            # First run, or the index fell further behind than the API lets us backfill
+            start = now - self.lookback
+            cursor = None
+            self.covered_since = start
+            self.index.set_state('covered_since', str(start))
+        inserted = 0
+        while not self._stopping.is_set():
+            parameters = {'start': start, 'min_value': self.min_value, 'limit': self.page_size}
+            if cursor:
+                parameters['cursor'] = cursor
+            data = self.api.make_request('transactions', parameters)
+            if not data or data.get('result') != 'success':
+                logging.warning(f"Whale Alert returned no data: {data and data.get('message')}")
+                break
+            transactions = data.get('transactions') or []
+            inserted += len(self.index.upsert(transactions))
+            if transactions:
+                newest = max(int(tx['timestamp']) for tx in transactions)
+                self.index.set_state('last_timestamp', str(newest))
+            if data.get('cursor'):
+                cursor = data['cursor']
+                self.index.set_state('cursor', cursor)
+            if len(transactions) < self.page_size:
+                break
+        return inserted
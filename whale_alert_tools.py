@@ -1,12 +1,22 @@
 import os
+import time
+import asyncio
+import aiohttp
 from requests import Session, ConnectionError, Timeout, TooManyRedirects
 from langchain.tools import tool
+from http_client import async_http
+from whale_alert_index import WhaleTransactionIndex, WhaleAlertPoller
+from whale_flow import WhaleFlowAggregator
 
 # Load API key from environment variable
 API_KEY = os.getenv('WHALE_ALERT_API_KEY')
 if not API_KEY:
     raise ValueError("Please set the 'WHALE_ALERT_API_KEY' environment variable.")
 
+WHALE_ALERT_DB = os.getenv('WHALE_ALERT_DB', os.path.join('data', 'whale_alert.db'))
+WHALE_ALERT_POLL_INTERVAL = int(os.getenv('WHALE_ALERT_POLL_INTERVAL', '60'))
+WHALE_ALERT_MIN_VALUE = int(os.getenv('WHALE_ALERT_MIN_VALUE', '500000'))
+
 class WhaleAlertAPI:
     def __init__(self):
         self.api_key = API_KEY
@@ -28,7 +38,43 @@ class WhaleAlertAPI:
             print(f"Error fetching data from Whale Alert: {e}")
             return None
 
+    async def amake_request(self, endpoint, parameters):
+        try:
+            parameters['api_key'] = self.api_key
+            url = f"{self.base_url}/{endpoint}"
+            return await async_http.get_json(url, params=parameters, headers=self.headers, raise_for_status=False)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            print(f"Error fetching data from Whale Alert: {e}")
+            return None
+
 whale_alert_api = WhaleAlertAPI()
+whale_index = WhaleTransactionIndex(WHALE_ALERT_DB)
+whale_poller = WhaleAlertPoller(whale_alert_api, whale_index, interval=WHALE_ALERT_POLL_INTERVAL,
+                                min_value=WHALE_ALERT_MIN_VALUE)
+
+# Rolling flow totals, seeded from the index and kept current by every new indexed transaction
+whale_flows = WhaleFlowAggregator()
+whale_flows.add_transactions(whale_index.query(start=int(time.time()) - whale_flows.window_seconds, limit=10 ** 9))
+whale_index.add_listener(whale_flows.add_transactions)
+
+def _index_covers(start, min_value):
+    """True if the poller guarantees the index is complete for this start/min_value."""
+    return (whale_poller.running and whale_poller.covered_since is not None
+            and int(start) >= whale_poller.covered_since
+            and (min_value is None or float(min_value) >= whale_poller.min_value))
+
+def _recent_parameters(start, min_value, limit, currency):
+    parameters = {
+        'start': start,
+        'min_value': min_value if min_value is not None else WHALE_ALERT_MIN_VALUE,
+        'limit': limit
+    }
+    if currency:
+        parameters['currency'] = currency
+    return parameters
+
+def _indexed_result(transactions):
+    return {'result': 'success', 'count': len(transactions), 'transactions': transactions}
 
 @tool
 def get_whale_alert_status():
@@ -47,26 +93,127 @@ def get_transaction_by_hash(blockchain, hash):
     - blockchain (str): The blockchain to search for the specific hash (e.g., 'bitcoin', 'ethereum').
     - hash (str): The hash of the transaction to return.
     """
+    indexed = whale_index.get(blockchain, hash)
+    if indexed:
+        return _indexed_result(indexed)
     endpoint = f'transaction/{blockchain}/{hash}'
     parameters = {}
-    return whale_alert_api.make_request(endpoint, parameters)
+    data = whale_alert_api.make_request(endpoint, parameters)
+    if data and data.get('result') == 'success':
+        whale_index.upsert(data.get('transactions') or [])
+    return data
 
 @tool
-def get_recent_transactions(start, min_value=10000, limit=100, currency=None):
+def get_recent_transactions(start=None, min_value=None, limit=100, currency=None, end=None, blockchain=None,
+                            owner=None, owner_type=None, transaction_type=None, max_value=None):
     """
-    Get recent transactions after a set start time.
+    Get recent transactions after a set start time, answered from the local transaction index.
     Args:
-    - start (int): Unix timestamp for retrieving transactions from timestamp (exclusive).
-    - min_value (int): Minimum USD value of transactions returned.
+    - start (int): Unix timestamp for retrieving transactions from timestamp (exclusive). Default is one hour ago.
+    - min_value (int): Minimum USD value of transactions returned. Default is the poller's threshold.
     - limit (int): Maximum number of results returned.
     - currency (str): Returns transactions for a specific currency code.
+    - end (int): Unix timestamp up to which transactions are returned (inclusive).
+    - blockchain (str): Only transactions on this blockchain (e.g., 'bitcoin').
+    - owner (str): Only transactions to or from this owner (e.g., 'binance').
+    - owner_type (str): Only transactions to or from this owner type (e.g., 'exchange', 'unknown').
+    - transaction_type (str): Only this transaction type (e.g., 'transfer', 'mint', 'burn').
+    - max_value (int): Maximum USD value of transactions returned.
     """
-    endpoint = 'transactions'
-    parameters = {
-        'start': start,
-        'min_value': min_value,
-        'limit': limit
-    }
-    if currency:
-        parameters['currency'] = currency
-    return whale_alert_api.make_request(endpoint, parameters)
+    start = int(start) if start is not None else int(time.time()) - 3600
+    if not _index_covers(start, min_value):
+        data = whale_alert_api.make_request('transactions', _recent_parameters(start, min_value, limit, currency))
+        if not data or data.get('result') != 'success':
+            return data
+        whale_index.upsert(data.get('transactions') or [])
+    transactions = whale_index.query(start=start, end=end, symbol=currency, blockchain=blockchain,
+                                     min_value=min_value, max_value=max_value, owner=owner,
+                                     owner_type=owner_type, transaction_type=transaction_type, limit=limit)
+    return _indexed_result(transactions)
+
+def _signed_usd(value):
+    return f"{'-' if value < 0 else '+'}${abs(value):,.0f}"
+
+@tool
+def get_whale_flows(currency='btc', owner_type='exchange', hours=6, top=3):
+    """
+    Get net whale flows of an asset into or out of a type of wallet (e.g. exchanges) over the last hours.
+    Far more compact than listing raw transactions; positive net means inflow.
+    Args:
+    - currency (str): The currency code (e.g., 'btc', 'eth', 'usdt').
+    - owner_type (str): The owner type to aggregate (e.g., 'exchange', 'unknown').
+    - hours (float): Window length in hours (up to 7 days).
+    - top (int): Number of individual owners with the largest net flow to list.
+    """
+    hours = float(hours)
+    symbol = currency.upper()
+    totals = whale_flows.query(currency, owner_type, hours=hours)
+    direction = 'into' if totals['net'] >= 0 else 'out of'
+    lines = [
+        f"{symbol} whale flows for {owner_type} wallets over the last {hours:g}h: "
+        f"inflow {totals['inflow']:,.2f} {symbol} (${totals['inflow_usd']:,.0f}), "
+        f"outflow {totals['outflow']:,.2f} {symbol} (${totals['outflow_usd']:,.0f}), "
+        f"net {totals['net']:+,.2f} {symbol} ({_signed_usd(totals['net_usd'])}) {direction} {owner_type} wallets."
+    ]
+    owners = whale_flows.top_owners(currency, owner_type, hours=hours, n=int(top))
+    if owners:
+        lines.append("Largest net flows: " + ", ".join(
+            f"{owner} {net:+,.2f} {symbol} ({_signed_usd(net_usd)})" for owner, net, net_usd in owners))
+    if not whale_poller.running:
+        lines.append("Note: the Whale Alert poller is not running, so totals only cover transactions fetched so far.")
+    return "\n".join(lines)
+
+@tool
+async def aget_whale_alert_status():
+    """
+    Get the current status of Whale Alert (async).
+    """
+    endpoint = 'status'
+    parameters = {}
+    return await whale_alert_api.amake_request(endpoint, parameters)
+
+@tool
+async def aget_transaction_by_hash(blockchain, hash):
+    """
+    Get a transaction by its hash (async).
+    Args:
+    - blockchain (str): The blockchain to search for the specific hash (e.g., 'bitcoin', 'ethereum').
+    - hash (str): The hash of the transaction to return.
+    """
+    indexed = whale_index.get(blockchain, hash)
+    if indexed:
+        return _indexed_result(indexed)
+    endpoint = f'transaction/{blockchain}/{hash}'
+    parameters = {}
+    data = await whale_alert_api.amake_request(endpoint, parameters)
+    if data and data.get('result') == 'success':
+        whale_index.upsert(data.get('transactions') or [])
+    return data
+
+@tool
+async def aget_recent_transactions(start=None, min_value=None, limit=100, currency=None, end=None, blockchain=None,
+                                   owner=None, owner_type=None, transaction_type=None, max_value=None):
+    """
+    Get recent transactions after a set start time, answered from the local transaction index (async).
+    Args:
+    - start (int): Unix timestamp for retrieving transactions from timestamp (exclusive). Default is one hour ago.
+    - min_value (int): Minimum USD value of transactions returned. Default is the poller's threshold.
+    - limit (int): Maximum number of results returned.
+    - currency (str): Returns transactions for a specific currency code.
+    - end (int): Unix timestamp up to which transactions are returned (inclusive).
+    - blockchain (str): Only transactions on this blockchain (e.g., 'bitcoin').
+    - owner (str): Only transactions to or from this owner (e.g., 'binance').
+    - owner_type (str): Only transactions to or from this owner type (e.g., 'exchange', 'unknown').
+    - transaction_type (str): Only this transaction type (e.g., 'transfer', 'mint', 'burn').
+    - max_value (int): Maximum USD value of transactions returned.
+    """
+    start = int(start) if start is not None else int(time.time()) - 3600
+    if not _index_covers(start, min_value):
+        data = await whale_alert_api.amake_request('transactions', _recent_parameters(start, min_value, limit, currency))
+        if not data or data.get('result') != 'success':
+            return data
+        whale_index.upsert(data.get('transactions') or [])
+    transactions = whale_index.query(start=start, end=end, symbol=currency, blockchain=blockchain,
+                                     min_value=min_value, max_value=max_value, owner=owner,
+                                     owner_type=owner_type, transaction_type=transaction_type, limit=limit)
+    return _indexed_result(transactions)
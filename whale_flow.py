@@ -0,0 +1,110 @@
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+ALL_OWNERS = '*'
+
+
+class WhaleFlowAggregator:
+    """
+    Windowed whale inflow/outflow totals per (asset, owner_type, owner).
+
+    Each key owns a row in ring-buffered arrays of `num_buckets` time buckets of
+    `bucket_seconds` each. A transaction adds its amount to the receiver's inflow and the
+    sender's outflow, both for the named owner and for the `'*'` roll-up of its owner type,
+    so an update is O(1) and a window query is one vectorised sum over at most
+    `num_buckets` columns.
+    """
+    def __init__(self, bucket_seconds: int = 900, num_buckets: int = 672, initial_rows: int = 64):
+        self.bucket_seconds = bucket_seconds
+        self.num_buckets = num_buckets
+        self._rows: Dict[Tuple[str, str, str], int] = {}
+        # columns: inflow amount, inflow usd, outflow amount, outflow usd
+        self._flows = np.zeros((initial_rows, num_buckets, 4))
+        self._bucket_ids = np.full(num_buckets, -1, dtype=np.int64)
+        self._newest_bucket = -1
+        self._lock = threading.Lock()
+
+    @property
+    def window_seconds(self) -> int:
+        return self.bucket_seconds * self.num_buckets
+
+    def _row(self, key: Tuple[str, str, str]) -> int:
+        row = self._rows.get(key)
+        if row is None:
+            row = len(self._rows)
+            if row == len(self._flows):
+                self._flows = np.concatenate((self._flows, np.zeros_like(self._flows)))
+            self._rows[key] = row
+        return row
+
+    def _slot(self, timestamp: int) -> Optional[int]:
+        bucket = int(timestamp) // self.bucket_seconds
+        if bucket <= self._newest_bucket - self.num_buckets:
+            return None  # older than the retained window
+        self._newest_bucket = max(self._newest_bucket, bucket)
+        slot = bucket % self.num_buckets
+        if self._bucket_ids[slot] != bucket:
+            self._flows[:, slot, :] = 0
+            self._bucket_ids[slot] = bucket
+        return slot
+
+    def add_transactions(self, transactions: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            for tx in transactions:
+                slot = self._slot(tx['timestamp'])
+                if slot is None:
+                    continue
+                asset = (tx.get('symbol') or '').lower()
+                amount = float(tx.get('amount') or 0)
+                usd = float(tx.get('amount_usd') or 0)
+                receiver = tx.get('to') or {}
+                sender = tx.get('from') or {}
+                receiver_type = receiver.get('owner_type') or 'unknown'
+                sender_type = sender.get('owner_type') or 'unknown'
+                for owner in (receiver.get('owner') or 'unknown', ALL_OWNERS):
+                    flows = self._flows[self._row((asset, receiver_type, owner)), slot]
+                    flows[0] += amount
+                    flows[1] += usd
+                for owner in (sender.get('owner') or 'unknown', ALL_OWNERS):
+                    flows = self._flows[self._row((asset, sender_type, owner)), slot]
+                    flows[2] += amount
+                    flows[3] += usd
+
+    def _window_mask(self, hours: float, now: Optional[float]) -> np.ndarray:
+        now_bucket = int(now if now is not None else time.time()) // self.bucket_seconds
+        span = max(1, min(self.num_buckets, int(np.ceil(hours * 3600 / self.bucket_seconds))))
+        return (self._bucket_ids > now_bucket - span) & (self._bucket_ids <= now_bucket)
+
+    def query(self, asset: str, owner_type: str, owner: str = ALL_OWNERS, hours: float = 6,
+              now: Optional[float] = None) -> Dict[str, float]:
+        """Inflow, outflow and net (inflow - outflow) in asset units and USD over the window."""
+        with self._lock:
+            row = self._rows.get((asset.lower(), owner_type.lower(), owner.lower()))
+            if row is None:
+                totals = np.zeros(4)
+            else:
+                totals = self._flows[row, self._window_mask(hours, now)].sum(axis=0)
+        return {
+            'inflow': totals[0], 'inflow_usd': totals[1],
+            'outflow': totals[2], 'outflow_usd': totals[3],
+            'net': totals[0] - totals[2], 'net_usd': totals[1] - totals[3],
+        }
+
+    def top_owners(self, asset: str, owner_type: str, hours: float = 6, n: int = 5,
+                   now: Optional[float] = None) -> List[Tuple[str, float, float]]:
+        """The `n` owners of `owner_type` with the largest absolute net USD flow: (owner, net, net_usd)."""
+        asset, owner_type = asset.lower(), owner_type.lower()
+        with self._lock:
+            keys = [(key[2], row) for key, row in self._rows.items()
+                    if key[0] == asset and key[1] == owner_type and key[2] not in (ALL_OWNERS, 'unknown')]
+            if not keys:
+                return []
+            rows = np.fromiter((row for _, row in keys), dtype=np.int64)
+            totals = self._flows[rows][:, self._window_mask(hours, now)].sum(axis=1)
+        net = totals[:, 0] - totals[:, 2]
+        net_usd = totals[:, 1] - totals[:, 3]
+        order = np.argsort(-np.abs(net_usd))[:n]
+        return [(keys[i][0], float(net[i]), float(net_usd[i])) for i in order if net_usd[i] != 0]
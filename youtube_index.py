@@ -0,0 +1,131 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Callable, Dict, List, Optional
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from embedding_cache import make_embeddings, model_identity
+
+
+def embeddings_tag(embeddings: Embeddings) -> str:
+    """Short stable id of an embeddings backend and model, so indexes never mix vector spaces."""
+    return hashlib.sha256(model_identity(embeddings).encode()).hexdigest()[:10]
+
+
+class TranscriptCache:
+    """YouTube transcripts (as LangChain documents) stored as one JSON file per video id."""
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, video_id: str) -> str:
+        return os.path.join(self.cache_dir, f"{video_id}.json")
+
+    def load(self, video_id: str) -> Optional[List[Document]]:
+        try:
+            with open(self._path(video_id), encoding='utf-8') as f:
+                return [Document(**item) for item in json.load(f)]
+        except FileNotFoundError:
+            return None
+
+    def save(self, video_id: str, documents: List[Document]) -> None:
+        path = self._path(video_id)
+        with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump([{'page_content': doc.page_content, 'metadata': doc.metadata} for doc in documents], f)
+        os.replace(f"{path}.tmp", path)
+
+
+class VideoIndex:
+    """
+    Transcript and vector-index cache for YouTube question answering.
+
+    Transcripts are fetched once per video id through `loader(url)` and kept in a
+    `TranscriptCache`. Their chunks are embedded once into a persistent Chroma collection
+    per (video, embeddings backend), reopened on later questions and after restarts, so a
+    follow-up question costs one retrieval and one LLM call. A collection counts as indexed
+    only once a marker is written after its chunks were all added, so one left half-written
+    by a crash is indexed again. The default embeddings go
+    through the shared `CachedEmbeddings`, so re-ingesting a transcript whose segments were
+    embedded before (in any collection) costs no embedding calls.
+    """
+    def __init__(self, cache_dir: str, loader: Callable[[str], List[Document]],
+                 embeddings: Optional[Embeddings] = None, chunk_size: int = 1000, chunk_overlap: int = 100):
+        self.cache_dir = cache_dir
+        self.loader = loader
+        self._embeddings = embeddings
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.transcripts = TranscriptCache(os.path.join(cache_dir, 'transcripts'))
+        self._indexed_dir = os.path.join(cache_dir, 'indexed')
+        os.makedirs(self._indexed_dir, exist_ok=True)
+        self._stores: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def embeddings(self) -> Embeddings:
+        if self._embeddings is None:
+            self._embeddings = make_embeddings()
+        return self._embeddings
+
+    @staticmethod
+    def video_id(url: str) -> str:
+        from langchain_community.document_loaders import YoutubeLoader
+        return YoutubeLoader.extract_video_id(url)
+
+    def documents(self, url: str) -> List[Document]:
+        """The video's transcript documents, loading and caching them on first use."""
+        video_id = self.video_id(url)
+        documents = self.transcripts.load(video_id)
+        if documents is None:
+            documents = self.loader(url)
+            if documents:
+                self.transcripts.save(video_id, documents)
+        return documents or []
+
+    def _split(self, documents: List[Document]) -> List[Document]:
+        from langchain_text_splitters import RecursiveCharacterTextSplitter
+        splitter = RecursiveCharacterTextSplitter(chunk_size=self.chunk_size, chunk_overlap=self.chunk_overlap)
+        chunks = splitter.split_documents(documents)
+        for chunk in chunks:
+            # Chroma only accepts scalar metadata values
+            chunk.metadata = {key: value for key, value in chunk.metadata.items()
+                              if isinstance(value, (str, int, float, bool))}
+        return chunks
+
+    def _marker(self, name: str) -> str:
+        return os.path.join(self._indexed_dir, f"{name}.json")
+
+    def store(self, url: str):
+        """Persistent Chroma store for the video, embedding its transcript unless it was fully indexed before."""
+        from langchain_community.vectorstores import Chroma
+
+        video_id = self.video_id(url)
+        name = f"yt_{video_id}_{embeddings_tag(self.embeddings)}"
+        with self._lock:
+            store = self._stores.get(name)
+            if store is not None:
+                return store
+            store = Chroma(collection_name=name, embedding_function=self.embeddings,
+                           persist_directory=os.path.join(self.cache_dir, 'chroma'))
+            if not os.path.exists(self._marker(name)):
+                chunks = self._split(self.documents(url))
+                if not chunks:
+                    raise ValueError(f"No transcript available for video {video_id}")
+                # Chunk ids are stable, so chunks left by an interrupted run are overwritten
+                store.add_documents(chunks, ids=[f"{video_id}:{i}" for i in range(len(chunks))])
+                with open(f"{self._marker(name)}.tmp", 'w', encoding='utf-8') as f:
+                    json.dump({'video_id': video_id, 'chunks': len(chunks)}, f)
+                os.replace(f"{self._marker(name)}.tmp", self._marker(name))
+                stats = self.embeddings.stats() if hasattr(self.embeddings, 'stats') else None
+                logging.info(f"Indexed {len(chunks)} transcript chunks for video {video_id}"
+                             + (f" (embedding cache hit rate {stats['hit_rate']:.0%}, "
+                                f"~{stats['saved_tokens']} tokens saved)" if stats else ""))
+            self._stores[name] = store
+            return store
+
+    def retrieve(self, url: str, question: str, k: int = 4) -> List[Document]:
+        return self.store(url).similarity_search(question, k=k)
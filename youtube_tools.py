@@ -1,14 +1,91 @@
-from typing import List
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Tuple
+from cachetools import TTLCache
 from langchain.agents import tool
 from langchain_openai import OpenAI
-from langchain_openai import OpenAIEmbeddings
 from langchain_community.document_loaders import YoutubeLoader
-from langchain_community.vectorstores import Chroma
 from langchain_core.documents import Document
 from langchain.chains.question_answering import load_qa_chain
 import scrapetube
+from youtube_index import VideoIndex
 
+YOUTUBE_CACHE_DIR = os.getenv('YOUTUBE_CACHE_DIR', os.path.join('data', 'youtube'))
+YOUTUBE_SEARCH_TIMEOUT = float(os.getenv('YOUTUBE_SEARCH_TIMEOUT', '10'))
 
+# Search results per (normalized query, max_results); scrapetube scrapes pages, so repeats are slow
+search_cache = TTLCache(maxsize=256, ttl=int(os.getenv('YOUTUBE_SEARCH_TTL', '600')))
+_search_cache_lock = threading.Lock()
+_search_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='youtube-search')
+
+
+def load_transcript(url: str) -> List[Document]:
+    loader = YoutubeLoader.from_youtube_url(url, add_video_info=True)
+    return loader.load()
+
+
+# Transcripts and chunk embeddings are cached per video id and reused across questions and restarts
+video_index = VideoIndex(YOUTUBE_CACHE_DIR, load_transcript)
+_qa_chain = None
+
+
+def _get_qa_chain():
+    global _qa_chain
+    if _qa_chain is None:
+        _qa_chain = load_qa_chain(OpenAI(temperature=0), chain_type="stuff")
+    return _qa_chain
+
+
+def _video_title(video: dict) -> str:
+    title = video.get('title', 'No title')
+    if isinstance(title, dict):
+        # scrapetube returns YouTube's renderer object: {'runs': [{'text': ...}]}
+        title = ''.join(run.get('text', '') for run in title.get('runs', [])) or 'No title'
+    return title
+
+
+def _search_videos(query: str, max_results: int, timeout: float) -> Tuple[List[Dict[str, str]], bool]:
+    """Up to `max_results` videos as title/video_id dicts, and whether the search finished in `timeout` seconds."""
+    videos: List[Dict[str, str]] = []
+    stop = threading.Event()
+
+    def consume():
+        for video in scrapetube.get_search(query, limit=max_results, sleep=0):
+            # Checked before scrapetube fetches the next page, so an abandoned scrape frees its worker
+            if stop.is_set():
+                break
+            videos.append({'title': _video_title(video), 'video_id': video.get('videoId', 'No video ID')})
+
+    future = _search_executor.submit(consume)
+    try:
+        future.result(timeout=timeout)
+    except FutureTimeoutError:
+        stop.set()
+        future.cancel()  # Drops the search if it is still queued behind busy workers
+        return list(videos), False
+    return videos, True
+
+
+def find_youtube_videos(query: str, max_results: int = 5, timeout: float = None) -> List[Dict[str, str]]:
+    """Cached YouTube search; a search cut short by the timeout returns what it found and is not cached."""
+    key = (' '.join(query.lower().split()), max_results)
+    with _search_cache_lock:
+        cached = search_cache.get(key)
+    if cached is not None:
+        return cached
+    videos, complete = _search_videos(query, max_results, YOUTUBE_SEARCH_TIMEOUT if timeout is None else timeout)
+    if complete:
+        with _search_cache_lock:
+            search_cache[key] = videos
+    return videos
+
+
+def _format_videos(videos: List[Dict[str, str]]) -> str:
+    if not videos:
+        return "No videos found."
+    return "\n\n".join(f"Title: {video['title']}\nURL: https://www.youtube.com/watch?v={video['video_id']}"
+                       for video in videos)
 
 
 @tool
@@ -24,21 +101,35 @@ def search_youtube(query: str, max_results: int = 5) -> str:
         str: A formatted string containing titles and URLs of the top search results.
     """
     try:
-        videos = scrapetube.get_search(query, limit=max_results)
-        results = []
-        for video in videos:
-            title = video.get('title', 'No title')
-            video_id = video.get('videoId', 'No video ID')
-            results.append(f"Title: {title}\nURL: https://www.youtube.com/watch?v={video_id}")
-        
-        if not results:
-            return "No videos found."
-            
-        return "\n\n".join(results)
+        return _format_videos(find_youtube_videos(query, max_results))
     except Exception as e:
         return f"Error searching YouTube: {str(e)}"
 
 
+@tool
+def search_youtube_batch(queries: List[str], max_results: int = 5) -> str:
+    """
+    Searches YouTube for several queries in parallel and returns the titles and URLs found for each.
+
+    Args:
+        queries (List[str]): The search query strings.
+        max_results (int): Maximum number of search results per query.
+
+    Returns:
+        str: The formatted results for each query, in the order given.
+    """
+    def run(query):
+        try:
+            return _format_videos(find_youtube_videos(query, max_results))
+        except Exception as e:
+            return f"Error searching YouTube: {str(e)}"
+
+    # A separate pool: the searches themselves run on _search_executor
+    with ThreadPoolExecutor(max_workers=min(8, max(1, len(queries)))) as executor:
+        outputs = list(executor.map(run, queries))
+    return "\n\n".join(f"Results for '{query}':\n{output}" for query, output in zip(queries, outputs))
+
+
 @tool
 def process_youtube_video(url: str) -> List[Document]:
     """
@@ -51,9 +142,7 @@ def process_youtube_video(url: str) -> List[Document]:
         List[Document]: A list of documents representing the video content.
     """
     try:
-        loader = YoutubeLoader.from_youtube_url(url, add_video_info=True)
-        documents = loader.load()
-        return documents
+        return video_index.documents(url)
     except Exception as e:
         return [Document(page_content=str(e), metadata={})] 
 
@@ -70,29 +159,27 @@ def query_youtube_video(url: str, question: str) -> str:
         str: The answer to the question based on the video content.
     """
     try:
-        documents = process_youtube_video(url)
-        llm = OpenAI(temperature=0)
-        chain = load_qa_chain(llm, chain_type="default")
-        output = chain.run(input_documents=documents, question=question)
+        documents = video_index.retrieve(url, question)
+        output = _get_qa_chain().run(input_documents=documents, question=question)
         return output
     except Exception as e:
         return f"Error querying YouTube video: {str(e)}"
 
 
 class YouTubeQA:
-    def __init__(self):
+    def __init__(self, index: VideoIndex = None):
         """
         Initializes the YouTubeQA class for processing and querying YouTube videos.
         """
         self.llm = OpenAI(temperature=0)
-        self.embeddings = OpenAIEmbeddings()
-        self.db = None  # Placeholder for Chroma instance
+        self.index = index or video_index
+        self.url = None  # Currently ingested video
         self.chain = None  # Placeholder for QA chain
 
-    @tool
     def ingest_video(self, url: str) -> str:
         """
         Ingests a YouTube video, processes its content, and prepares it for question-answering.
+        Transcripts and embeddings already cached for the video are reused.
 
         Args:
             url (str): The URL of the YouTube video to be ingested.
@@ -101,14 +188,13 @@ class YouTubeQA:
             str: A confirmation message indicating successful ingestion.
         """
         try:
-            documents = process_youtube_video(url)
-            self.db = Chroma.from_documents(documents, self.embeddings).as_retriever()
-            self.chain = load_qa_chain(self.llm, chain_type="default")
+            self.index.store(url)
+            self.url = url
+            self.chain = load_qa_chain(self.llm, chain_type="stuff")
             return "Video content successfully ingested and prepared for question-answering."
         except Exception as e:
             return f"Error ingesting YouTube video: {str(e)}"
 
-    @tool
     def answer_question(self, question: str) -> str:
         """
         Answers a question based on the ingested YouTube video content.
@@ -119,12 +205,12 @@ class YouTubeQA:
         Returns:
             str: The answer to the question, or an error message if the video has not been ingested.
         """
-        if not self.chain or not self.db:
+        if not self.chain or not self.url:
             return "Please ingest a video first using the ingest_video method."
-        
+
         try:
-            docs = self.db.get_relevant_documents(question)
+            docs = self.index.retrieve(self.url, question)
             output = self.chain.run(input_documents=docs, question=question)
             return output
         except Exception as e:
-            return f"Error answering question: {str(e)}"
\ No newline at end of file
+            return f"Error answering question: {str(e)}"